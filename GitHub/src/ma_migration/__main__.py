@@ -0,0 +1,3 @@
+from ma_migration.cli import main
+
+raise SystemExit(main())
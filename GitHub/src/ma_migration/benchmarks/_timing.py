@@ -0,0 +1,23 @@
+from __future__ import annotations
+import time
+from typing import Any, Callable, Dict, List
+
+def best_of(fn: Callable[[], Any], *, repeat: int = 3) -> float:
+    """Best wall time (seconds) of `repeat` calls."""
+    best = float("inf")
+    for _ in range(max(repeat, 1)):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+def compare(name: str, baseline: Callable[[], Any], candidate: Callable[[], Any], *, repeat: int = 3) -> Dict[str, Any]:
+    """Time a baseline and a candidate implementation of the same kernel."""
+    base = best_of(baseline, repeat=repeat)
+    cand = best_of(candidate, repeat=repeat)
+    return {"name": name, "baseline_s": base, "candidate_s": cand, "speedup": base / cand if cand else float("inf")}
+
+def print_table(rows: List[Dict[str, Any]]) -> None:
+    print(f"{'benchmark':<40} {'baseline_s':>11} {'candidate_s':>12} {'speedup':>8}")
+    for r in rows:
+        print(f"{r['name']:<40} {r['baseline_s']:>11.4f} {r['candidate_s']:>12.4f} {r['speedup']:>7.1f}x")
@@ -0,0 +1,44 @@
+"""Benchmark: vectorized `format_dates` vs per-cell dateutil `.apply(format_date)`.
+
+Run with `python -m ma_migration.benchmarks.dates [rows] [unique]`.
+"""
+from __future__ import annotations
+import sys
+from typing import Any, Dict, List
+import numpy as np
+import pandas as pd
+from dateutil.parser import parse
+
+from ma_migration.core.dates import _format_date_str, format_dates
+from ._timing import compare, print_table
+
+def _legacy_format_date(x):
+    # the pre-vectorization implementation: one uncached dateutil parse per cell
+    try:
+        return parse(str(x), dayfirst=False).strftime('%Y-%m-%d')
+    except (ValueError, OverflowError, TypeError):
+        return str(x)
+
+def make_dates(rows: int, unique: int, *, seed: int = 0) -> pd.Series:
+    """Contract-sheet-like dates: Excel timestamps, dotted strings and junk."""
+    rng = np.random.default_rng(seed)
+    days = pd.Timestamp("2015-01-01") + pd.to_timedelta(rng.integers(0, 3650, unique), unit="D")
+    pool = np.empty(unique, dtype=object)
+    kind = rng.integers(0, 4, unique)
+    for i, (d, k) in enumerate(zip(days, kind)):
+        pool[i] = d if k == 0 else f"{d.day}.{d.month}.{d.year}" if k == 1 else d.strftime("%Y-%m-%d") if k == 2 else f"until {d.day}.{d.month}.{d.year}"
+    return pd.Series(pool[rng.integers(0, unique, rows)])
+
+def run(rows: int = 200_000, unique: int = 2_000, *, repeat: int = 3) -> List[Dict[str, Any]]:
+    s = make_dates(rows, unique)
+    assert format_dates(s).equals(s.apply(_legacy_format_date))
+
+    def candidate():
+        _format_date_str.cache_clear()  # measure a cold cache
+        format_dates(s)
+
+    return [compare(f"format_dates rows={rows} unique={unique}", lambda: s.apply(_legacy_format_date), candidate, repeat=repeat)]
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    print_table(run(*args))
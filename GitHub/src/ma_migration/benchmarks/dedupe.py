@@ -0,0 +1,51 @@
+"""Benchmark: factorize-based duplicate suffixing vs the groupby/regex version it replaces.
+
+Run with `python -m ma_migration.benchmarks.dedupe [rows]`.
+"""
+from __future__ import annotations
+import sys
+from typing import Any, Dict, List
+import numpy as np
+import pandas as pd
+
+from ma_migration.domains.customer_master_merge.transforms import ensure_unique_identifiers
+from ._timing import compare, print_table
+
+# pre-factorize implementation
+def _legacy_suffix(series: pd.Series, sep: str = "_") -> pd.Series:
+    s = series.astype(str)
+    counts = s.groupby(s).cumcount() + 1
+    out = (s + sep) + counts.astype(str)
+    return out.str.replace(rf"{sep}1$", "", regex=True)
+
+def _legacy_ensure_unique(df: pd.DataFrame, cols: list[str]) -> pd.DataFrame:
+    out = df.copy()
+    for c in cols:
+        out[c] = _legacy_suffix(out[c])
+    return out
+
+def make_master(rows: int, *, dup_share: float = 0.05, seed: int = 0) -> pd.DataFrame:
+    """Customer master with mostly unique identifiers and a share of repeated ones."""
+    rng = np.random.default_rng(seed)
+    contract = rng.permutation(rows).astype(np.int64) + 10**7
+    dup = rng.random(rows) < dup_share
+    contract[dup] = contract[rng.integers(0, rows, int(dup.sum()))]
+    delivery = pd.Series(contract % 977).astype(str).radd("D").to_numpy()
+    return pd.DataFrame({
+        "Contract number": pd.Series(contract).astype(str) + "_FM_1",
+        "MATO_DeliveryCustomerCode": delivery,
+    })
+
+def run(rows: int = 1_000_000, *, repeat: int = 3) -> List[Dict[str, Any]]:
+    df = make_master(rows)
+    cols = ["Contract number", "MATO_DeliveryCustomerCode"]
+    return [
+        compare(f"suffix one column rows={rows}", lambda: _legacy_suffix(df["Contract number"]),
+                lambda: ensure_unique_identifiers(df, cols[:1])["Contract number"], repeat=repeat),
+        compare(f"ensure_unique_identifiers rows={rows}", lambda: _legacy_ensure_unique(df, cols),
+                lambda: ensure_unique_identifiers(df, cols), repeat=repeat),
+    ]
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:2]]
+    print_table(run(*args))
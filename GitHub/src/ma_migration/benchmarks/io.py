@@ -0,0 +1,38 @@
+"""Benchmark: Excel parsing vs reads served from the Parquet ingest cache.
+
+Run with `python -m ma_migration.benchmarks.io [rows]`.
+"""
+from __future__ import annotations
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List
+import numpy as np
+import pandas as pd
+
+from ma_migration.core.io import IngestCache, read_excel
+from ._timing import compare, print_table
+
+def make_workbook(path: Path, rows: int, *, seed: int = 0) -> Path:
+    """Customer-master-like sheet: IDs, names, codes, amounts and dates."""
+    rng = np.random.default_rng(seed)
+    pd.DataFrame({
+        "CustomerID in HeliosDb": rng.integers(10**5, 10**6, rows),
+        "Customer name": rng.choice(["ACME", "Globex", "Initech", "Umbrella"], rows),
+        "NIP/VAT Number": rng.integers(10**9, 10**10, rows).astype("float64"),
+        "Invoicing Cluster": rng.integers(1, 100, rows).astype(str),
+        "AmountOfEmployee": rng.integers(1, 500, rows),
+        "Contract signed (e.g. 31.8.2022)": pd.Timestamp("2020-01-01") + pd.to_timedelta(rng.integers(0, 2000, rows), unit="D"),
+    }).to_excel(path, index=False)
+    return path
+
+def run(rows: int = 50_000, *, repeat: int = 3) -> List[Dict[str, Any]]:
+    with tempfile.TemporaryDirectory() as tmp:
+        src = make_workbook(Path(tmp) / "master.xlsx", rows)
+        cache = IngestCache(Path(tmp) / "cache")
+        read_excel(src, cache=cache)  # warm the cache
+        return [compare(f"read_excel rows={rows}", lambda: read_excel(src, cache=False), lambda: read_excel(src, cache=cache), repeat=repeat)]
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:2]]
+    print_table(run(*args))
@@ -0,0 +1,44 @@
+"""Benchmark: vectorized ID kernels in `core.strings` vs the per-element versions they replace.
+
+Run with `python -m ma_migration.benchmarks.strings [rows]`.
+"""
+from __future__ import annotations
+import sys
+from typing import Any, Dict, List
+import numpy as np
+import pandas as pd
+
+from ma_migration.core.strings import int_like_to_str, to_numeric_keep_nan, zfill_strip
+from ._timing import compare, print_table
+
+# pre-vectorization implementations
+def _legacy_numeric_id_to_str(series: pd.Series) -> pd.Series:
+    return series.map('{:.0f}'.format).astype(str).str.strip()
+
+def _legacy_coerce_numeric_keep_nan(series: pd.Series) -> pd.Series:
+    return series.apply(lambda x: pd.to_numeric(x, errors='coerce'))
+
+def _legacy_zfill(series: pd.Series, width: int) -> pd.Series:
+    return series.astype(str).str.strip().str.zfill(width)
+
+def make_ids(rows: int, *, seed: int = 0) -> Dict[str, pd.Series]:
+    """VAT-like float IDs with gaps, mixed-type object numbers and short clusters."""
+    rng = np.random.default_rng(seed)
+    vat = rng.integers(10**9, 10**10, rows).astype("float64")
+    vat[rng.random(rows) < 0.02] = np.nan
+    mixed = pd.Series(rng.integers(0, 10**6, rows).astype(str), dtype=object)
+    mixed[rng.random(rows) < 0.05] = "n/a"
+    cluster = pd.Series(rng.integers(1, 100, rows).astype(str), dtype=object)
+    return {"vat": pd.Series(vat), "mixed": mixed, "cluster": cluster}
+
+def run(rows: int = 500_000, *, repeat: int = 3) -> List[Dict[str, Any]]:
+    d = make_ids(rows)
+    return [
+        compare(f"int_like_to_str rows={rows}", lambda: _legacy_numeric_id_to_str(d["vat"]), lambda: int_like_to_str(d["vat"]), repeat=repeat),
+        compare(f"to_numeric_keep_nan rows={rows}", lambda: _legacy_coerce_numeric_keep_nan(d["mixed"]), lambda: to_numeric_keep_nan(d["mixed"]), repeat=repeat),
+        compare(f"zfill_strip rows={rows}", lambda: _legacy_zfill(d["cluster"], 4), lambda: zfill_strip(d["cluster"], 4), repeat=repeat),
+    ]
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:2]]
+    print_table(run(*args))
@@ -0,0 +1,205 @@
+"""Benchmark suite: every domain `prepare_*`, the contract runner and core kernels.
+
+Cases run on `synthetic.generate(rows)` data, each timed best-of-`repeat`.
+Results are saved as JSON with the environment they were measured in; given a
+baseline file, cases slower than `baseline * (1 + threshold)` are reported as
+regressions (and the command exits 1).
+
+    python -m ma_migration.benchmarks.suite --rows 100000 --save results.json
+    python -m ma_migration.benchmarks.suite --rows 100000 --baseline results.json
+"""
+from __future__ import annotations
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import warnings
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+from ._timing import best_of
+from .synthetic import SyntheticData, customers_contract, generate
+
+# an output contract in the shape of contracts/output/customer_master.yaml
+CUSTOMER_MASTER_CONTRACT: Dict[str, Any] = {
+    "dataset": "customer_master",
+    "version": "1.0",
+    "required_columns": ["Customer name", "Delivery Customer Name", "MATO_DeliveryCustomerCode", "Contract number"],
+    "columns": {
+        "MATO_DeliveryCustomerCode": {"required": True, "unique": True, "severity": "error"},
+        "Contract number": {"required": True, "unique": True, "severity": "error"},
+        "Finishing Method": {"required": True, "allowed_values": ["310", "100", "300", "STD"], "severity": "error"},
+        "Delivery Customer Name": {"required": True, "max_length": 80, "severity": "warning"},
+    },
+    "rules": [
+        {"id": "VAT_10_DIGITS", "type": "regex", "column": "NIP / VAT Number", "pattern": r"^\d{10}$", "severity": "error"},
+    ],
+}
+
+@dataclass(frozen=True)
+class Case:
+    name: str
+    group: str  # "domain", "pipeline", "contracts" or "kernel"
+    fn: Callable[[], Any]
+    rows: int
+
+def _intermediates(data: SyntheticData) -> Dict[str, Any]:
+    """Inputs of the downstream domains, computed once outside the timings."""
+    from ma_migration.domains.customers.pipeline import prepare_customers
+    from ma_migration.domains.finishing_method.pipeline import prepare_finishing_methods
+    from ma_migration.domains.customer_master_merge.pipeline import prepare_customer_master_file
+
+    res = prepare_customers(data.customers_master, contract=customers_contract(), strict=False)
+    fm_uq = prepare_finishing_methods(data.finishing_methods, res.data["customers_base"])
+    master = prepare_customer_master_file(res.data["customers_base"], fm_uq)
+    return {
+        "customers_expanded": res.data["customers_base"],
+        "customers_for_invoicing": res.data["customers_for_invoicing"],
+        "customers_for_lockers_wearers": res.data["customers_for_lockers_wearers"],
+        "fm_uq": fm_uq,
+        "customer_master": master["customer_master"],
+    }
+
+def build_cases(data: SyntheticData) -> List[Case]:
+    from ma_migration.contracts.plan import compile_contract
+    from ma_migration.contracts.runner import run_contract
+    from ma_migration.core.dates import format_dates
+    from ma_migration.core.strings import int_like_to_str, strip_object_columns
+    from ma_migration.domains.customers.pipeline import prepare_customers
+    from ma_migration.domains.finishing_method.pipeline import prepare_finishing_methods
+    from ma_migration.domains.customer_master_merge.pipeline import prepare_customer_master_file
+    from ma_migration.domains.customer_master_merge.transforms import ensure_unique_identifiers
+    from ma_migration.domains.invoicing_customers.pipeline import prepare_invoicing_customers
+    from ma_migration.domains.lockers_wearers.pipeline import prepare_lockers_and_wearers
+    from ma_migration.domains.product_features.pipeline import prepare_product_catalog, prepare_product_size_mappings
+    from ma_migration.domains.products_sizes.pipeline import prepare_product_sizes
+    from ma_migration.pipelines.customers_breakdown import run_from_dataframes
+
+    contract = customers_contract()
+    mid = _intermediates(data)
+    frames = data.frames()
+    plan = compile_contract(CUSTOMER_MASTER_CONTRACT)
+    cus, pieces, master = data.customers_master, data.pieces_in_circulation, mid["customer_master"]
+    vat = pd.to_numeric(cus["NIP / VAT Number"]).astype("float64")
+    signed = cus["Contract signed (e.g. 31.8.2022)"]
+    return [
+        Case("prepare_customers", "domain", lambda: prepare_customers(cus, contract=contract, strict=False), len(cus)),
+        Case("prepare_finishing_methods", "domain",
+             lambda: prepare_finishing_methods(data.finishing_methods, mid["customers_expanded"]), len(data.finishing_methods)),
+        Case("prepare_customer_master_file", "domain",
+             lambda: prepare_customer_master_file(mid["customers_expanded"], mid["fm_uq"]), len(mid["customers_expanded"])),
+        Case("prepare_invoicing_customers", "domain",
+             lambda: prepare_invoicing_customers(mid["customers_for_invoicing"]), len(mid["customers_for_invoicing"])),
+        Case("prepare_lockers_and_wearers", "domain", lambda: prepare_lockers_and_wearers(
+            pieces, data.lockers_wearers_ref, mid["customers_for_lockers_wearers"], cus, frames["active_garments"]), len(pieces)),
+        Case("prepare_product_sizes", "domain", lambda: prepare_product_sizes(data.product_sizes), len(data.product_sizes)),
+        Case("prepare_product_catalog", "domain", lambda: prepare_product_catalog(data.li_product_catalog), len(data.li_product_catalog)),
+        Case("prepare_product_size_mappings", "domain",
+             lambda: prepare_product_size_mappings(data.li_product_sizes), len(data.li_product_sizes)),
+        Case("run_from_dataframes", "pipeline",
+             lambda: run_from_dataframes(customers_contract=contract, strict=False, **frames), len(pieces)),
+        Case("run_contract customer_master", "contracts", lambda: run_contract(master, plan, strict=False), len(master)),
+        Case("strip_object_columns", "kernel", lambda: strip_object_columns(cus), len(cus)),
+        Case("int_like_to_str", "kernel", lambda: int_like_to_str(vat), len(vat)),
+        Case("format_dates", "kernel", lambda: format_dates(signed), len(signed)),
+        Case("ensure_unique_identifiers", "kernel",
+             lambda: ensure_unique_identifiers(master, ["Contract number", "MATO_DeliveryCustomerCode"]), len(master)),
+    ]
+
+def environment() -> Dict[str, Any]:
+    try:
+        from importlib.metadata import version
+        package = version("ma-migration")
+    except Exception:
+        package = None
+    return {
+        "ma_migration": package,
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+def run(rows: int = 100_000, *, repeat: int = 3, seed: int = 0, only: Sequence[str] | None = None) -> Dict[str, Any]:
+    """Time every case (or those named in `only`); returns the JSON-ready results."""
+    data = generate(rows, seed=seed)
+    results: Dict[str, Any] = {}
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")  # data-quality warnings are part of the workload, not the output
+        for case in build_cases(data):
+            if only and case.name not in only:
+                continue
+            seconds = best_of(case.fn, repeat=repeat)
+            results[case.name] = {"group": case.group, "seconds": seconds, "rows": case.rows,
+                                  "rows_per_second": case.rows / seconds if seconds else None}
+    return {"rows": rows, "seed": seed, "repeat": repeat, "created": time.time(),
+            "environment": environment(), "results": results}
+
+def save(results: Dict[str, Any], path: str | Path) -> None:
+    Path(path).write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+def load(path: str | Path) -> Dict[str, Any]:
+    return json.loads(Path(path).read_text(encoding="utf-8"))
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], *, threshold: float = 0.25,
+            min_seconds: float = 0.005) -> List[Dict[str, Any]]:
+    """Cases at least `threshold` slower than the baseline.
+
+    Cases faster than `min_seconds` in both runs are skipped: at that size
+    timer noise dominates. Comparing runs of different `rows` or machines is
+    allowed but flagged in the returned entries.
+    """
+    regressions: List[Dict[str, Any]] = []
+    same_setup = (results.get("rows") == baseline.get("rows")
+                  and results.get("environment", {}).get("platform") == baseline.get("environment", {}).get("platform"))
+    for name, cur in results["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if base is None or max(cur["seconds"], base["seconds"]) < min_seconds:
+            continue
+        ratio = cur["seconds"] / base["seconds"] if base["seconds"] else float("inf")
+        if ratio > 1 + threshold:
+            regressions.append({"name": name, "baseline_s": base["seconds"], "current_s": cur["seconds"],
+                                "ratio": ratio, "same_setup": same_setup})
+    return regressions
+
+def print_results(results: Dict[str, Any], baseline: Dict[str, Any] | None = None) -> None:
+    print(f"{'case':<32} {'group':<10} {'rows':>10} {'seconds':>9} {'rows/s':>12} {'vs base':>8}")
+    for name, r in results["results"].items():
+        base = (baseline or {}).get("results", {}).get(name)
+        vs = f"{r['seconds'] / base['seconds']:>7.2f}x" if base and base["seconds"] else ""
+        rate = f"{r['rows_per_second']:>12,.0f}" if r["rows_per_second"] else f"{'':>12}"
+        print(f"{name:<32} {r['group']:<10} {r['rows']:>10,} {r['seconds']:>9.4f} {rate} {vs:>8}")
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="ma-migration bench suite", description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000, help="garments in circulation (customers = rows / 20)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--only", nargs="+", default=None, help="case names to run")
+    parser.add_argument("--save", default=None, help="write results to this JSON file")
+    parser.add_argument("--baseline", default=None, help="compare with a saved results file")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown before flagging (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    results = run(args.rows, repeat=args.repeat, seed=args.seed, only=args.only)
+    baseline = load(args.baseline) if args.baseline else None
+    print_results(results, baseline)
+    if args.save:
+        save(results, args.save)
+    if baseline is None:
+        return 0
+    regressions = compare(results, baseline, threshold=args.threshold)
+    for r in regressions:
+        note = "" if r["same_setup"] else " (different rows or machine)"
+        print(f"REGRESSION {r['name']}: {r['baseline_s']:.4f}s -> {r['current_s']:.4f}s ({r['ratio']:.2f}x){note}")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,255 @@
+"""Deterministic synthetic inputs for the customers breakdown, at any scale.
+
+`generate(rows)` builds every source the pipeline reads, shaped like the real
+extracts: a customer master with "Both" contract types and missing VATs and
+coupling codes, finishing methods, PiecesInCirculation (`rows` garments),
+the lockers/wearers reference and ActiveGarments files, plus small product
+sheets. The same `rows` and `seed` always give the same data. Frames are typed
+the way the readers return them (numeric IDs and barcodes from CSV/Excel,
+text columns from the customers contract), so `frames()` can go straight into
+`run_from_dataframes` and `write()` produces files for `run_from_sources`.
+
+    python -m ma_migration.benchmarks.synthetic 100000 /tmp/synthetic
+"""
+from __future__ import annotations
+import json
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+
+from ma_migration.core.contracts import DomainContract
+from ma_migration.core.strings import numeric_id_to_str
+
+# contract key -> customer master header; every column the pipeline uses is declared
+CUSTOMER_COLUMNS = {
+    "Source_Customer_ID": "CustomerID in HeliosDb",
+    "NIP_VAT_Number": "NIP / VAT Number",
+    "Customer_Name": "Customer name",
+    "Department_Name": "Department/Branch Name",
+    "Contract_Number": "Contract number",
+    "MATO_Delivery_Code": "MATO_DeliveryCustomerCode",
+    "Contract_Type": "Contract type (rental / laundry/ Both)",
+    "Invoicing_Coupling_Code": "Invoicing Coupling Code",
+    "Invoicing_Cluster": "Invoicing Cluster",
+    "Postcode": "Postcode",
+    "City": "City / Town",
+    "Address": "Address",
+    "Contract_Signed": "Contract signed (e.g. 31.8.2022)",
+}
+
+def customers_contract_dict() -> Dict[str, Any]:
+    columns: Dict[str, Any] = {k: [{"name": v, "type": "string", "required": True}] for k, v in CUSTOMER_COLUMNS.items()}
+    columns["Contract_Type"][0]["valid_values"] = ["Rental", "Laundry"]
+    return {"domain": "customers", "filename": "customers_master.csv", "columns": columns}
+
+def customers_contract() -> DomainContract:
+    """Contract matching the synthetic customer master (see `CUSTOMER_COLUMNS`)."""
+    return DomainContract.from_dict(customers_contract_dict())
+
+_NAMES = np.array(["ACME", "Globex", "Initech", "Umbrella", "Hooli", "Stark", "Wayne", "Tyrell", "Cyberdyne", "Soylent"])
+_CITIES = np.array(["Warszawa", "Kraków", "Łódź", "Wrocław", "Poznań", "Gdańsk", "Sierpc"])
+_ITEMS = np.array(["Jacket", "Trousers", "Shirt", "Apron", "Coat", "Overall"])
+_SIZES = np.array(["S", "M", "L", "XL", "XXL", "44", "48", "52"])
+
+def _pick(rng: np.random.Generator, values: List[Any], p: List[float], n: int) -> np.ndarray:
+    return rng.choice(np.array(values, dtype=object), size=n, p=p)
+
+def _with_missing(values: np.ndarray, rng: np.random.Generator, share: float) -> np.ndarray:
+    out = values.astype(object)
+    out[rng.random(len(out)) < share] = np.nan
+    return out
+
+@dataclass
+class SyntheticData:
+    customers_master: pd.DataFrame
+    finishing_methods: pd.DataFrame
+    pieces_in_circulation: pd.DataFrame
+    lockers_wearers_ref: pd.DataFrame
+    # file name -> rows of that ActiveGarments workbook (VAT, barcode, invoiced)
+    active_garment_files: Dict[str, pd.DataFrame] = field(default_factory=dict)
+    product_sizes: pd.DataFrame = field(default_factory=pd.DataFrame)
+    li_product_catalog: pd.DataFrame = field(default_factory=pd.DataFrame)
+    li_product_sizes: pd.DataFrame = field(default_factory=pd.DataFrame)
+
+    @property
+    def active_garments(self) -> pd.DataFrame:
+        """ActiveGarments as `load_active_garments_from_excels` returns them."""
+        frames = [df.set_axis(["NIP / VAT Number", "Barcode", "Invoiced"], axis=1).assign(Source_File=name)
+                  for name, df in self.active_garment_files.items()]
+        active = pd.concat(frames, ignore_index=True)
+        active["NIP / VAT Number"] = numeric_id_to_str(active["NIP / VAT Number"])
+        active["Invoiced"] = active["Invoiced"].astype(str).str.strip().str.lower()
+        return active
+
+    def frames(self) -> Dict[str, pd.DataFrame]:
+        """Keyword arguments for `run_from_dataframes` (without the contract)."""
+        return {
+            "customers_master": self.customers_master,
+            "finishing_methods": self.finishing_methods,
+            "pieces_in_circulation": self.pieces_in_circulation,
+            "lockers_wearers_ref": self.lockers_wearers_ref,
+            "active_garments": self.active_garments,
+            "product_sizes": self.product_sizes,
+            "li_product_catalog": self.li_product_catalog,
+            "li_product_sizes": self.li_product_sizes,
+        }
+
+    def write(self, directory: str | Path):
+        """Write the sources as the pipeline reads them; returns a `SourceConfig`.
+
+        Workbooks are streamed (`files_generation.xlsx`), so this works up to
+        Excel's row limit per sheet; the customer master is a CSV read through
+        its contract, so it has no such limit.
+        """
+        from ma_migration.core.types import SourceConfig
+        from ma_migration.domains.files_generation.xlsx import write_xlsx_streaming
+
+        d = Path(directory)
+        (d / "ActiveGarments").mkdir(parents=True, exist_ok=True)
+        (d / "customers_contract.json").write_text(json.dumps(customers_contract_dict(), ensure_ascii=False), encoding="utf-8")
+        self.customers_master.to_csv(d / "customers_master.csv", index=False)
+        write_xlsx_streaming(self.finishing_methods, d / "finishing_methods.xlsx")
+        self.pieces_in_circulation.to_csv(d / "pieces_in_circulation.txt", sep="\t", index=False, lineterminator="\r")
+        self.lockers_wearers_ref.to_csv(d / "lockers_wearers_ref.txt", sep="\t", index=False, lineterminator="\r", encoding="latin-1")
+        for name, df in self.active_garment_files.items():
+            write_xlsx_streaming(df, d / "ActiveGarments" / name)
+        write_xlsx_streaming(self.product_sizes, d / "product_sizes.xlsx", sheet_name="v3_sizes")
+        catalog = d / "li_product_catalog.xlsx"
+        # the catalog sheet has two title rows above its header (header=2)
+        self.li_product_catalog.to_excel(catalog, sheet_name="Product to export", startrow=2, index=False)
+        write_xlsx_streaming(self.li_product_sizes, d / "li_product_sizes.xlsx", sheet_name="ProductSize Mappings_v3")
+        return SourceConfig(
+            customers_masterfile_path=d / "customers_master.csv",
+            customers_contract_path=d / "customers_contract.json",
+            finishing_methods_path=d / "finishing_methods.xlsx",
+            pieces_in_circulation_path=d / "pieces_in_circulation.txt",
+            lockers_wearers_ref_path=d / "lockers_wearers_ref.txt",
+            active_garments_glob=str(d / "ActiveGarments" / "*.xlsx"),
+            product_sizes_path=d / "product_sizes.xlsx",
+            li_product_catalog_path=catalog,
+            li_product_sizes_path=d / "li_product_sizes.xlsx",
+        )
+
+def generate(rows: int = 100_000, *, customers: int | None = None, active_files: int = 4, seed: int = 0) -> SyntheticData:
+    """Synthetic inputs with `rows` garments in circulation (10k to 10M is typical).
+
+    `customers` defaults to one per 20 garments. About 3% of customers have no
+    VAT, 20% a "Both" contract and 20% no coupling code; VATs are shared by
+    departments of the same company. 5% of garments belong to customers missing
+    from the master and 15% of rental garments are not in ActiveGarments, so
+    the inner merges lose rows as they do on real extracts.
+    """
+    rng = np.random.default_rng(seed)
+    n_cus = customers or max(rows // 20, 10)
+
+    # ---- customer master (one row per customer department)
+    ids = np.arange(100_000, 100_000 + n_cus)
+    n_companies = max(int(n_cus * 0.85), 1)
+    company = rng.integers(0, n_companies, n_cus)
+    vat = pd.Series(company + 5_000_000_000).astype(str).to_numpy()
+    contract_type = _pick(rng, ["Rental", "Laundry", "Both"], [0.55, 0.25, 0.20], n_cus)
+    coupling = _pick(rng, ["no coupling", "manual invoice", "0091", "0092", "0093", "0094", np.nan],
+                     [0.45, 0.10, 0.07, 0.06, 0.06, 0.06, 0.20], n_cus)
+    contract_no = ids + 7_000_000
+    dup = rng.random(n_cus) < 0.02  # some contract numbers repeat across departments
+    contract_no[dup] = contract_no[rng.integers(0, n_cus, int(dup.sum()))]
+    signed = pd.Timestamp("2015-01-01") + pd.to_timedelta(rng.integers(0, 3650, n_cus), unit="D")
+    customers_master = pd.DataFrame({
+        "CustomerID in HeliosDb": pd.Series(ids).astype(str).to_numpy(dtype=object),
+        "NIP / VAT Number": _with_missing(vat, rng, 0.03),
+        "Customer name": np.char.add(_NAMES[company % len(_NAMES)], pd.Series(company).astype(str).to_numpy().astype(str)).astype(object),
+        "Department/Branch Name": _with_missing(np.char.add("Dept ", pd.Series(ids % 97).astype(str).to_numpy().astype(str)), rng, 0.05),
+        "Contract number": pd.Series(contract_no).astype(str).to_numpy(dtype=object),
+        "MATO_DeliveryCustomerCode": np.char.add("D", pd.Series(ids).astype(str).to_numpy().astype(str)).astype(object),
+        "Contract type (rental / laundry/ Both)": contract_type,
+        "Invoicing Coupling Code": coupling,
+        "Invoicing Cluster": pd.Series(rng.integers(1, 21, n_cus)).astype(str).to_numpy(dtype=object),
+        "Postcode": _with_missing(np.char.add("0", pd.Series(rng.integers(1000, 9999, n_cus)).astype(str).to_numpy().astype(str)), rng, 0.05),
+        "City / Town": _with_missing(_CITIES[rng.integers(0, len(_CITIES), n_cus)], rng, 0.05),
+        "Address": _with_missing(np.char.add("ul. Przemysłowa ", pd.Series(rng.integers(1, 200, n_cus)).astype(str).to_numpy().astype(str)), rng, 0.05),
+        "Contract signed (e.g. 31.8.2022)": signed.strftime("%d.%m.%Y").to_numpy(dtype=object),
+    })
+
+    # ---- finishing methods: 1-3 item types per customer, one method per customer
+    per_cus = rng.integers(1, 4, n_cus)
+    fm_cus = np.repeat(ids, per_cus)
+    method = _pick(rng, ["310", "100", "300", "STD"], [0.4, 0.2, 0.1, 0.3], n_cus)
+    second = rng.random(n_cus) < 0.05  # some customers use a second method for another item type
+    fm_method = np.repeat(method, per_cus).astype(object)
+    first_row = np.r_[0, np.cumsum(per_cus)[:-1]]
+    alt = first_row[second & (per_cus > 1)] + 1
+    fm_method[alt] = np.where(fm_method[alt] == "STD", "310", "STD")
+    finishing_methods = pd.DataFrame({
+        "ID Kontrahenta": fm_cus,
+        "ID Asortymentu Egzemplarza": np.concatenate([np.arange(k) for k in per_cus]) + 1 if n_cus else np.array([], dtype=int),
+        "FinishingMethod_FinishingMethod": fm_method,
+    })
+
+    # ---- garments in circulation, with the lockers/wearers reference
+    owner = rng.integers(0, n_cus, rows)
+    piece_cus = ids[owner]
+    unknown = rng.random(rows) < 0.05
+    piece_cus[unknown] = rng.integers(900_000, 999_999, int(unknown.sum()))
+    barcodes = rng.permutation(rows).astype(np.int64) + 10**11
+    items = rng.integers(0, len(_ITEMS), rows)
+    pieces_in_circulation = pd.DataFrame({
+        "CustomerID": piece_cus,
+        "Barcode": barcodes,
+        "Item Code": items + 1000,
+        "Item": _ITEMS[items].astype(object),
+        "Size": _SIZES[rng.integers(0, len(_SIZES), rows)].astype(object),
+    })
+    dept_id = piece_cus * 10 + rng.integers(1, 5, rows)
+    lockers_wearers_ref = pd.DataFrame({
+        "Kod kontrahenta": piece_cus,
+        "Kod kreskowy": barcodes,
+        "ID Kontrahenta": piece_cus,
+        "ID Oddzia?u": np.where(rng.random(rows) < 0.01, np.nan, dept_id),  # float, as read_csv gives it
+        "Kod pracownika": rng.integers(1, 10**6, rows),
+        "Szatnia": rng.integers(1, 20, rows),
+        "Szafka": rng.integers(1, 500, rows),
+        "Rozmiar": pieces_in_circulation["Size"].to_numpy(),
+        "Ilo?? pra?": rng.integers(0, 200, rows),
+    })
+
+    # ---- ActiveGarments: 85% of the rental garments, split across files by VAT
+    piece_vat = pd.Series(customers_master["NIP / VAT Number"].to_numpy()[owner])
+    rental_like = pd.Series(contract_type[owner]) != "Laundry"
+    active = (~unknown) & rental_like.to_numpy() & piece_vat.notna().to_numpy() & (rng.random(rows) < 0.85)
+    active_rows = pd.DataFrame({
+        "NIP / VAT Number": piece_vat[active].astype(np.int64).to_numpy(),
+        "Barcode": barcodes[active],
+        "Invoiced": _pick(rng, ["yes", "no", "Yes"], [0.8, 0.15, 0.05], int(active.sum())),
+    })
+    part = active_rows["NIP / VAT Number"].to_numpy() % max(active_files, 1)
+    active_garment_files = {f"ActiveGarments_{i + 1:02d}.xlsx": active_rows[part == i].reset_index(drop=True)
+                            for i in range(max(active_files, 1))}
+
+    # ---- product sheets
+    n_prod = max(rows // 100, 10)
+    product = np.arange(n_prod) + 5000
+    product_sizes = pd.DataFrame({"ProductCode": product, "Size": _SIZES[product % len(_SIZES)].astype(object)})
+    li_product_catalog = pd.DataFrame({"ProductCode": product, "Description": _ITEMS[product % len(_ITEMS)].astype(object),
+                                       "Price": np.round(rng.uniform(5, 150, n_prod), 2)})
+    li_product_sizes = pd.DataFrame({"ProductCode": product, "SizeMapping": _SIZES[(product * 7) % len(_SIZES)].astype(object)})
+
+    return SyntheticData(
+        customers_master=customers_master,
+        finishing_methods=finishing_methods,
+        pieces_in_circulation=pieces_in_circulation,
+        lockers_wearers_ref=lockers_wearers_ref,
+        active_garment_files=active_garment_files,
+        product_sizes=product_sizes,
+        li_product_catalog=li_product_catalog,
+        li_product_sizes=li_product_sizes,
+    )
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    out = Path(sys.argv[2]) if len(sys.argv) > 2 else Path("synthetic")
+    generate(n).write(out)
+    print(f"wrote {n:,} garments' worth of inputs to {out}")
@@ -0,0 +1,370 @@
+"""`ma-migration` command line.
+
+    ma-migration check -c migration.yaml      # config and contract checks
+    ma-migration lint contracts/              # contract linting
+    ma-migration run -c migration.yaml        # run, export, validate
+    ma-migration validate -c migration.yaml   # validate exported outputs
+    ma-migration export -c migration.yaml --formats parquet csv
+    ma-migration bench [dedupe io ... | startup]
+    ma-migration bench suite --rows 100000 --baseline bench.json
+    ma-migration checkpoints list
+
+The config file (YAML or JSON; relative paths are relative to it):
+
+    sources:            # `core.types.SourceConfig` fields
+      customers_masterfile_path: INPUT/Customers_MasterFile.xlsx
+      customers_contract_path: contracts/input/customers.yaml
+      active_garments_glob: INPUT/ActiveGarments/*.xlsx
+    output:
+      dir: output
+      formats: [xlsx]   # one format, a list, or {output name: formats}
+    run:
+      strict: false
+      max_workers: null
+      checkpoints: false  # true (default cache dir) or a directory
+      copy_on_write: false  # pandas copy-on-write for the whole run (see core.frames)
+    validate:           # output name -> contract
+      customer_master: contracts/output/customer_master.yaml
+
+Only this module and the standard library load at startup; pandas and the
+pipeline modules are imported inside the commands that need them, so
+`--help`, `check` and `lint` stay fast. `--timings` (or MA_MIGRATION_TIMINGS=1)
+prints startup and command times to stderr.
+"""
+from __future__ import annotations
+import time
+
+_T_IMPORT = time.perf_counter()
+
+import argparse
+import dataclasses
+import json
+import os
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Sequence
+
+_SECTIONS = ("sources", "output", "run", "validate")
+_OUTPUT_READ_ORDER = ("parquet", "csv", "xlsx")
+BENCHMARKS = ("dates", "dedupe", "io", "strings")
+
+@dataclass(frozen=True)
+class CliConfig:
+    path: Path
+    sources: Dict[str, Any] = field(default_factory=dict)
+    out_dir: Path = Path("output")
+    formats: Any = "xlsx"
+    strict: bool = True
+    max_workers: int | None = None
+    checkpoints: bool | Path = False
+    copy_on_write: bool = False
+    validate: Dict[str, Path] = field(default_factory=dict)
+
+    def source_config(self):
+        from ma_migration.core.types import SourceConfig
+        return SourceConfig(**self.sources)
+
+def _read_config_file(path: Path) -> Dict[str, Any]:
+    text = path.read_text(encoding="utf-8")
+    if path.suffix.lower() == ".json":
+        return json.loads(text)
+    import yaml
+    return yaml.safe_load(text) or {}
+
+def load_config(path: str | Path) -> CliConfig:
+    """Parse and check a run config; raises ValueError naming the bad key."""
+    from ma_migration.core.types import SourceConfig
+
+    path = Path(path)
+    raw = _read_config_file(path)
+    if not isinstance(raw, dict):
+        raise ValueError(f"{path}: the config must be a mapping")
+    unknown = set(raw) - set(_SECTIONS)
+    if unknown:
+        raise ValueError(f"{path}: unknown sections {sorted(unknown)} (known: {list(_SECTIONS)})")
+    base = path.parent
+
+    fields = {f.name for f in dataclasses.fields(SourceConfig)}
+    sources: Dict[str, Any] = {}
+    for key, value in (raw.get("sources") or {}).items():
+        if key not in fields:
+            raise ValueError(f"{path}: unknown source setting {key!r}")
+        if value is not None and (key.endswith("_path") or key.endswith("_glob")):
+            value = base / str(value)
+            value = str(value) if key.endswith("_glob") else value
+        sources[key] = value
+    if sources.get("customers_masterfile_path") is None:
+        raise ValueError(f"{path}: sources.customers_masterfile_path is required")
+
+    output = raw.get("output") or {}
+    run = raw.get("run") or {}
+    for section, known in (("output", {"dir", "formats"}), ("run", {"strict", "max_workers", "checkpoints", "copy_on_write"})):
+        extra = set(raw.get(section) or {}) - known
+        if extra:
+            raise ValueError(f"{path}: unknown {section} settings {sorted(extra)}")
+    checkpoints = run.get("checkpoints", False)
+    if isinstance(checkpoints, str):
+        checkpoints = base / checkpoints
+    return CliConfig(
+        path=path,
+        sources=sources,
+        out_dir=base / str(output.get("dir", "output")),
+        formats=output.get("formats", "xlsx"),
+        strict=bool(run.get("strict", True)),
+        max_workers=run.get("max_workers"),
+        checkpoints=checkpoints,
+        copy_on_write=bool(run.get("copy_on_write", False)),
+        validate={name: base / str(p) for name, p in (raw.get("validate") or {}).items()},
+    )
+
+def _contract_files(paths: Sequence[str | Path]) -> List[Path]:
+    files: List[Path] = []
+    for p in map(Path, paths):
+        if p.is_dir():
+            files += sorted(f for f in p.rglob("*") if f.suffix.lower() in (".yaml", ".yml", ".json"))
+        else:
+            files.append(p)
+    return files
+
+def _lint(files: Sequence[Path]) -> int:
+    from ma_migration.contracts.lint import lint_contract_file
+    errors = 0
+    for f in files:
+        issues = lint_contract_file(f)
+        errors += sum(i.level == "error" for i in issues)
+        for issue in issues:
+            print(f"{f}: {issue}")
+    print(f"{len(files)} contract(s) checked, {errors} error(s)")
+    return 1 if errors else 0
+
+def _config_contracts(cfg: CliConfig) -> List[Path]:
+    contract = cfg.sources.get("customers_contract_path")
+    return ([Path(contract)] if contract is not None else []) + list(cfg.validate.values())
+
+def cmd_check(args: argparse.Namespace) -> int:
+    cfg = load_config(args.config)
+    problems = []
+    for key, value in cfg.sources.items():
+        if key.endswith("_path") and value is not None and not Path(value).is_file():
+            problems.append(f"sources.{key}: {value} does not exist")
+        if key.endswith("_glob") and value is not None:
+            import glob
+            if not glob.glob(value):
+                problems.append(f"sources.{key}: {value} matches no files")
+    for name, contract in cfg.validate.items():
+        if not contract.is_file():
+            problems.append(f"validate.{name}: {contract} does not exist")
+    for p in problems:
+        print(p)
+    lint_status = _lint([p for p in _config_contracts(cfg) if p.is_file()])
+    return 1 if problems or lint_status else 0
+
+def cmd_lint(args: argparse.Namespace) -> int:
+    paths = args.paths
+    if not paths:
+        paths = _config_contracts(load_config(args.config)) if args.config else ["contracts"]
+    return _lint(_contract_files(paths))
+
+def _validate(outputs: Dict[str, Any], cfg: CliConfig) -> int:
+    from ma_migration.contracts.runner import run_contract
+    from ma_migration.contracts.loader import load_contract_plan
+
+    failed = 0
+    for name, contract in cfg.validate.items():
+        if name not in outputs:
+            print(f"{name}: no output to validate")
+            failed += 1
+            continue
+        report = run_contract(outputs[name], load_contract_plan(contract), contract_name=str(contract), strict=False)
+        print(json.dumps(report.summary()))
+        failed += not report.is_ok()
+    return 1 if failed else 0
+
+def cmd_run(args: argparse.Namespace) -> int:
+    cfg = load_config(args.config)
+    from ma_migration.domains.files_generation.writers import write_outputs
+    from ma_migration.pipelines.customers_breakdown import run_from_sources
+
+    checkpoints = cfg.checkpoints
+    if args.checkpoints is not None:
+        checkpoints = Path(args.checkpoints)
+    if args.no_checkpoints:
+        checkpoints = False
+    profiler = None
+    if args.profile:
+        from ma_migration.pipelines.profiling import PipelineProfiler
+        profiler = PipelineProfiler(trace_memory=args.trace_memory)
+
+    outputs = run_from_sources(cfg.source_config(), strict=cfg.strict, max_workers=args.max_workers or cfg.max_workers,
+                               checkpoints=checkpoints, profile=profiler, copy_on_write=cfg.copy_on_write)
+    manifest = write_outputs(outputs, cfg.out_dir, formats=cfg.formats, max_workers=args.max_workers or cfg.max_workers)
+    for f in manifest.files:
+        print(f"{f.name:<28} {f.format:<8} {f.rows:>10,} rows  {f.path}")
+    if profiler is not None:
+        report = profiler.report()
+        target = Path(args.profile)
+        (report.to_html if target.suffix.lower() in (".html", ".htm") else report.to_json)(target)
+        print(f"profile written to {target}")
+    return _validate(outputs, cfg) if cfg.validate and not args.no_validate else 0
+
+def _read_output(out_dir: Path, name: str):
+    import pandas as pd
+    for fmt in _OUTPUT_READ_ORDER:
+        path = out_dir / f"{name}.{fmt}"
+        if not path.is_file():
+            continue
+        if fmt == "parquet":
+            return pd.read_parquet(path)
+        if fmt == "csv":
+            return pd.read_csv(path, dtype=str, keep_default_na=False, na_values=[""])
+        sheets = pd.read_excel(path, sheet_name=None, dtype=str)  # outputs past Excel's row limit span sheets
+        return pd.concat(list(sheets.values()), ignore_index=True)
+    return None
+
+def _exported_outputs(cfg: CliConfig, names: Sequence[str]) -> Dict[str, Any]:
+    outputs = {}
+    for name in names:
+        df = _read_output(cfg.out_dir, name)
+        if df is not None:
+            outputs[name] = df
+    return outputs
+
+def cmd_validate(args: argparse.Namespace) -> int:
+    cfg = load_config(args.config)
+    if not cfg.validate:
+        print(f"{cfg.path}: no 'validate' section")
+        return 0
+    return _validate(_exported_outputs(cfg, list(cfg.validate)), cfg)
+
+def cmd_export(args: argparse.Namespace) -> int:
+    cfg = load_config(args.config)
+    from ma_migration.domains.files_generation.writers import write_outputs
+    from ma_migration.pipelines.customers_breakdown import OUTPUTS
+
+    outputs = _exported_outputs(cfg, args.outputs or OUTPUTS)
+    if not outputs:
+        print(f"No exported outputs found in {cfg.out_dir}; run first")
+        return 1
+    out_dir = Path(args.out_dir) if args.out_dir else cfg.out_dir
+    manifest = write_outputs(outputs, out_dir, formats=args.formats or cfg.formats, max_workers=args.max_workers,
+                             manifest_name="manifest_export.json")
+    for f in manifest.files:
+        print(f"{f.name:<28} {f.format:<8} {f.rows:>10,} rows  {f.path}")
+    return 0
+
+def _startup_seconds(repeat: int) -> float:
+    import subprocess
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        subprocess.run([sys.executable, "-m", "ma_migration.cli", "--help"], check=True, stdout=subprocess.DEVNULL)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+def cmd_bench(args: argparse.Namespace) -> int:
+    if args.names == ["suite"]:
+        from ma_migration.benchmarks.suite import main as suite_main
+        argv = ["--repeat", str(args.repeat)] + (["--rows", str(args.rows)] if args.rows else [])
+        argv += ["--save", args.save] if args.save else []
+        argv += ["--baseline", args.baseline, "--threshold", str(args.threshold)] if args.baseline else []
+        return suite_main(argv)
+    names = args.names or list(BENCHMARKS)
+    unknown = set(names) - set(BENCHMARKS) - {"startup"}
+    if unknown:
+        print(f"Unknown benchmarks {sorted(unknown)} (known: {list(BENCHMARKS) + ['startup']})")
+        return 2
+    if "startup" in names:
+        print(f"{'cli startup (--help)':<40} {_startup_seconds(args.repeat):>11.4f} s")
+    rows = []
+    import importlib
+    from ma_migration.benchmarks._timing import print_table
+    for name in names:
+        if name == "startup":
+            continue
+        module = importlib.import_module(f"ma_migration.benchmarks.{name}")
+        rows += module.run(args.rows, repeat=args.repeat) if args.rows else module.run(repeat=args.repeat)
+    if rows:
+        print_table(rows)
+    return 0
+
+def cmd_checkpoints(args: argparse.Namespace) -> int:
+    from ma_migration.pipelines.checkpoints import main as checkpoints_main
+    return checkpoints_main(args.args)
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="ma-migration", description="Customers breakdown migration pipeline.")
+    parser.add_argument("--timings", action="store_true", help="print startup and command times to stderr")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    def with_config(p: argparse.ArgumentParser, required: bool = True) -> argparse.ArgumentParser:
+        p.add_argument("-c", "--config", required=required, help="run config (YAML or JSON)")
+        return p
+
+    p = with_config(sub.add_parser("check", help="check the config: sources exist, contracts lint clean"))
+    p.set_defaults(func=cmd_check)
+
+    p = with_config(sub.add_parser("lint", help="lint contract files"), required=False)
+    p.add_argument("paths", nargs="*", help="contract files or directories (default: the config's contracts, else ./contracts)")
+    p.set_defaults(func=cmd_lint)
+
+    p = with_config(sub.add_parser("run", help="run the pipeline, export outputs and validate them"))
+    p.add_argument("--max-workers", type=int, default=None)
+    p.add_argument("--checkpoints", default=None, help="checkpoint directory (overrides the config)")
+    p.add_argument("--no-checkpoints", action="store_true")
+    p.add_argument("--profile", default=None, help="write a profile report (.html or .json)")
+    p.add_argument("--trace-memory", action="store_true", help="add tracemalloc peaks to the profile (stages then run one at a time)")
+    p.add_argument("--no-validate", action="store_true")
+    p.set_defaults(func=cmd_run)
+
+    p = with_config(sub.add_parser("validate", help="validate exported outputs against the config's contracts"))
+    p.set_defaults(func=cmd_validate)
+
+    p = with_config(sub.add_parser("export", help="rewrite exported outputs in other formats"))
+    p.add_argument("--formats", nargs="+", default=None, help="e.g. xlsx csv parquet (default: the config's)")
+    p.add_argument("--outputs", nargs="+", default=None, help="output names (default: all found)")
+    p.add_argument("--out-dir", default=None, help="target directory (default: the config's output dir)")
+    p.add_argument("--max-workers", type=int, default=None)
+    p.set_defaults(func=cmd_export)
+
+    p = sub.add_parser("bench", help="run micro-benchmarks")
+    p.add_argument("names", nargs="*",
+                   help=f"benchmarks: {', '.join(BENCHMARKS)}, startup (default: all but startup); "
+                        "or `suite` for the per-domain suite on synthetic data")
+    p.add_argument("--rows", type=int, default=None)
+    p.add_argument("--repeat", type=int, default=3)
+    p.add_argument("--save", default=None, help="suite: write results to this JSON file")
+    p.add_argument("--baseline", default=None, help="suite: compare with saved results, exit 1 on regressions")
+    p.add_argument("--threshold", type=float, default=0.25, help="suite: allowed slowdown (0.25 = 25%%)")
+    p.set_defaults(func=cmd_bench)
+
+    # arguments after `checkpoints` are passed through to `pipelines.checkpoints`
+    p = sub.add_parser("checkpoints", help="list, inspect and purge stage checkpoints", add_help=False)
+    p.set_defaults(func=cmd_checkpoints, args=[])
+    return parser
+
+def main(argv: Sequence[str] | None = None) -> int:
+    # CPU time so far is interpreter start-up plus imports, without I/O waits
+    startup_cpu = time.process_time()
+    ready = time.perf_counter() - _T_IMPORT
+    parser = build_parser()
+    args, extra = parser.parse_known_args(argv)
+    if args.command == "checkpoints":
+        args.args = extra
+    elif extra:
+        parser.error(f"unrecognized arguments: {' '.join(extra)}")
+    timings = args.timings or os.environ.get("MA_MIGRATION_TIMINGS", "").lower() in ("1", "true", "yes")
+    if timings:
+        print(f"startup: {startup_cpu * 1000:.0f} ms cpu, cli import {ready * 1000:.1f} ms", file=sys.stderr)
+    t0 = time.perf_counter()
+    try:
+        status = args.func(args)
+    except (ValueError, FileNotFoundError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        status = 1
+    if timings:
+        print(f"{args.command}: {time.perf_counter() - t0:.3f} s (pandas loaded: {'pandas' in sys.modules})", file=sys.stderr)
+    return status
+
+if __name__ == "__main__":
+    raise SystemExit(main())
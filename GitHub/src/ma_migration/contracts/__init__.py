@@ -1,3 +1,44 @@
-from .loader import load_contract, load_contracts_from_dir
-from .runner import run_contract, run_contracts
-from .report import ContractReport, RuleResult
+from __future__ import annotations
+import importlib
+from typing import TYPE_CHECKING, Any, List
+
+# Public names -> defining submodule. Submodules load on first attribute access
+# (PEP 562), so e.g. `contracts.loader` or `contracts.lint` can be used without
+# importing pandas.
+_EXPORTS = {
+    "load_contract": "loader", "load_contract_plan": "loader", "load_contracts_from_dir": "loader", "clear_contract_cache": "loader",
+    "ContractPlan": "plan", "compile_contract": "plan",
+    "run_contract": "runner", "run_contracts": "runner", "run_contract_jobs": "runner",
+    "ContractReport": "report", "RuleProfile": "report", "RuleResult": "report",
+    "register_profile_hook": "profiling", "unregister_profile_hook": "profiling",
+    "run_contract_chunks": "streaming",
+    "run_contract_incremental": "incremental",
+    "KeyIndex": "references", "register_reference": "references", "unregister_reference": "references", "clear_references": "references",
+    "register_rule_type": "rules", "unregister_rule_type": "rules",
+    "LintIssue": "lint", "lint_contract": "lint", "lint_contract_file": "lint",
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
+
+if TYPE_CHECKING:
+    from .loader import load_contract, load_contract_plan, load_contracts_from_dir, clear_contract_cache
+    from .plan import ContractPlan, compile_contract
+    from .runner import run_contract, run_contracts, run_contract_jobs
+    from .report import ContractReport, RuleProfile, RuleResult
+    from .profiling import register_profile_hook, unregister_profile_hook
+    from .streaming import run_contract_chunks
+    from .incremental import run_contract_incremental
+    from .references import KeyIndex, register_reference, unregister_reference, clear_references
+    from .rules import register_rule_type, unregister_rule_type
+    from .lint import LintIssue, lint_contract, lint_contract_file
@@ -0,0 +1,161 @@
+from __future__ import annotations
+import ast
+import operator
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Tuple
+import numpy as np
+import pandas as pd
+
+# `expression` rules: a small, safe expression language compiled once into a
+# tree of vectorized pandas operations (no eval, no apply, no per-row Python).
+#
+#   Contract_Signed_Date <= Contract_Term
+#   if Contract_Type == 'Laundry' then `Has Rented Locker?` == False
+#   isnull(`Invoicing Coupling Code`) or `Invoicing Coupling Code` in ['0001', '0090']
+#
+# Column names are bare identifiers or `backtick quoted`. Supported: and/or/not,
+# comparisons (incl. chained and in/not in lists), + - * /, literals, and the
+# functions below. A row passes when the expression is True; null -> fails.
+
+Lookup = Callable[[str], pd.Series]
+Node = Callable[[Lookup], Any]
+
+def _to_date(x: Any) -> Any:
+    return pd.to_datetime(x, errors="coerce")
+
+def _to_number(x: Any) -> Any:
+    return pd.to_numeric(x, errors="coerce")
+
+def _length(x: Any) -> Any:
+    return x.astype(str).str.len() if isinstance(x, pd.Series) else len(str(x))
+
+def _isnull(x: Any) -> Any:
+    return x.isna() if isinstance(x, pd.Series) else pd.isna(x)
+
+def _notnull(x: Any) -> Any:
+    return x.notna() if isinstance(x, pd.Series) else not pd.isna(x)
+
+FUNCTIONS: Dict[str, Callable[[Any], Any]] = {
+    "isnull": _isnull,
+    "notnull": _notnull,
+    "to_date": _to_date,
+    "to_number": _to_number,
+    "length": _length,
+    "strip": lambda x: x.astype(str).str.strip() if isinstance(x, pd.Series) else str(x).strip(),
+    "upper": lambda x: x.astype(str).str.upper() if isinstance(x, pd.Series) else str(x).upper(),
+}
+
+_BINOPS = {ast.Add: operator.add, ast.Sub: operator.sub, ast.Mult: operator.mul, ast.Div: operator.truediv}
+_CMPOPS = {ast.Eq: operator.eq, ast.NotEq: operator.ne, ast.Lt: operator.lt, ast.LtE: operator.le, ast.Gt: operator.gt, ast.GtE: operator.ge}
+
+_IF_THEN = re.compile(r"^\s*if\s+(?P<cond>.+?)\s+then\s+(?P<then>.+?)\s*$", re.IGNORECASE | re.DOTALL)
+_BACKTICK = re.compile(r"`([^`]+)`")
+
+def _as_bool(x: Any) -> Any:
+    if isinstance(x, pd.Series):
+        return x.fillna(False).astype(bool) if x.dtype != bool else x
+    return bool(x) if not pd.isna(x) else False
+
+def _isin(left: Any, values: Any) -> Any:
+    values = list(values)
+    return left.isin(values) if isinstance(left, pd.Series) else left in values
+
+def _compile(node: ast.AST, names: Dict[str, str], columns: List[str]) -> Node:
+    if isinstance(node, ast.Expression):
+        return _compile(node.body, names, columns)
+    if isinstance(node, ast.Constant):
+        value = node.value
+        return lambda get: value
+    if isinstance(node, ast.Name):
+        col = names.get(node.id, node.id)
+        if col not in columns:
+            columns.append(col)
+        return lambda get: get(col)
+    if isinstance(node, (ast.List, ast.Tuple, ast.Set)):
+        items = [_compile(e, names, columns) for e in node.elts]
+        return lambda get: [f(get) for f in items]
+    if isinstance(node, ast.BoolOp):
+        parts = [_compile(v, names, columns) for v in node.values]
+        combine = operator.and_ if isinstance(node.op, ast.And) else operator.or_
+        def bool_op(get: Lookup) -> Any:
+            out = _as_bool(parts[0](get))
+            for f in parts[1:]:
+                out = combine(out, _as_bool(f(get)))
+            return out
+        return bool_op
+    if isinstance(node, ast.UnaryOp):
+        operand = _compile(node.operand, names, columns)
+        if isinstance(node.op, ast.Not):
+            def negate(get: Lookup) -> Any:
+                value = _as_bool(operand(get))
+                return ~value if isinstance(value, pd.Series) else not value
+            return negate
+        if isinstance(node.op, ast.USub):
+            return lambda get: -operand(get)
+    if isinstance(node, ast.BinOp) and type(node.op) in _BINOPS:
+        op = _BINOPS[type(node.op)]
+        left, right = _compile(node.left, names, columns), _compile(node.right, names, columns)
+        return lambda get: op(left(get), right(get))
+    if isinstance(node, ast.Compare):
+        first = _compile(node.left, names, columns)
+        steps: List[Tuple[Any, Node]] = [(type(o), _compile(c, names, columns)) for o, c in zip(node.ops, node.comparators)]
+        for o, _ in steps:
+            if o not in _CMPOPS and o not in (ast.In, ast.NotIn):
+                raise ValueError(f"Unsupported comparison: {o.__name__}")
+        def compare(get: Lookup) -> Any:
+            left = first(get)
+            out: Any = True
+            for o, right_fn in steps:
+                right = right_fn(get)
+                if o is ast.In:
+                    res = _isin(left, right)
+                elif o is ast.NotIn:
+                    res = ~_isin(left, right) if isinstance(left, pd.Series) else not _isin(left, right)
+                else:
+                    res = _CMPOPS[o](left, right)
+                out = res if out is True else operator.and_(_as_bool(out), _as_bool(res))
+                left = right
+            return out
+        return compare
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id in FUNCTIONS and not node.keywords and len(node.args) == 1:
+        fn = FUNCTIONS[node.func.id]
+        arg = _compile(node.args[0], names, columns)
+        return lambda get: fn(arg(get))
+    raise ValueError(f"Unsupported expression element: {ast.dump(node)}")
+
+@dataclass(frozen=True)
+class CompiledExpression:
+    text: str
+    columns: Tuple[str, ...]
+    _fn: Node
+
+    def passes(self, get: Lookup, index: pd.Index) -> np.ndarray:
+        """Boolean array of rows satisfying the expression (nulls fail)."""
+        out = self._fn(get)
+        if isinstance(out, pd.Series):
+            return out.fillna(False).to_numpy(dtype=bool)
+        return np.full(len(index), bool(out) if not pd.isna(out) else False)
+
+@lru_cache(maxsize=512)
+def compile_expression(text: str) -> CompiledExpression:
+    """Parse and compile an expression once; raises ValueError on bad syntax."""
+    names: Dict[str, str] = {}
+
+    def quote(m: re.Match) -> str:
+        key = f"__col{len(names)}"
+        names[key] = m.group(1)
+        return key
+
+    src = _BACKTICK.sub(quote, text)
+    m = _IF_THEN.match(src)
+    if m:
+        src = f"(not ({m.group('cond')})) or ({m.group('then')})"
+    try:
+        tree = ast.parse(src, mode="eval")
+    except SyntaxError as e:
+        raise ValueError(f"Invalid expression {text!r}: {e.msg}") from e
+    columns: List[str] = []
+    fn = _compile(tree, names, columns)
+    return CompiledExpression(text=text, columns=tuple(columns), _fn=fn)
@@ -0,0 +1,132 @@
+from __future__ import annotations
+import hashlib
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+from .report import ContractReport
+from .rules import ColumnCache, ROW_LOCAL_RULE_TYPES
+from .plan import ContractPlan, PlannedRule, compile_contract, evaluate_rule, failure_result, structural_result
+
+# Bump when the layout of the saved state changes.
+_STATE_FORMAT = 2
+
+def _fingerprint(rules: List[PlannedRule], df: pd.DataFrame, hash_cols: List[str]) -> str:
+    # column dtypes too: rules may behave differently on 1 and 1.0
+    dtypes = [(c, str(df[c].dtype)) for c in hash_cols]
+    payload = repr((_STATE_FORMAT, [p.rule for p in rules], dtypes))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+# inferred kinds whose non-null cells share one Python type (up to numpy scalar twins)
+_SINGLE_KIND = frozenset({"string", "bytes", "integer", "floating", "boolean"})
+
+def _type_hash(types: List[type]) -> np.ndarray:
+    return pd.util.hash_array(np.array([f"{t.__module__}.{t.__qualname__}" for t in types], dtype=object))
+
+def _value_type_hashes(s: pd.Series) -> np.ndarray:
+    """64-bit hash of each cell's Python type (object columns hold mixed types)."""
+    if pd.api.types.infer_dtype(s, skipna=True) in _SINGLE_KIND:
+        # one type: hash it once instead of mapping every cell
+        first = s.loc[s.first_valid_index()]
+        return np.full(len(s), _type_hash([type(first)])[0], dtype=np.uint64)
+    codes, types = pd.factorize(pd.Series(s.to_numpy(dtype=object)).map(type))
+    return _type_hash(list(types))[codes] if len(types) else np.zeros(len(s), dtype=np.uint64)
+
+def _row_hashes(df: pd.DataFrame, cols: List[str]) -> np.ndarray:
+    """64-bit content hash per row over `cols`, including each cell's null-ness and, in object columns, its type."""
+    sub = df[cols]
+    h = pd.util.hash_pandas_object(sub, index=False, categorize=False).to_numpy()
+    # object hashing stringifies mixed columns (1, 1.0 and "1" collide), so fold
+    # the null mask and the value types in explicitly
+    nulls = sub.isna().to_numpy()
+    weights = (np.arange(1, len(cols) + 1, dtype=np.uint64) * np.uint64(0x9E3779B97F4A7C15))
+    h = h ^ (nulls.astype(np.uint64) * weights).sum(axis=1, dtype=np.uint64)
+    for c, w in zip(cols, weights):
+        if sub[c].dtype == object:
+            h = h ^ (_value_type_hashes(sub[c]) * (w | np.uint64(1)))
+    return h
+
+def _load_state(path: Path, fingerprint: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    try:
+        with np.load(path, allow_pickle=False) as z:
+            if str(z["fingerprint"]) != fingerprint:
+                return None
+            return z["hashes"], z["failed"]
+    except (OSError, KeyError, ValueError):
+        return None
+
+def _save_state(path: Path, fingerprint: str, hashes: np.ndarray, failed: np.ndarray) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as fh:
+        np.savez(fh, fingerprint=np.array(fingerprint), hashes=hashes, failed=failed)
+    tmp.replace(path)
+
+def run_contract_incremental(
+    df: pd.DataFrame,
+    contract: Dict[str, Any] | ContractPlan,
+    *,
+    state_path: str | Path,
+    contract_name: str = "<in-memory>",
+    strict: bool = True,
+    sample_failures: int = 50,
+    references: Mapping[str, Any] | None = None,
+) -> ContractReport:
+    """Validate `df`, re-evaluating row-local rules only on new or changed rows.
+
+    `state_path` (an .npz file) stores, per distinct row-content hash over the
+    columns used by row-local rules (`ROW_LOCAL_RULE_TYPES`), the pass/fail
+    state of each of those rules. Rows whose hash is already known reuse the
+    stored state; global rules such as `unique` are always recomputed over the
+    whole frame. Any change to the contract's rules or to the dtypes of the
+    hashed columns discards the state, and in object columns a cell whose
+    value keeps its text but changes type (1 to "1") counts as changed. The
+    report is the same as `run_contract` would produce.
+    """
+    plan = contract if isinstance(contract, ContractPlan) else compile_contract(contract)
+    report = ContractReport(contract_name=contract_name, dataset=plan.dataset, version=plan.version)
+    state_path = Path(state_path)
+
+    local = [p for p in plan.rules if p.rule.type in ROW_LOCAL_RULE_TYPES and structural_result(df.columns, p) is None]
+    hash_cols = sorted({c for p in local for c in p.columns})
+    local_failed: Dict[int, np.ndarray] = {}
+
+    if local:
+        fingerprint = _fingerprint(local, df, hash_cols)
+        h = _row_hashes(df, hash_cols)
+        failed = np.zeros((len(df), len(local)), dtype=bool)
+        known = np.zeros(len(df), dtype=bool)
+
+        state = _load_state(state_path, fingerprint)
+        if state is not None and len(state[0]):
+            old_hashes, old_failed = state
+            pos = pd.Index(old_hashes).get_indexer(h)
+            known = pos >= 0
+            failed[known] = old_failed[pos[known]]
+
+        changed = np.flatnonzero(~known)
+        if len(changed):
+            subset = df.iloc[changed]
+            cols = ColumnCache(subset)
+            for j, planned in enumerate(local):
+                _, mask = evaluate_rule(cols, planned)
+                failed[changed, j] = mask.to_numpy(dtype=bool, na_value=False)
+
+        uniq, first = np.unique(h, return_index=True)
+        _save_state(state_path, fingerprint, uniq, failed[first])
+        local_failed = {id(p): failed[:, j] for j, p in enumerate(local)}
+
+    cols = ColumnCache(df, references)
+    for planned in plan.rules:
+        if id(planned) in local_failed:
+            result = failure_result(planned, local_failed[id(planned)], df, sample_failures)
+        else:
+            result, mask = evaluate_rule(cols, planned)
+            if result is None and mask is not None:
+                result = failure_result(planned, mask, df, sample_failures)
+        if result is not None:
+            report.results.append(result)
+
+    report.raise_if_strict(strict)
+    return report
@@ -0,0 +1,136 @@
+"""Static checks of contract files, without loading pandas.
+
+Catches what would otherwise only fail mid-run: unknown rule types, missing
+rule settings, bad regexes and expressions, duplicate rule ids and unknown
+column types. Kept free of pandas/numpy imports so the CLI can lint quickly.
+"""
+from __future__ import annotations
+import ast
+import re
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Mapping
+
+# Mirrors `rules.BUILTIN_RULE_TYPES` (importing it would load pandas).
+BUILTIN_RULE_TYPES = frozenset({
+    "not_null", "length_equals", "allowed_values", "regex", "max_length", "unique", "foreign_key", "expression",
+})
+# settings each rule type cannot run without
+_RULE_NEEDS: Dict[str, tuple] = {
+    "not_null": ("column",),
+    "length_equals": ("column", "equals"),
+    "allowed_values": ("column", "values"),
+    "regex": ("column", "pattern"),
+    "max_length": ("column", "max_length"),
+    "foreign_key": ("column", "reference"),
+    "expression": ("expression",),
+}
+SEVERITIES = frozenset({"error", "warning"})
+# input column types understood by `core.io.read_with_contract`
+COLUMN_TYPES = frozenset({"string", "integer", "date", "boolean"})
+
+@dataclass(frozen=True)
+class LintIssue:
+    level: str  # "error" or "warning"
+    where: str
+    message: str
+
+    def __str__(self) -> str:
+        return f"{self.level}: {self.where}: {self.message}"
+
+def _rule_types() -> frozenset:
+    # include kernels registered at runtime, if the rules module is loaded anyway
+    rules = sys.modules.get("ma_migration.contracts.rules")
+    return BUILTIN_RULE_TYPES | frozenset(getattr(rules, "RULE_DISPATCH", ()))
+
+def _lint_rules(contract: Mapping[str, Any], issues: List[LintIssue]) -> None:
+    known = _rule_types()
+    seen: set = set()
+    for i, r in enumerate(contract.get("rules", []) or []):
+        where = f"rules[{i}]"
+        if not isinstance(r, Mapping):
+            issues.append(LintIssue("error", where, "a rule must be a mapping"))
+            continue
+        rid = r.get("id")
+        if rid is None:
+            issues.append(LintIssue("error", where, "rule has no id"))
+        else:
+            where = f"rule {rid}"
+            if rid in seen:
+                issues.append(LintIssue("error", where, "duplicate rule id"))
+            seen.add(rid)
+        rtype = r.get("type")
+        if rtype not in known:
+            issues.append(LintIssue("error", where, f"unknown rule type {rtype!r} (known: {sorted(known)})"))
+            continue
+        if str(r.get("severity", "error")).lower() not in SEVERITIES:
+            issues.append(LintIssue("error", where, f"severity must be one of {sorted(SEVERITIES)}"))
+        for key in _RULE_NEEDS.get(rtype, ()):
+            if r.get(key) is None:
+                issues.append(LintIssue("error", where, f"{rtype} rule needs {key!r}"))
+        if rtype == "unique" and not (r.get("column") or r.get("columns")):
+            issues.append(LintIssue("error", where, "unique rule needs 'column' or 'columns'"))
+        if rtype == "regex" and r.get("pattern") is not None:
+            try:
+                re.compile(str(r["pattern"]))
+            except re.error as e:
+                issues.append(LintIssue("error", where, f"invalid pattern: {e}"))
+        if rtype == "expression" and r.get("expression") is not None:
+            try:
+                ast.parse(str(r["expression"]), mode="eval")
+            except SyntaxError as e:
+                issues.append(LintIssue("error", where, f"invalid expression: {e.msg}"))
+        for key in ("max_length", "equals"):
+            if rtype in ("max_length", "length_equals") and r.get(key) is not None and not isinstance(r[key], int):
+                issues.append(LintIssue("error", where, f"{key!r} must be an integer"))
+
+def _lint_columns(contract: Mapping[str, Any], issues: List[LintIssue]) -> None:
+    cols = contract.get("columns", {}) or {}
+    if not isinstance(cols, Mapping):
+        issues.append(LintIssue("error", "columns", "must be a mapping of column -> settings"))
+        return
+    for col, spec in cols.items():
+        where = f"column {col}"
+        if isinstance(spec, list):  # input contracts: a one-item list of properties
+            if len(spec) != 1 or not isinstance(spec[0], Mapping):
+                issues.append(LintIssue("error", where, "expected a one-item list of properties"))
+                continue
+            spec = spec[0]
+        if spec is None:
+            continue
+        if not isinstance(spec, Mapping):
+            issues.append(LintIssue("error", where, "settings must be a mapping"))
+            continue
+        if "severity" in spec and str(spec["severity"]).lower() not in SEVERITIES:
+            issues.append(LintIssue("error", where, f"severity must be one of {sorted(SEVERITIES)}"))
+        if "max_length" in spec and not isinstance(spec["max_length"], int):
+            issues.append(LintIssue("error", where, "max_length must be an integer"))
+        if "type" in spec and str(spec["type"]) not in COLUMN_TYPES:
+            issues.append(LintIssue("warning", where, f"unknown type {spec['type']!r}; it is read without conversion"))
+        for key in ("allowed_values", "valid_values"):
+            if spec.get(key) is not None and not isinstance(spec[key], list):
+                issues.append(LintIssue("error", where, f"{key} must be a list"))
+
+def lint_contract(contract: Mapping[str, Any]) -> List[LintIssue]:
+    """Structural problems of a parsed contract, errors first."""
+    issues: List[LintIssue] = []
+    if not isinstance(contract, Mapping):
+        return [LintIssue("error", "contract", "top level must be a mapping")]
+    if not (contract.get("dataset") or contract.get("domain")):
+        issues.append(LintIssue("warning", "contract", "names neither a dataset nor a domain"))
+    required = contract.get("required_columns", []) or []
+    if not isinstance(required, list):
+        issues.append(LintIssue("error", "required_columns", "must be a list"))
+    _lint_rules(contract, issues)
+    _lint_columns(contract, issues)
+    return sorted(issues, key=lambda i: i.level != "error")
+
+def lint_contract_file(path: str | Path) -> List[LintIssue]:
+    """`lint_contract` for a YAML/JSON file; unreadable files are one error."""
+    from .loader import load_contract
+    try:
+        contract = load_contract(path, disk_cache=False)
+    except Exception as e:
+        return [LintIssue("error", str(path), f"cannot load: {e}")]
+    return lint_contract(contract)
@@ -1,6 +1,29 @@
 from __future__ import annotations
+import copy
+import pickle
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from ma_migration.core.cache import bytes_digest, default_cache_dir, package_version, source_digest
+
+if TYPE_CHECKING:
+    from .plan import ContractPlan
+
+# Bump when the pickled layout of contracts/plans changes.
+_CACHE_FORMAT = 2
+
+# Pickled plans hold Rule/PlannedRule objects defined in this subpackage.
+_CONTRACTS_ROOT = Path(__file__).resolve().parent
+
+@dataclass
+class _Parsed:
+    contract: Dict[str, Any]
+    plan: Optional["ContractPlan"] = None
+
+# resolved path -> (mtime_ns, size, content key); content key -> parsed entry
+_STAT_INDEX: Dict[str, Tuple[int, int, str]] = {}
+_PARSED: Dict[str, _Parsed] = {}
 
 def _load_yaml(text: str) -> dict:
     try:
@@ -9,9 +32,7 @@ def _load_yaml(text: str) -> dict:
         raise ImportError("PyYAML is required to load YAML contracts. Add dependency 'pyyaml'.") from e
     return yaml.safe_load(text)
 
-def load_contract(path: str | Path) -> Dict[str, Any]:
-    path = Path(path)
-    text = path.read_text(encoding="utf-8")
+def _parse(path: Path, text: str) -> Dict[str, Any]:
     if path.suffix.lower() in {".yaml", ".yml"}:
         return _load_yaml(text)
     if path.suffix.lower() == ".json":
@@ -19,10 +40,105 @@ def load_contract(path: str | Path) -> Dict[str, Any]:
         return json.loads(text)
     raise ValueError(f"Unsupported contract format: {path.suffix}")
 
-def load_contracts_from_dir(dir_path: str | Path, *, extensions: tuple[str, ...] = (".yaml", ".yml", ".json")) -> List[Dict[str, Any]]:
+def _code_version() -> str:
+    return f"{_CACHE_FORMAT}+{package_version()}+{source_digest(_CONTRACTS_ROOT)}"
+
+def _disk_path(cache_dir: Path, key: str) -> Path:
+    # keyed on the code too, so entries pickled by other versions are never unpickled
+    name = bytes_digest(key.encode() + b"\0" + _code_version().encode())
+    return cache_dir / f"{name}.pkl"
+
+def _read_disk(cache_dir: Path, key: str) -> Optional[_Parsed]:
+    try:
+        with open(_disk_path(cache_dir, key), "rb") as fh:
+            payload = pickle.load(fh)
+    except Exception:
+        return None
+    if not isinstance(payload, dict) or payload.get("format") != _CACHE_FORMAT or payload.get("code") != _code_version():
+        return None
+    return _Parsed(contract=payload["contract"], plan=payload.get("plan"))
+
+def _write_disk(cache_dir: Path, key: str, entry: _Parsed) -> None:
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp = _disk_path(cache_dir, key).with_suffix(".tmp")
+        with open(tmp, "wb") as fh:
+            pickle.dump({"format": _CACHE_FORMAT, "code": _code_version(), "contract": entry.contract, "plan": entry.plan}, fh, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp.replace(_disk_path(cache_dir, key))
+    except OSError:
+        pass  # the disk cache is best effort
+
+def _cached_entry(path: Path, cache_dir: Path | None) -> Tuple[str, _Parsed]:
+    """Return (content key, entry), parsing the file only on a cache miss.
+
+    An unchanged (mtime, size) skips reading the file; otherwise the content
+    hash is looked up in memory, then on disk, before falling back to parsing.
+    """
+    st = path.stat()
+    resolved = str(path.resolve())
+    known = _STAT_INDEX.get(resolved)
+    if known is not None and known[:2] == (st.st_mtime_ns, st.st_size) and known[2] in _PARSED:
+        return known[2], _PARSED[known[2]]
+
+    raw = path.read_bytes()
+    key = bytes_digest(path.suffix.lower().encode() + b"\0" + raw)
+    _STAT_INDEX[resolved] = (st.st_mtime_ns, st.st_size, key)
+    entry = _PARSED.get(key)
+    if entry is None and cache_dir is not None:
+        entry = _read_disk(cache_dir, key)
+    if entry is None:
+        entry = _Parsed(contract=_parse(path, raw.decode("utf-8")))
+        if cache_dir is not None:
+            _write_disk(cache_dir, key, entry)
+    _PARSED[key] = entry
+    return key, entry
+
+def _resolve_cache_dir(cache_dir: str | Path | None, disk_cache: bool) -> Path | None:
+    if not disk_cache:
+        return None
+    return Path(cache_dir) if cache_dir is not None else default_cache_dir("contracts")
+
+def load_contract(path: str | Path, *, cache: bool = True, disk_cache: bool = True, cache_dir: str | Path | None = None) -> Dict[str, Any]:
+    """Load a YAML/JSON contract.
+
+    Parsed contracts are cached in-process (keyed by mtime/size, then content
+    hash) and on disk under `cache_dir` (default: `default_cache_dir("contracts")`),
+    keyed also on the package version and the `contracts` source, so a disk
+    entry written by other code is a miss. Unreadable entries are misses too.
+    A fresh copy is returned on every call, so callers may mutate it.
+    """
+    path = Path(path)
+    if not cache:
+        return _parse(path, path.read_text(encoding="utf-8"))
+    _, entry = _cached_entry(path, _resolve_cache_dir(cache_dir, disk_cache))
+    return copy.deepcopy(entry.contract)
+
+def load_contract_plan(path: str | Path, *, disk_cache: bool = True, cache_dir: str | Path | None = None) -> "ContractPlan":
+    """Load a contract and return its compiled `ContractPlan`, reusing cached plans."""
+    from .plan import compile_contract
+
+    path = Path(path)
+    resolved_dir = _resolve_cache_dir(cache_dir, disk_cache)
+    key, entry = _cached_entry(path, resolved_dir)
+    if entry.plan is None:
+        entry.plan = compile_contract(entry.contract)
+        if resolved_dir is not None:
+            _write_disk(resolved_dir, key, entry)
+    return entry.plan
+
+def load_contracts_from_dir(dir_path: str | Path, *, extensions: tuple[str, ...] = (".yaml", ".yml", ".json"), cache: bool = True, disk_cache: bool = True, cache_dir: str | Path | None = None) -> List[Dict[str, Any]]:
     d = Path(dir_path)
     contracts: List[Dict[str, Any]] = []
     for p in sorted(d.rglob("*")):
         if p.is_file() and p.suffix.lower() in extensions:
-            contracts.append(load_contract(p))
+            contracts.append(load_contract(p, cache=cache, disk_cache=disk_cache, cache_dir=cache_dir))
     return contracts
+
+def clear_contract_cache(*, disk: bool = False, cache_dir: str | Path | None = None) -> None:
+    """Drop the in-process contract cache, and optionally the on-disk one."""
+    _STAT_INDEX.clear()
+    _PARSED.clear()
+    if disk:
+        d = Path(cache_dir) if cache_dir is not None else default_cache_dir("contracts")
+        for p in d.glob("*.pkl"):
+            p.unlink(missing_ok=True)
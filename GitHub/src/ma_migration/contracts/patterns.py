@@ -0,0 +1,74 @@
+from __future__ import annotations
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Dict, Optional
+import numpy as np
+
+# Character classes with an exact str-method equivalent for whole strings.
+_CLASS_PREDICATES: Dict[str, Callable[[str], bool]] = {
+    "[0-9]": lambda s: s.isascii() and s.isdigit(),
+    r"\d": lambda s: s.isdecimal(),
+    "[A-Z]": lambda s: s.isascii() and s.isalpha() and s.isupper(),
+    "[a-z]": lambda s: s.isascii() and s.isalpha() and s.islower(),
+    "[A-Za-z]": lambda s: s.isascii() and s.isalpha(),
+    "[a-zA-Z]": lambda s: s.isascii() and s.isalpha(),
+    "[A-Z0-9]": lambda s: s.isascii() and s.isalnum() and s == s.upper(),
+    "[0-9A-Z]": lambda s: s.isascii() and s.isalnum() and s == s.upper(),
+    "[A-Za-z0-9]": lambda s: s.isascii() and s.isalnum(),
+    "[a-zA-Z0-9]": lambda s: s.isascii() and s.isalnum(),
+}
+
+_SIMPLE = re.compile(r"^\^?(?P<cls>\[[^\]]+\]|\\d)(?P<q>\{\d+\}|\{\d+,\d*\}|\+|\*)?\$$")
+
+@dataclass(frozen=True)
+class SimplePattern:
+    """An anchored single-class pattern such as `^[0-9]{4}$` or `^\\d{8,10}$`."""
+    predicate: Callable[[str], bool]
+    min_len: int
+    max_len: Optional[int]
+
+    def matches(self, s: str) -> bool:
+        # `$` also matches before one trailing newline, like re.match does
+        if s.endswith("\n"):
+            s = s[:-1]
+        n = len(s)
+        if n < self.min_len or (self.max_len is not None and n > self.max_len):
+            return False
+        return n == 0 or self.predicate(s)
+
+def _parse_simple(pattern: str) -> Optional[SimplePattern]:
+    m = _SIMPLE.match(pattern)
+    if m is None or m.group("cls") not in _CLASS_PREDICATES:
+        return None
+    q = m.group("q")
+    if q is None:
+        lo, hi = 1, 1
+    elif q == "+":
+        lo, hi = 1, None
+    elif q == "*":
+        lo, hi = 0, None
+    elif "," in q:
+        a, b = q[1:-1].split(",")
+        lo, hi = int(a), (int(b) if b else None)
+    else:
+        lo = hi = int(q[1:-1])
+    return SimplePattern(predicate=_CLASS_PREDICATES[m.group("cls")], min_len=lo, max_len=hi)
+
+@lru_cache(maxsize=256)
+def compile_pattern(pattern: str) -> Callable[[str], bool]:
+    """Return a per-value matcher with `re.match` semantics, compiled once per pattern.
+
+    Simple anchored classes use str-method kernels; everything else uses a
+    cached compiled regex.
+    """
+    simple = _parse_simple(pattern)
+    if simple is not None:
+        return simple.matches
+    rx = re.compile(pattern)
+    return lambda s: rx.match(s) is not None
+
+def match_values(pattern: str, values: np.ndarray) -> np.ndarray:
+    """Evaluate `pattern` on an array of distinct strings."""
+    fn = compile_pattern(pattern)
+    return np.fromiter((fn(v) for v in values), dtype=bool, count=len(values))
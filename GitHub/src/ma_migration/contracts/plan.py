@@ -0,0 +1,137 @@
+from __future__ import annotations
+from dataclasses import dataclass, fields
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+from .report import RuleResult, compact_positions
+from .expressions import compile_expression
+from .rules import Rule, RULE_DISPATCH, ColumnCache
+
+@dataclass(frozen=True)
+class PlannedRule:
+    rule: Rule
+    columns: Tuple[str, ...] = ()
+
+@dataclass(frozen=True)
+class ContractPlan:
+    """A parsed contract compiled into an ordered list of rules to evaluate."""
+    dataset: str
+    version: str | None
+    rules: Tuple[PlannedRule, ...]
+
+    @property
+    def columns(self) -> Tuple[str, ...]:
+        """All columns referenced by the plan, in first-use order."""
+        seen: Dict[str, None] = {}
+        for p in self.rules:
+            for c in p.columns:
+                seen.setdefault(c, None)
+        return tuple(seen)
+
+_RULE_KEYS = {f.name for f in fields(Rule)} - {"params"}
+
+def parse_rules(contract: Dict[str, Any]) -> List[Rule]:
+    rules: List[Rule] = []
+    for r in (contract.get("rules", []) or []):
+        extra = {k: v for k, v in r.items() if k not in _RULE_KEYS}
+        rules.append(Rule(
+            id=str(r.get("id")),
+            severity=str(r.get("severity", "error")).lower(),
+            type=str(r.get("type")),
+            column=r.get("column"),
+            columns=r.get("columns"),
+            values=r.get("values"),
+            equals=r.get("equals"),
+            pattern=r.get("pattern"),
+            max_length=r.get("max_length"),
+            reference=r.get("reference"),
+            reference_column=r.get("reference_column"),
+            expression=r.get("expression"),
+            params=extra or None,
+        ))
+
+    cols_block = contract.get("columns", {}) or {}
+    for col, spec in cols_block.items():
+        sev = str(spec.get("severity", "error")).lower()
+        if spec.get("required") is True:
+            rules.append(Rule(id=f"{col}__REQUIRED", severity=sev, type="not_null", column=col))
+        if spec.get("unique") is True:
+            rules.append(Rule(id=f"{col}__UNIQUE", severity=sev, type="unique", column=col))
+        if "max_length" in spec:
+            rules.append(Rule(id=f"{col}__MAX_LENGTH", severity=str(spec.get("severity", "warning")).lower(), type="max_length", column=col, max_length=int(spec["max_length"])))
+        if "allowed_values" in spec:
+            rules.append(Rule(id=f"{col}__ALLOWED", severity=sev, type="allowed_values", column=col, values=list(spec["allowed_values"])))
+
+    required_cols = contract.get("required_columns", []) or []
+    for col in required_cols:
+        rules.append(Rule(id=f"{col}__PRESENT", severity="error", type="column_present", column=str(col)))
+
+    return rules
+
+def _rule_columns(rule: Rule) -> Tuple[str, ...]:
+    if rule.type == "expression":
+        # parsed (and cached) here, so syntax errors surface at compile time
+        return compile_expression(rule.expression or "True").columns
+    if rule.columns:
+        return tuple(rule.columns)
+    if rule.column:
+        return (rule.column,)
+    return ()
+
+def compile_contract(contract: Dict[str, Any]) -> ContractPlan:
+    """Compile a parsed contract (dict) into a reusable `ContractPlan`."""
+    dataset = str(contract.get("dataset") or contract.get("domain") or "<unknown>")
+    version = str(contract.get("version")) if contract.get("version") is not None else None
+    planned = tuple(PlannedRule(rule=r, columns=_rule_columns(r)) for r in parse_rules(contract))
+    return ContractPlan(dataset=dataset, version=version, rules=planned)
+
+def structural_result(columns: pd.Index, planned: PlannedRule) -> Optional[RuleResult]:
+    """Result for a rule that cannot be evaluated (missing column, unknown type), else None."""
+    rule = planned.rule
+    if rule.type == "column_present":
+        if rule.column not in columns:
+            return RuleResult(rule_id=rule.id, severity=rule.severity, message=f"Missing required column: {rule.column}")
+        return None
+
+    # Ensure referenced columns exist
+    cols_needed = list(planned.columns)
+    if any(c not in columns for c in cols_needed):
+        return RuleResult(rule_id=rule.id, severity=rule.severity, message=f"Column(s) not found for rule: {cols_needed}")
+
+    if rule.type not in RULE_DISPATCH:
+        return RuleResult(rule_id=rule.id, severity="error", message=f"Unknown rule type: {rule.type}")
+    return None
+
+def evaluate_rule(cols: ColumnCache, planned: PlannedRule) -> Tuple[Optional[RuleResult], Optional[pd.Series]]:
+    """Evaluate one planned rule.
+
+    Returns `(result, None)` when the rule cannot be evaluated (missing column,
+    unknown type) and `(None, mask)` otherwise, where `mask` flags failing rows.
+    `column_present` rules that pass return `(None, None)`.
+    """
+    result = structural_result(cols.frame.columns, planned)
+    if result is not None or planned.rule.type == "column_present":
+        return result, None
+    return None, RULE_DISPATCH[planned.rule.type](cols, planned.rule)
+
+def failure_result(planned: PlannedRule, mask: pd.Series | np.ndarray, df: pd.DataFrame, sample_failures: int | None) -> Optional[RuleResult]:
+    """Build the `RuleResult` for a failing-row mask, or None when nothing failed."""
+    arr = mask.to_numpy(dtype=bool, na_value=False) if isinstance(mask, pd.Series) else np.asarray(mask, dtype=bool)
+    positions = np.flatnonzero(arr)
+    n_failed = len(positions)
+    if n_failed == 0:
+        return None
+    if sample_failures is not None:
+        positions = positions[:sample_failures]
+
+    rule = planned.rule
+    return RuleResult(
+        rule_id=rule.id,
+        severity=rule.severity,
+        message=f"Rule failed: {rule.type} on {rule.column or rule.columns or rule.expression} (failed_rows={n_failed})",
+        failed_positions=compact_positions(positions, len(df)),
+        failed_count=n_failed,
+        columns=list(planned.columns),
+        source=df,
+    )
@@ -0,0 +1,31 @@
+from __future__ import annotations
+import warnings
+from typing import TYPE_CHECKING, Callable, List
+
+if TYPE_CHECKING:
+    from .report import ContractReport, RuleProfile
+
+ProfileHook = Callable[["ContractReport", "RuleProfile"], None]
+
+_HOOKS: List[ProfileHook] = []
+
+def register_profile_hook(hook: ProfileHook) -> ProfileHook:
+    """Call `hook(report, profile)` for every rule evaluated with `profile=True`.
+
+    Use it to forward timings to an external metrics system. Returns the hook so
+    it can be used as a decorator.
+    """
+    if hook not in _HOOKS:
+        _HOOKS.append(hook)
+    return hook
+
+def unregister_profile_hook(hook: ProfileHook) -> None:
+    if hook in _HOOKS:
+        _HOOKS.remove(hook)
+
+def emit_profile(report: "ContractReport", profile: "RuleProfile") -> None:
+    for hook in list(_HOOKS):
+        try:
+            hook(report, profile)
+        except Exception as e:  # a broken metrics hook must not fail validation
+            warnings.warn(f"Profile hook {hook!r} failed: {e}", UserWarning)
@@ -0,0 +1,75 @@
+from __future__ import annotations
+import threading
+import weakref
+from typing import Any, Dict, Mapping, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+class KeyIndex:
+    """Hashed set of reference keys for `foreign_key` rules.
+
+    Wraps a unique `pd.Index`, whose hash table is built on first lookup and
+    then reused by every rule and contract that checks against it, so each
+    check is a semi-join rather than a merge.
+    """
+
+    def __init__(self, values: Any):
+        keys = pd.Series(values).dropna()
+        self._index = pd.Index(pd.unique(keys.to_numpy()))
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, column: str) -> "KeyIndex":
+        return cls(df[column])
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def contains(self, values: pd.Series) -> np.ndarray:
+        """Boolean array: value is present in the index (nulls count as present)."""
+        found = self._index.get_indexer(values) >= 0
+        return found | values.isna().to_numpy()
+
+# Process-wide named references, shared across rules and contracts.
+_REGISTRY: Dict[str, KeyIndex] = {}
+# Indexes built from frames passed per call, cached while the frame is alive.
+_FRAME_INDEXES: Dict[int, Tuple[weakref.ref, Dict[Optional[str], KeyIndex]]] = {}
+_LOCK = threading.Lock()
+
+def register_reference(name: str, data: KeyIndex | pd.Series | pd.DataFrame, *, column: str | None = None) -> KeyIndex:
+    """Build (once) and register the key set `foreign_key` rules refer to as `name`."""
+    index = key_index(data, column)
+    _REGISTRY[name] = index
+    return index
+
+def unregister_reference(name: str) -> None:
+    _REGISTRY.pop(name, None)
+
+def clear_references() -> None:
+    _REGISTRY.clear()
+    with _LOCK:
+        _FRAME_INDEXES.clear()
+
+def key_index(data: KeyIndex | pd.Series | pd.DataFrame, column: str | None = None) -> KeyIndex:
+    """Return a `KeyIndex` for `data`, reusing one already built for the same object/column."""
+    if isinstance(data, KeyIndex):
+        return data
+    if isinstance(data, pd.DataFrame) and column is None:
+        raise ValueError("A column is required to build a key index from a DataFrame")
+    with _LOCK:
+        entry = _FRAME_INDEXES.get(id(data))
+        if entry is None or entry[0]() is not data:
+            entry = (weakref.ref(data, lambda _, k=id(data): _FRAME_INDEXES.pop(k, None)), {})
+            _FRAME_INDEXES[id(data)] = entry
+        index = entry[1].get(column)
+        if index is None:
+            values = data[column] if isinstance(data, pd.DataFrame) else data
+            index = entry[1][column] = KeyIndex(values)
+    return index
+
+def resolve_reference(name: str, column: str | None, references: Mapping[str, Any] | None) -> KeyIndex:
+    """Look up `name` in the per-call `references`, then in the registry."""
+    if references is not None and name in references:
+        return key_index(references[name], column)
+    if name in _REGISTRY:
+        return _REGISTRY[name]
+    raise ValueError(f"Unknown reference dataset: {name!r} (pass references= or use register_reference)")
@@ -1,14 +1,69 @@
 from __future__ import annotations
-from dataclasses import dataclass, field
-from typing import Any, List, Optional
+import json
+from dataclasses import asdict, dataclass, field, replace
+from pathlib import Path
+from typing import Any, List, Optional, Sequence
+import numpy as np
 import pandas as pd
 
+def compact_positions(positions: np.ndarray, n_rows: int) -> np.ndarray:
+    """Store row positions as int32 when the frame is small enough."""
+    return positions.astype(np.int32 if n_rows < 2**31 else np.int64, copy=False)
+
+@dataclass
+class RuleProfile:
+    rule_id: str
+    rule_type: str
+    wall_seconds: float
+    rows_evaluated: int
+    failed_count: int
+    peak_memory_bytes: int | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
 @dataclass
 class RuleResult:
+    """Outcome of one failing rule.
+
+    Failing rows are kept as positions into the validated frame (`source`)
+    rather than as a copied sample; `failed_rows` materializes them lazily for
+    the columns the rule touches.
+    """
     rule_id: str
     severity: str  # "error" | "warning"
     message: str
-    failed_rows: Optional[pd.DataFrame] = None
+    failed_positions: Optional[np.ndarray] = None
+    failed_count: int = 0
+    columns: List[str] = field(default_factory=list)
+    source: Optional[pd.DataFrame] = field(default=None, repr=False, compare=False)
+    # True when `source` already holds exactly the failing rows (detached results)
+    source_aligned: bool = field(default=False, repr=False)
+    profile: Optional[RuleProfile] = None
+
+    @property
+    def failed_rows(self) -> Optional[pd.DataFrame]:
+        return self.materialize()
+
+    def materialize(self, columns: Sequence[str] | None = None, *, all_columns: bool = False) -> Optional[pd.DataFrame]:
+        """Build a DataFrame of the stored failing rows.
+
+        Defaults to the columns the rule touches; pass `columns` to choose others
+        or `all_columns=True` for every column of the source frame.
+        """
+        if self.source is None or self.failed_positions is None:
+            return None
+        rows = self.source if self.source_aligned else self.source.iloc[self.failed_positions]
+        if all_columns:
+            return rows.copy()
+        cols = list(columns) if columns is not None else [c for c in self.columns if c in rows.columns]
+        return rows[cols].copy() if cols else rows.copy()
+
+    def detach(self) -> "RuleResult":
+        """Return a copy that no longer references the validated frame."""
+        if self.source is None or self.source_aligned:
+            return replace(self)
+        return replace(self, source=self.materialize(), source_aligned=True)
 
 @dataclass
 class ContractReport:
@@ -16,6 +71,8 @@ class ContractReport:
     dataset: str
     version: str | None = None
     results: List[RuleResult] = field(default_factory=list)
+    # one entry per evaluated rule (passing ones included) when run with profile=True
+    profile: List[RuleProfile] = field(default_factory=list)
 
     def errors(self) -> List[RuleResult]:
         return [r for r in self.results if r.severity.lower() == "error"]
@@ -36,6 +93,31 @@ class ContractReport:
             "warnings": len(self.warnings()),
         }
 
+    def profile_summary(self, *, top: int = 10) -> dict[str, Any]:
+        """Aggregate rule timings: totals plus the `top` slowest rules."""
+        slowest = sorted(self.profile, key=lambda p: p.wall_seconds, reverse=True)[:top]
+        peaks = [p.peak_memory_bytes for p in self.profile if p.peak_memory_bytes is not None]
+        return {
+            "contract": self.contract_name,
+            "dataset": self.dataset,
+            "rules_profiled": len(self.profile),
+            "wall_seconds_total": sum(p.wall_seconds for p in self.profile),
+            "peak_memory_bytes_max": max(peaks) if peaks else None,
+            "slowest": [p.to_dict() for p in slowest],
+            "rules": [p.to_dict() for p in self.profile],
+        }
+
+    def profile_to_json(self, path: str | Path | None = None, *, indent: int = 2) -> str:
+        """Serialize `profile_summary()` to JSON, optionally writing it to `path`."""
+        text = json.dumps(self.profile_summary(top=len(self.profile)), indent=indent)
+        if path is not None:
+            Path(path).write_text(text, encoding="utf-8")
+        return text
+
+    def detach(self) -> "ContractReport":
+        """Return a copy whose results no longer reference the validated frame."""
+        return replace(self, results=[r.detach() for r in self.results])
+
     def raise_if_strict(self, strict: bool = True) -> None:
         if strict and not self.is_ok():
             msgs = [f"[{r.severity.upper()}] {r.rule_id}: {r.message}" for r in self.errors()]
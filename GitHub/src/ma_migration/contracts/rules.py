@@ -1,8 +1,16 @@
 from __future__ import annotations
+import functools
+import inspect
+import threading
 from dataclasses import dataclass
-from typing import Any, Callable, Dict
+from typing import Any, Callable, Dict, Mapping, Tuple
+import numpy as np
 import pandas as pd
 
+from .expressions import compile_expression
+from .patterns import match_values
+from .references import resolve_reference
+
 @dataclass(frozen=True)
 class Rule:
     id: str
@@ -14,30 +22,157 @@ class Rule:
     equals: Any | None = None
     pattern: str | None = None
     max_length: int | None = None
+    reference: str | None = None
+    reference_column: str | None = None
+    expression: str | None = None
+    # extra YAML keys, available to custom rule kernels
+    params: Dict[str, Any] | None = None
+
+class ColumnCache:
+    """Per-run view over a DataFrame that casts/normalizes each column at most once.
+
+    All rules of a compiled contract share one cache, so a column referenced by
+    `length_equals`, `allowed_values`, `regex` and `max_length` is cast to str a
+    single time and its string lengths are computed a single time. It also
+    carries the per-call `references` used by `foreign_key` rules.
+
+    Safe to share between threads (`run_contract(..., rule_workers=N)`): each
+    column is derived under its own lock, so concurrent rules on one column
+    wait for a single cast instead of racing to compute it.
+    """
+
+    def __init__(self, df: pd.DataFrame, references: Mapping[str, Any] | None = None):
+        self.frame = df
+        self.references = references
+        self._str: Dict[str, pd.Series] = {}
+        self._len: Dict[str, pd.Series] = {}
+        self._codes: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._locks: Dict[str, threading.RLock] = {}
+        self._locks_guard = threading.Lock()
+
+    def _lock(self, col: str) -> threading.RLock:
+        lock = self._locks.get(col)
+        if lock is None:
+            with self._locks_guard:
+                lock = self._locks.setdefault(col, threading.RLock())
+        return lock
+
+    def __getitem__(self, col: str) -> pd.Series:
+        return self.frame[col]
+
+    def as_str(self, col: str) -> pd.Series:
+        s = self._str.get(col)
+        if s is None:
+            with self._lock(col):
+                s = self._str.get(col)
+                if s is None:
+                    s = self._str[col] = self.frame[col].astype(str)
+        return s
+
+    def str_len(self, col: str) -> pd.Series:
+        s = self._len.get(col)
+        if s is None:
+            with self._lock(col):
+                s = self._len.get(col)
+                if s is None:
+                    s = self._len[col] = self.as_str(col).str.len()
+        return s
+
+    def str_factorized(self, col: str) -> Tuple[np.ndarray, np.ndarray]:
+        """(codes, uniques) of the str-cast column, for per-unique-value checks."""
+        f = self._codes.get(col)
+        if f is None:
+            with self._lock(col):
+                f = self._codes.get(col)
+                if f is None:
+                    codes, uniques = pd.factorize(self.as_str(col))
+                    f = self._codes[col] = (codes, np.asarray(uniques, dtype=object))
+        return f
 
-def _mask_not_null(df: pd.DataFrame, col: str) -> pd.Series:
-    return df[col].isna()
+def _mask_not_null(cols: ColumnCache, col: str) -> pd.Series:
+    return cols[col].isna()
 
-def _mask_length_not_equals(df: pd.DataFrame, col: str, expected: int) -> pd.Series:
-    return df[col].astype(str).str.len() != int(expected)
+def _mask_length_not_equals(cols: ColumnCache, col: str, expected: int) -> pd.Series:
+    return cols.str_len(col) != int(expected)
 
-def _mask_not_allowed(df: pd.DataFrame, col: str, allowed: list[Any]) -> pd.Series:
-    return ~df[col].astype(str).isin([str(v) for v in allowed])
+def _mask_not_allowed(cols: ColumnCache, col: str, allowed: list[Any]) -> pd.Series:
+    return ~cols.as_str(col).isin([str(v) for v in allowed])
 
-def _mask_regex_mismatch(df: pd.DataFrame, col: str, pattern: str) -> pd.Series:
-    return ~df[col].astype(str).str.match(pattern, na=False)
+def _mask_regex_mismatch(cols: ColumnCache, col: str, pattern: str) -> pd.Series:
+    # evaluated once per distinct value: O(unique) pattern calls instead of O(rows)
+    codes, uniques = cols.str_factorized(col)
+    ok = match_values(pattern, uniques)
+    return pd.Series(~ok[codes], index=cols.frame.index)
 
-def _mask_max_length_exceeded(df: pd.DataFrame, col: str, max_len: int) -> pd.Series:
-    return df[col].astype(str).str.len() > int(max_len)
+def _mask_max_length_exceeded(cols: ColumnCache, col: str, max_len: int) -> pd.Series:
+    return cols.str_len(col) > int(max_len)
 
-def _mask_duplicates(df: pd.DataFrame, cols: list[str]) -> pd.Series:
-    return df.duplicated(subset=cols, keep=False)
+def _mask_duplicates(cols: ColumnCache, subset: list[str]) -> pd.Series:
+    return cols.frame.duplicated(subset=subset, keep=False)
 
-RULE_DISPATCH: Dict[str, Callable[[pd.DataFrame, Rule], pd.Series]] = {
-    "not_null": lambda df, r: _mask_not_null(df, r.column or ""),
-    "length_equals": lambda df, r: _mask_length_not_equals(df, r.column or "", int(r.equals)),
-    "allowed_values": lambda df, r: _mask_not_allowed(df, r.column or "", r.values or []),
-    "regex": lambda df, r: _mask_regex_mismatch(df, r.column or "", r.pattern or ""),
-    "max_length": lambda df, r: _mask_max_length_exceeded(df, r.column or "", int(r.max_length)),
-    "unique": lambda df, r: _mask_duplicates(df, r.columns or ([r.column] if r.column else [])),
+def _mask_missing_reference(cols: ColumnCache, col: str, rule: Rule) -> pd.Series:
+    index = resolve_reference(rule.reference or "", rule.reference_column or col, cols.references)
+    return pd.Series(~index.contains(cols[col]), index=cols.frame.index)
+
+def _mask_expression_false(cols: ColumnCache, expression: str) -> pd.Series:
+    compiled = compile_expression(expression)
+    return pd.Series(~compiled.passes(cols.__getitem__, cols.frame.index), index=cols.frame.index)
+
+RULE_DISPATCH: Dict[str, Callable[[ColumnCache, Rule], pd.Series]] = {
+    "not_null": lambda c, r: _mask_not_null(c, r.column or ""),
+    "length_equals": lambda c, r: _mask_length_not_equals(c, r.column or "", int(r.equals)),
+    "allowed_values": lambda c, r: _mask_not_allowed(c, r.column or "", r.values or []),
+    "regex": lambda c, r: _mask_regex_mismatch(c, r.column or "", r.pattern or ""),
+    "max_length": lambda c, r: _mask_max_length_exceeded(c, r.column or "", int(r.max_length)),
+    "unique": lambda c, r: _mask_duplicates(c, r.columns or ([r.column] if r.column else [])),
+    "foreign_key": lambda c, r: _mask_missing_reference(c, r.column or "", r),
+    "expression": lambda c, r: _mask_expression_false(c, r.expression or "True"),
 }
+
+# Rule types whose outcome for a row depends only on that row's own values;
+# incremental validation reuses their per-row results for unchanged rows.
+ROW_LOCAL_RULE_TYPES: set[str] = {"not_null", "length_equals", "allowed_values", "regex", "max_length", "expression"}
+
+BUILTIN_RULE_TYPES = frozenset(RULE_DISPATCH)
+
+def _takes_frame(kernel: Callable[..., pd.Series]) -> bool:
+    """True for kernels written against the old `kernel(df, rule)` signature."""
+    try:
+        first = next(iter(inspect.signature(kernel).parameters.values()))
+    except (StopIteration, TypeError, ValueError):
+        return False
+    annotation = first.annotation
+    if annotation is pd.DataFrame or (isinstance(annotation, str) and annotation.endswith("DataFrame")):
+        return True
+    return annotation is inspect.Parameter.empty and first.name in {"df", "frame"}
+
+def register_rule_type(name: str, kernel: Callable[[ColumnCache, Rule], pd.Series], *, row_local: bool = False, replace: bool = False, takes_frame: bool | None = None) -> None:
+    """Add a vectorized rule kernel to `RULE_DISPATCH`.
+
+    `kernel(cols, rule)` returns a boolean Series flagging failing rows; it reads
+    columns through `cols` (a `ColumnCache`) and its own settings from
+    `rule.params`. Set `row_local=True` when a row's outcome depends only on
+    that row, so incremental validation may reuse it.
+
+    Kernels with the old `kernel(df, rule)` signature (first parameter named
+    `df`/`frame` or annotated `pd.DataFrame`) are wrapped to receive the
+    DataFrame; pass `takes_frame` to skip the detection. Registering a name
+    that already exists raises unless `replace=True`.
+    """
+    if name in RULE_DISPATCH and not replace:
+        kind = "built in" if name in BUILTIN_RULE_TYPES else "already registered"
+        raise ValueError(f"Rule type {name!r} is {kind}; pass replace=True to override it")
+    if _takes_frame(kernel) if takes_frame is None else takes_frame:
+        frame_kernel = kernel
+        kernel = functools.wraps(frame_kernel)(lambda cols, rule: frame_kernel(cols.frame, rule))
+    RULE_DISPATCH[name] = kernel
+    if row_local:
+        ROW_LOCAL_RULE_TYPES.add(name)
+    else:
+        ROW_LOCAL_RULE_TYPES.discard(name)
+
+def unregister_rule_type(name: str) -> None:
+    if name in BUILTIN_RULE_TYPES:
+        raise ValueError(f"Rule type {name!r} is built in and cannot be removed")
+    RULE_DISPATCH.pop(name, None)
+    ROW_LOCAL_RULE_TYPES.discard(name)
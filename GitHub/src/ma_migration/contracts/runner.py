@@ -1,91 +1,135 @@
 from __future__ import annotations
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
 import pandas as pd
 
-from .report import ContractReport, RuleResult
-from .rules import Rule, RULE_DISPATCH
-from .loader import load_contract
-
-def _parse_rules(contract: Dict[str, Any]) -> List[Rule]:
-    rules: List[Rule] = []
-    for r in (contract.get("rules", []) or []):
-        rules.append(Rule(
-            id=str(r.get("id")),
-            severity=str(r.get("severity", "error")).lower(),
-            type=str(r.get("type")),
-            column=r.get("column"),
-            columns=r.get("columns"),
-            values=r.get("values"),
-            equals=r.get("equals"),
-            pattern=r.get("pattern"),
-            max_length=r.get("max_length"),
-        ))
-
-    cols_block = contract.get("columns", {}) or {}
-    for col, spec in cols_block.items():
-        sev = str(spec.get("severity", "error")).lower()
-        if spec.get("required") is True:
-            rules.append(Rule(id=f"{col}__REQUIRED", severity=sev, type="not_null", column=col))
-        if spec.get("unique") is True:
-            rules.append(Rule(id=f"{col}__UNIQUE", severity=sev, type="unique", column=col))
-        if "max_length" in spec:
-            rules.append(Rule(id=f"{col}__MAX_LENGTH", severity=str(spec.get("severity", "warning")).lower(), type="max_length", column=col, max_length=int(spec["max_length"])))
-        if "allowed_values" in spec:
-            rules.append(Rule(id=f"{col}__ALLOWED", severity=sev, type="allowed_values", column=col, values=list(spec["allowed_values"])))
-
-    required_cols = contract.get("required_columns", []) or []
-    for col in required_cols:
-        rules.append(Rule(id=f"{col}__PRESENT", severity="error", type="column_present", column=str(col)))
-
-    return rules
-
-def run_contract(df: pd.DataFrame, contract: Dict[str, Any], *, contract_name: str = "<in-memory>", strict: bool = True, sample_failures: int = 50) -> ContractReport:
-    dataset = str(contract.get("dataset") or contract.get("domain") or "<unknown>")
-    report = ContractReport(contract_name=contract_name, dataset=dataset, version=str(contract.get("version")) if contract.get("version") is not None else None)
-
-    for rule in _parse_rules(contract):
-        if rule.type == "column_present":
-            if rule.column not in df.columns:
-                report.results.append(RuleResult(rule_id=rule.id, severity=rule.severity, message=f"Missing required column: {rule.column}", failed_rows=None))
-            continue
-
-        # Ensure referenced columns exist
-        cols_needed = []
-        if rule.columns:
-            cols_needed = list(rule.columns)
-        elif rule.column:
-            cols_needed = [rule.column]
-        if any(c not in df.columns for c in cols_needed):
-            report.results.append(RuleResult(rule_id=rule.id, severity=rule.severity, message=f"Column(s) not found for rule: {cols_needed}", failed_rows=None))
-            continue
-
-        fn = RULE_DISPATCH.get(rule.type)
-        if fn is None:
-            report.results.append(RuleResult(rule_id=rule.id, severity="error", message=f"Unknown rule type: {rule.type}", failed_rows=None))
-            continue
-
-        mask = fn(df, rule)
-        if int(mask.sum()) == 0:
-            continue
-
-        failed = df.loc[mask].copy()
-        if sample_failures is not None and len(failed) > sample_failures:
-            failed = failed.head(sample_failures)
-
-        report.results.append(RuleResult(
-            rule_id=rule.id,
-            severity=rule.severity,
-            message=f"Rule failed: {rule.type} on {rule.column or rule.columns} (failed_rows={int(mask.sum())})",
-            failed_rows=failed,
-        ))
+from ma_migration.core.profiling import measure
+from .report import ContractReport, RuleProfile, RuleResult
+from .rules import ColumnCache
+from .plan import ContractPlan, PlannedRule, compile_contract, evaluate_rule, failure_result, structural_result, parse_rules as _parse_rules
+from .loader import load_contract_plan
+from .profiling import emit_profile
+
+ContractSource = str | Path | Dict[str, Any] | ContractPlan
+
+def _evaluate(cols: ColumnCache, planned: PlannedRule, sample_failures: int | None) -> Optional[RuleResult]:
+    result, mask = evaluate_rule(cols, planned)
+    if result is None and mask is not None:
+        result = failure_result(planned, mask, cols.frame, sample_failures)
+    return result
+
+def _evaluate_profiled(cols: ColumnCache, planned: PlannedRule, sample_failures: int | None, trace_memory: bool) -> Tuple[Optional[RuleResult], RuleProfile]:
+    with measure(trace_memory=trace_memory) as m:
+        result = _evaluate(cols, planned, sample_failures)
+    evaluated = structural_result(cols.frame.columns, planned) is None and planned.rule.type != "column_present"
+    prof = RuleProfile(
+        rule_id=planned.rule.id,
+        rule_type=planned.rule.type,
+        wall_seconds=m.wall_seconds,
+        rows_evaluated=len(cols.frame) if evaluated else 0,
+        failed_count=result.failed_count if result is not None else 0,
+        peak_memory_bytes=m.peak_memory_bytes,
+    )
+    if result is not None:
+        result.profile = prof
+    return result, prof
+
+def run_contract(df: pd.DataFrame, contract: Dict[str, Any] | ContractPlan, *, contract_name: str = "<in-memory>", strict: bool = True, sample_failures: int = 50, rule_workers: int | None = None, state_path: str | Path | None = None, profile: bool = False, references: Mapping[str, Any] | None = None) -> ContractReport:
+    """Validate `df` against a contract dict or a pre-compiled `ContractPlan`.
+
+    Columns are cast at most once per run (see `ColumnCache`), and each rule's
+    failing-row count is computed once. Failing rows are recorded as positions
+    into `df` (the first `sample_failures` of them; `None` keeps all) and only
+    materialized on access to `RuleResult.failed_rows`. With `rule_workers > 1`
+    the rules are evaluated concurrently on a thread pool and share the cache,
+    which casts each column once under a per-column lock; results keep the
+    contract's order.
+
+    With `profile=True` every rule records wall time, rows evaluated, failing
+    count and (for sequential evaluation) its tracemalloc peak; the numbers are
+    attached to `RuleResult.profile`, collected in `ContractReport.profile` and
+    passed to hooks registered with `register_profile_hook`.
+
+    `references` maps the names used by `foreign_key` rules to DataFrames,
+    Series or `KeyIndex` objects; names registered with `register_reference`
+    are available without passing them.
+
+    With `state_path`, validation is incremental: see `run_contract_incremental`.
+    """
+    if state_path is not None:
+        from .incremental import run_contract_incremental
+        return run_contract_incremental(df, contract, state_path=state_path, contract_name=contract_name, strict=strict, sample_failures=sample_failures, references=references)
+
+    plan = contract if isinstance(contract, ContractPlan) else compile_contract(contract)
+    report = ContractReport(contract_name=contract_name, dataset=plan.dataset, version=plan.version)
+
+    cols = ColumnCache(df, references)
+    parallel = rule_workers is not None and rule_workers > 1 and len(plan.rules) > 1
+    if profile:
+        evaluate = lambda p: _evaluate_profiled(cols, p, sample_failures, not parallel)
+    else:
+        evaluate = lambda p: (_evaluate(cols, p, sample_failures), None)
+    if parallel:
+        with ThreadPoolExecutor(max_workers=rule_workers) as ex:
+            outcomes = list(ex.map(evaluate, plan.rules))
+    else:
+        outcomes = [evaluate(p) for p in plan.rules]
+
+    for result, prof in outcomes:
+        if result is not None:
+            report.results.append(result)
+        if prof is not None:
+            report.profile.append(prof)
+            emit_profile(report, prof)
 
     report.raise_if_strict(strict)
     return report
 
-def run_contracts(df: pd.DataFrame, contract_paths: List[str | Path], *, strict: bool = True) -> List[ContractReport]:
-    reports: List[ContractReport] = []
-    for p in contract_paths:
-        c = load_contract(p)
-        reports.append(run_contract(df, c, contract_name=str(p), strict=strict))
+def _run_job(df: pd.DataFrame, contract: ContractSource, sample_failures: int, rule_workers: int | None, detach: bool = False, profile: bool = False, references: Mapping[str, Any] | None = None) -> ContractReport:
+    if isinstance(contract, (str, Path)):
+        report = run_contract(df, load_contract_plan(contract), contract_name=str(contract), strict=False, sample_failures=sample_failures, rule_workers=rule_workers, profile=profile, references=references)
+    else:
+        report = run_contract(df, contract, strict=False, sample_failures=sample_failures, rule_workers=rule_workers, profile=profile, references=references)
+    # results sent back from a worker process must not drag the whole frame along
+    return report.detach() if detach else report
+
+def _raise_if_strict(reports: List[ContractReport], strict: bool) -> None:
+    if not strict:
+        return
+    msgs = [f"{rep.contract_name}: [{r.severity.upper()}] {r.rule_id}: {r.message}" for rep in reports for r in rep.errors()]
+    if msgs:
+        raise ValueError("\n".join(msgs))
+
+def run_contract_jobs(
+    jobs: Sequence[Tuple[pd.DataFrame, ContractSource]],
+    *,
+    strict: bool = True,
+    max_workers: int | None = 1,
+    use_processes: bool = False,
+    sample_failures: int = 50,
+    rule_workers: int | None = None,
+    profile: bool = False,
+    references: Mapping[str, Any] | None = None,
+) -> List[ContractReport]:
+    """Run (dataset, contract) pairs, optionally concurrently.
+
+    Contracts may be given as paths (loaded inside the worker), dicts or
+    compiled plans. Reports are returned in job order regardless of completion
+    order. Every job runs to completion before `strict` is applied, so the
+    raised error lists the failures of all contracts. Profile hooks only fire
+    for jobs run in this process (threads or sequential).
+    """
+    if (max_workers is not None and max_workers <= 1) or len(jobs) <= 1:
+        reports = [_run_job(df, c, sample_failures, rule_workers, False, profile, references) for df, c in jobs]
+    else:
+        pool: Executor = ProcessPoolExecutor(max_workers=max_workers) if use_processes else ThreadPoolExecutor(max_workers=max_workers)
+        with pool:
+            futures = [pool.submit(_run_job, df, c, sample_failures, rule_workers, use_processes, profile, references) for df, c in jobs]
+            reports = [f.result() for f in futures]
+    _raise_if_strict(reports, strict)
     return reports
+
+def run_contracts(df: pd.DataFrame, contract_paths: List[str | Path], *, strict: bool = True, max_workers: int | None = 1, use_processes: bool = False) -> List[ContractReport]:
+    """Run several contracts against one dataset; see `run_contract_jobs`."""
+    return run_contract_jobs([(df, p) for p in contract_paths], strict=strict, max_workers=max_workers, use_processes=use_processes)
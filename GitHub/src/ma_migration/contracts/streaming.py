@@ -0,0 +1,225 @@
+from __future__ import annotations
+import tempfile
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional
+import numpy as np
+import pandas as pd
+
+from .report import ContractReport, RuleResult, compact_positions
+from .rules import ColumnCache
+from .plan import ContractPlan, compile_contract, evaluate_rule
+
+def _key_hashes(df: pd.DataFrame, cols: List[str]) -> np.ndarray:
+    return pd.util.hash_pandas_object(df[cols], index=False).to_numpy()
+
+class _UniqueTracker:
+    """Cross-chunk duplicate counter for one `unique` rule.
+
+    Keys are reduced to 64-bit row hashes, kept in memory (8 bytes per row,
+    plus a sorted copy of the distinct hashes while the failure sample fills,
+    re-merged on every chunk). Once more than `spill_rows` rows have been added
+    the hashes move to hash-partitioned bucket files in `spill_to()` and are
+    counted one bucket at a time; from then on memory no longer grows with the
+    row count.
+    """
+
+    def __init__(self, spill_to: Callable[[], Path] | None = None, spill_rows: int | None = None, buckets: int = 64):
+        self._parts: List[np.ndarray] = []
+        self._rows = 0
+        # sorted unique hashes seen so far; only kept while the failure sample is filling
+        self._seen: Optional[np.ndarray] = np.empty(0, dtype=np.uint64)
+        self._spill_to = spill_to
+        self._spill_rows = spill_rows
+        self._spill_dir: Path | None = None
+        self._buckets = buckets
+
+    def _bucket_path(self, b: int) -> Path:
+        assert self._spill_dir is not None
+        return self._spill_dir / f"bucket_{b:04d}.u64"
+
+    def seen_before(self, h: np.ndarray) -> np.ndarray:
+        """Flags hashes already added by earlier chunks (until the tracker spills)."""
+        if self._seen is None or len(self._seen) == 0:
+            return np.zeros(len(h), dtype=bool)
+        pos = np.minimum(np.searchsorted(self._seen, h), len(self._seen) - 1)
+        return self._seen[pos] == h
+
+    def stop_sampling(self) -> None:
+        self._seen = None
+
+    def _spill(self) -> None:
+        assert self._spill_to is not None
+        self._spill_dir = self._spill_to()
+        self._spill_dir.mkdir(parents=True, exist_ok=True)
+        self._seen = None
+        parts, self._parts = self._parts, []
+        for h in parts:
+            self._write(h)
+
+    def _write(self, h: np.ndarray) -> None:
+        part = h % np.uint64(self._buckets)
+        for b in np.unique(part):
+            with open(self._bucket_path(int(b)), "ab") as fh:
+                h[part == b].tofile(fh)
+
+    def add(self, h: np.ndarray) -> None:
+        self._rows += len(h)
+        if self._spill_dir is None and self._spill_rows is not None and self._rows > self._spill_rows:
+            self._spill()
+        if self._spill_dir is not None:
+            self._write(h)
+            return
+        self._parts.append(h)
+        if self._seen is not None:
+            merged = np.concatenate([self._seen, np.unique(h)])
+            merged.sort(kind="stable")  # two sorted runs: near-linear merge
+            keep = np.ones(len(merged), dtype=bool)
+            keep[1:] = merged[1:] != merged[:-1]
+            self._seen = merged[keep]
+
+    def failing_count(self) -> int:
+        """Rows whose key occurs more than once (same as `duplicated(keep=False)`)."""
+        if self._spill_dir is None:
+            arrays: Iterable[np.ndarray] = [np.concatenate(self._parts)] if self._parts else []
+        else:
+            arrays = (np.fromfile(p, dtype=np.uint64) for p in sorted(self._spill_dir.glob("bucket_*.u64")))
+        total = 0
+        for a in arrays:
+            _, counts = np.unique(a, return_counts=True)
+            total += int(counts[counts > 1].sum())
+        return total
+
+def run_contract_chunks(
+    chunks: Iterable[pd.DataFrame],
+    contract: Dict[str, Any] | ContractPlan,
+    *,
+    contract_name: str = "<stream>",
+    strict: bool = True,
+    sample_failures: int = 50,
+    spill_dir: str | Path | None = None,
+    spill_rows: int | None = 5_000_000,
+    references: Mapping[str, Any] | None = None,
+) -> ContractReport:
+    """Validate an iterator of DataFrame chunks (e.g. `pd.read_csv(..., chunksize=...)`).
+
+    Produces one `ContractReport` with the same failing-row counts as
+    `run_contract` on the concatenated frame, while only one chunk is held in
+    memory at a time. Chunks must share the same columns and dtypes (pass
+    explicit `dtype=` when reading).
+
+    `unique` rules track keys across chunks as 8-byte row hashes, in memory
+    until a rule has seen more than `spill_rows` rows and then in a temporary
+    directory under `spill_dir` (the system temp dir by default), removed when
+    the run ends. `spill_rows=0` keeps them on disk from the first chunk;
+    `spill_rows=None` never spills, so memory grows with the row count.
+
+    Failed-row positions are global row numbers across all chunks; the sampled
+    rows (touched columns only) are copied out of each chunk as it passes. For
+    `unique` rules the sample holds the duplicates detected while streaming, so
+    the first occurrence of a key may be missing from it.
+    """
+    plan = contract if isinstance(contract, ContractPlan) else compile_contract(contract)
+    report = ContractReport(contract_name=contract_name, dataset=plan.dataset, version=plan.version)
+
+    structural: Dict[int, RuleResult] = {}
+    counts: Dict[int, int] = {}
+    samples: Dict[int, List[pd.DataFrame]] = {}
+    sample_positions: Dict[int, List[np.ndarray]] = {}
+    trackers: Dict[int, _UniqueTracker] = {}
+    tmp: tempfile.TemporaryDirectory | None = None
+
+    def _spill_to(i: int) -> Path:
+        nonlocal tmp
+        if tmp is None:
+            tmp = tempfile.TemporaryDirectory(dir=None if spill_dir is None else str(spill_dir))
+        return Path(tmp.name) / f"rule_{i}"
+
+    def _sampled(i: int) -> int:
+        return sum(len(s) for s in samples.get(i, []))
+
+    def _add_sample(i: int, chunk: pd.DataFrame, mask: np.ndarray, columns: List[str], offset: int) -> None:
+        positions = np.flatnonzero(mask)
+        if sample_failures is not None:
+            positions = positions[:max(sample_failures - _sampled(i), 0)]
+        if len(positions) == 0:
+            return
+        samples.setdefault(i, []).append(chunk[columns].iloc[positions].copy())
+        sample_positions.setdefault(i, []).append(positions + offset)
+
+    try:
+        first = True
+        offset = 0
+        for chunk in chunks:
+            cols = ColumnCache(chunk, references)
+            for i, planned in enumerate(plan.rules):
+                if i in structural:
+                    continue
+                if planned.rule.type == "unique":
+                    if any(c not in chunk.columns for c in planned.columns):
+                        if first:
+                            structural[i], _ = evaluate_rule(cols, planned)
+                        continue
+                    tracker = trackers.get(i)
+                    if tracker is None:
+                        tracker = trackers[i] = _UniqueTracker(partial(_spill_to, i), spill_rows)
+                    h = _key_hashes(chunk, list(planned.columns))
+                    if sample_failures is None or _sampled(i) < sample_failures:
+                        mask = pd.Series(h).duplicated(keep=False).to_numpy() | tracker.seen_before(h)
+                        _add_sample(i, chunk, mask, list(planned.columns), offset)
+                    else:
+                        tracker.stop_sampling()
+                    tracker.add(h)
+                    continue
+
+                result, mask = evaluate_rule(cols, planned)
+                if result is not None:
+                    if first:
+                        structural[i] = result
+                    continue
+                if mask is None:
+                    continue
+                mask_arr = mask.to_numpy(dtype=bool, na_value=False)
+                n_failed = int(mask_arr.sum())
+                if n_failed:
+                    counts[i] = counts.get(i, 0) + n_failed
+                    _add_sample(i, chunk, mask_arr, list(planned.columns), offset)
+            first = False
+            offset += len(chunk)
+
+        if first:
+            # no chunks at all: evaluate structure against an empty frame
+            cols = ColumnCache(pd.DataFrame())
+            for i, planned in enumerate(plan.rules):
+                result, _ = evaluate_rule(cols, planned)
+                if result is not None:
+                    structural[i] = result
+
+        for i, tracker in trackers.items():
+            counts[i] = tracker.failing_count()
+    finally:
+        if tmp is not None:
+            tmp.cleanup()
+
+    for i, planned in enumerate(plan.rules):
+        if i in structural:
+            report.results.append(structural[i])
+            continue
+        n_failed = counts.get(i, 0)
+        if n_failed == 0:
+            continue
+        rule = planned.rule
+        parts = samples.get(i, [])
+        report.results.append(RuleResult(
+            rule_id=rule.id,
+            severity=rule.severity,
+            message=f"Rule failed: {rule.type} on {rule.column or rule.columns or rule.expression} (failed_rows={n_failed})",
+            failed_positions=compact_positions(np.concatenate(sample_positions[i]), offset) if parts else None,
+            failed_count=n_failed,
+            columns=list(planned.columns),
+            source=pd.concat(parts) if parts else None,
+            source_aligned=True,
+        ))
+
+    report.raise_if_strict(strict)
+    return report
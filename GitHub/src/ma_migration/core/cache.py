@@ -0,0 +1,41 @@
+from __future__ import annotations
+import functools
+import hashlib
+import os
+from pathlib import Path
+
+CACHE_DIR_ENV = "MA_MIGRATION_CACHE_DIR"
+
+def default_cache_dir(*parts: str) -> Path:
+    """Root for on-disk caches: `$MA_MIGRATION_CACHE_DIR` or `~/.cache/ma_migration`."""
+    root = os.environ.get(CACHE_DIR_ENV)
+    base = Path(root) if root else Path.home() / ".cache" / "ma_migration"
+    return base.joinpath(*parts)
+
+def bytes_digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+def file_digest(path: str | Path, *, block_size: int = 1 << 20) -> str:
+    """SHA-256 of a file's content, read in blocks."""
+    h = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(block_size), b""):
+            h.update(block)
+    return h.hexdigest()
+
+def package_version() -> str:
+    """Installed `ma-migration` version, or "0" when running from a source tree."""
+    try:
+        from importlib.metadata import version
+        return version("ma-migration")
+    except Exception:
+        return "0"
+
+@functools.lru_cache(maxsize=None)
+def source_digest(root: Path) -> str:
+    """Digest of every Python source under `root` (relative path and content)."""
+    h = hashlib.sha256()
+    for path in sorted(root.rglob("*.py")):
+        h.update(path.relative_to(root).as_posix().encode())
+        h.update(file_digest(path).encode())
+    return h.hexdigest()[:16]
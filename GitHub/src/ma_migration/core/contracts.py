@@ -1,12 +1,88 @@
-from dataclasses import dataclass
-from typing import Dict, Any
+from __future__ import annotations
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Mapping
+
+class ColumnSpec(str):
+    """A declared input column: behaves as its source header name, and carries
+    the declaration (`type`, `required`, `allowed_values`, `valid_values`)."""
+
+    key: str
+    type: str
+    required: bool
+    allowed_values: List[Any] | None
+    valid_values: List[Any] | None
+
+    def __new__(cls, name: str, *, key: str | None = None, type: str = "string", required: bool = False,
+                allowed_values: List[Any] | None = None, valid_values: List[Any] | None = None) -> "ColumnSpec":
+        spec = super().__new__(cls, str(name).strip())
+        spec.key = key or str(spec)
+        spec.type = type
+        spec.required = required
+        spec.allowed_values = allowed_values
+        spec.valid_values = valid_values
+        return spec
+
+    @classmethod
+    def from_dict(cls, key: str, meta: Mapping[str, Any] | List[Mapping[str, Any]] | None) -> "ColumnSpec":
+        # YAML contracts write each column as a one-item list of its properties
+        if isinstance(meta, list):
+            meta = meta[0] if meta else {}
+        meta = meta or {}
+        return cls(meta.get("name", key), key=key, type=str(meta.get("type", "string")),
+                   required=bool(meta.get("required", False)),
+                   allowed_values=meta.get("allowed_values"), valid_values=meta.get("valid_values"))
+
+class ContractColumns(Mapping[str, ColumnSpec]):
+    """Declared columns by contract key; also readable as attributes (`columns.NIP_VAT_Number`)."""
+
+    def __init__(self, specs: Mapping[str, ColumnSpec] | None = None):
+        self._specs: Dict[str, ColumnSpec] = dict(specs or {})
+
+    def __getitem__(self, key: str) -> ColumnSpec:
+        return self._specs[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._specs)
+
+    def __len__(self) -> int:
+        return len(self._specs)
+
+    def __getattr__(self, key: str) -> ColumnSpec:
+        try:
+            return self.__dict__["_specs"][key]
+        except KeyError:
+            raise AttributeError(f"Contract declares no column {key!r}") from None
+
+    def names(self) -> List[str]:
+        """Source header names, in declaration order."""
+        return [str(s) for s in self._specs.values()]
 
 @dataclass(frozen=True)
 class DomainContract:
     """Contract for a data domain pipeline."""
-    domain: str | None = None
+    raw: Dict[str, Any] = field(default_factory=dict)
     path: str | None = None
-    sheet: str | None = None
-    columns: Dict[str, Any]
-    
-    
\ No newline at end of file
+    domain: str | None = None
+    filename: str | None = None
+    sheet: str | int | None = None
+    header: int | None = None
+    columns: ContractColumns = field(default_factory=ContractColumns)
+
+    def __post_init__(self):
+        raw = self.raw or {}
+        for name in ("domain", "filename", "sheet", "header"):
+            if getattr(self, name) is None and raw.get(name) is not None:
+                object.__setattr__(self, name, raw[name])
+        if not self.columns and raw.get("columns"):
+            specs = {k: ColumnSpec.from_dict(k, v) for k, v in raw["columns"].items()}
+            object.__setattr__(self, "columns", ContractColumns(specs))
+
+    @classmethod
+    def from_dict(cls, raw: Dict[str, Any], *, path: str | Path | None = None) -> "DomainContract":
+        return cls(raw=raw, path=str(path) if path is not None else None)
+
+    @classmethod
+    def from_file(cls, path: str | Path) -> "DomainContract":
+        from ma_migration.contracts.loader import load_contract
+        return cls.from_dict(load_contract(path), path=path)
@@ -1,8 +1,50 @@
 from __future__ import annotations
+from functools import lru_cache
+import numpy as np
+import pandas as pd
 from dateutil.parser import parse
 
-def format_date(x):
+# Formats tried (in order, on unique values) before falling back to dateutil.
+# The order reproduces dateutil's dayfirst=False resolution: month-first for
+# ambiguous dotted/slashed dates, day-first only when the first field > 12.
+KNOWN_DATE_FORMATS: tuple[str, ...] = (
+    "%Y-%m-%d",
+    "%Y-%m-%d %H:%M:%S",
+    "%m.%d.%Y",
+    "%d.%m.%Y",
+    "%m/%d/%Y",
+    "%d/%m/%Y",
+)
+
+@lru_cache(maxsize=65536)
+def _format_date_str(s: str) -> str:
     try:
-        return parse(str(x), dayfirst=False).strftime('%Y-%m-%d')
+        return parse(s, dayfirst=False).strftime('%Y-%m-%d')
     except (ValueError, OverflowError, TypeError):
-        return str(x)
+        return s
+
+def format_date(x):
+    """Format one value as YYYY-MM-DD; values dateutil cannot parse come back as str(x)."""
+    return _format_date_str(str(x))
+
+def format_dates(series: pd.Series, *, formats: tuple[str, ...] = KNOWN_DATE_FORMATS) -> pd.Series:
+    """Vectorized equivalent of `series.apply(format_date)`.
+
+    Works on the distinct string values only: each known format is tried with
+    `pd.to_datetime`, and whatever is left goes through dateutil via a bounded
+    cache shared across calls.
+    """
+    codes, uniques = pd.factorize(series.astype(str))
+    uniques = pd.Index(uniques)
+    out = np.empty(len(uniques), dtype=object)
+    todo = np.arange(len(uniques))
+    for fmt in formats:
+        if len(todo) == 0:
+            break
+        parsed = pd.to_datetime(uniques[todo], format=fmt, errors="coerce")
+        hit = ~parsed.isna()
+        out[todo[hit]] = parsed[hit].strftime("%Y-%m-%d")
+        todo = todo[~hit]
+    for i in todo:
+        out[i] = _format_date_str(uniques[i])
+    return pd.Series(out.take(codes), index=series.index, name=series.name, dtype=object)
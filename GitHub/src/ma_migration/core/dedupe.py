@@ -1,12 +1,125 @@
 from __future__ import annotations
+from typing import Dict, List, Sequence, Tuple
+import numpy as np
 import pandas as pd
 
+from .frames import owned_copy
+
+def _str_factorize(series: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+    """Codes and str uniques of `series.astype(str)`, converting only the uniques.
+
+    Nulls keep their own str forms ("None", "nan", "NaT", ...), so None and NaN stay apart.
+    """
+    codes, uniq = pd.factorize(series)
+    na = codes < 0
+    has_na = bool(na.any())
+    if not has_na and pd.api.types.infer_dtype(uniq, skipna=False) == "string":
+        return codes, np.asarray(uniq, dtype=object)
+    str_uniq = pd.Series(uniq, dtype=object).astype(str).to_numpy(dtype=object)
+    if has_na:
+        # factorize folds every null into the sentinel; split them again by str form
+        nulls = pd.Series(series.to_numpy(dtype=object)[na], dtype=object).astype(str)
+        null_codes, null_uniq = pd.factorize(nulls)
+        codes = codes.copy()
+        codes[na] = len(str_uniq) + null_codes
+        str_uniq = np.concatenate([str_uniq, np.asarray(null_uniq, dtype=object)])
+    # distinct values may share a str form (1 and "1"); merge them
+    merged, str_uniq = pd.factorize(str_uniq)
+    return merged[codes], np.asarray(str_uniq, dtype=object)
+
+def key_codes(keys: Sequence[pd.Series]) -> np.ndarray:
+    """Integer code per row for a (possibly composite) key, compared as strings."""
+    codes: np.ndarray | None = None
+    for s in keys:
+        c, uniq = _str_factorize(s)
+        if codes is None:
+            codes = c
+        else:
+            codes, _ = pd.factorize(codes.astype(np.int64) * (len(uniq) + 1) + c)
+    return codes if codes is not None else np.zeros(0, dtype=np.intp)
+
+def occurrence_numbers(codes: np.ndarray) -> np.ndarray:
+    """1-based occurrence number of each row within its key (cumcount + 1)."""
+    occ = np.ones(len(codes), dtype=np.int64)
+    counts = np.bincount(codes) if len(codes) else np.zeros(0, dtype=np.int64)
+    dup = np.flatnonzero(counts[codes] > 1)
+    if len(dup) == 0:
+        return occ
+    sub = codes[dup]
+    order = np.argsort(sub, kind="stable")
+    sorted_codes = sub[order]
+    starts = np.r_[0, np.flatnonzero(sorted_codes[1:] != sorted_codes[:-1]) + 1]
+    run_start = np.repeat(starts, np.diff(np.r_[starts, len(sorted_codes)]))
+    occ[dup[order]] = np.arange(len(sorted_codes)) - run_start + 1
+    return occ
+
+def _suffix_rows(bases: List[np.ndarray], existing: List[np.ndarray], codes: np.ndarray, occ: np.ndarray, sep: str) -> List[np.ndarray]:
+    """Append `sep + k` to rows with occurrence k > 1, avoiding `existing` values."""
+    outs = [b.copy() for b in bases]
+    rows = np.flatnonzero(occ > 1)
+    if len(rows) == 0:
+        return outs
+    k = occ[rows]
+    labels = np.array([f"{sep}{i}" for i in range(int(k.max()) + 1)], dtype=object)
+    suffix = labels[k]
+    cands = [b[rows] + suffix for b in bases]
+    # a candidate can only clash with an existing value (distinct (base, k) pairs
+    # never produce the same string), so groups with a clash are redone one by one
+    clash = np.zeros(len(rows), dtype=bool)
+    for e, c in zip(existing, cands):
+        if len(e) < len(c):
+            clash |= pd.Series(c).isin(e).to_numpy()
+            continue
+        # hash the fewer candidates and probe with the existing values
+        hit = e[pd.Series(e).isin(c).to_numpy()]
+        if len(hit):
+            clash |= pd.Series(c).isin(hit).to_numpy()
+    clashing_groups = np.unique(codes[rows[clash]])
+    redo = np.isin(codes[rows], clashing_groups)
+    for out, c in zip(outs, cands):
+        out[rows[~redo]] = c[~redo]
+    if redo.any():
+        taken = [set(o.tolist()) for o in outs]
+        next_k: Dict[int, int] = {}
+        for r in rows[redo]:
+            g = int(codes[r])
+            k = max(int(occ[r]), next_k.get(g, 0))
+            while any(f"{b[r]}{sep}{k}" in t for b, t in zip(bases, taken)):
+                k += 1
+            for out, b, t in zip(outs, bases, taken):
+                out[r] = f"{b[r]}{sep}{k}"
+                t.add(out[r])
+            next_k[g] = k + 1
+    return outs
+
+def suffix_duplicate_keys(df: pd.DataFrame, keys: Sequence[str], *, targets: Sequence[str] | None = None, sep: str = "_") -> pd.DataFrame:
+    """Make a composite key unique by suffixing repeated rows.
+
+    Rows are grouped by the columns in `keys`; the k-th occurrence (k > 1) of a
+    key gets `sep + k` appended to every column in `targets` (default: `keys`).
+    The first occurrence is left untouched, only duplicated rows are rewritten,
+    and a suffixed value never equals a value already in its target column.
+    Target columns come back as str, as in `append_sequential_suffix_for_duplicates`.
+    """
+    targets = list(keys if targets is None else targets)
+    codes = key_codes([df[k] for k in keys])
+    occ = occurrence_numbers(codes)
+    factorized = [_str_factorize(df[t]) for t in targets]
+    bases = [uniq[c] for c, uniq in factorized]
+    existing = [uniq for _, uniq in factorized]
+    out = owned_copy(df)
+    for t, values in zip(targets, _suffix_rows(bases, existing, codes, occ, sep)):
+        out[t] = pd.Series(values, index=df.index, name=t)
+    return out
+
 def append_sequential_suffix_for_duplicates(series: pd.Series, *, sep: str = "_") -> pd.Series:
     """
     Appends a sequential suffix to duplicate entries in a pandas Series.
+
+    The first occurrence keeps its value; later ones get `sep + 2`, `sep + 3`, ...
+    (bumped further if that value already exists in the series).
     """
-    s = series.astype(str)
-    counts = s.groupby(s).cumcount() + 1
-    out = (s + sep) + counts.astype(str)
-    out = out.str.replace(rf"{sep}1$", "", regex=True)
-    return out
\ No newline at end of file
+    codes, uniq = _str_factorize(series)
+    base = uniq[codes]
+    (values,) = _suffix_rows([base], [uniq], codes, occurrence_numbers(codes), sep)
+    return pd.Series(values, index=series.index, name=series.name)
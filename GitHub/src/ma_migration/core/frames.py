@@ -0,0 +1,32 @@
+from __future__ import annotations
+import pandas as pd
+
+_PANDAS_3 = int(pd.__version__.split(".")[0]) >= 3
+
+def copy_on_write_enabled() -> bool:
+    if _PANDAS_3:
+        return True
+    return bool(pd.get_option("mode.copy_on_write") is True)
+
+def enable_copy_on_write() -> None:
+    """Switch pandas copy-on-write on for the rest of the process (always on in pandas 3).
+
+    Transforms then take shallow copies via `owned_copy`, so a chain of steps
+    only allocates the columns it actually changes. In pandas 2.x the option is
+    process-wide, and frames built under it share buffers with their inputs:
+    they are protected from each other only while the mode stays on. So it is
+    switched on once, at an entry point before any worker threads start
+    (`run_from_dataframes`/`run_from_sources(copy_on_write=True)`, or
+    `run.copy_on_write` for `ma-migration run`), and never switched back off.
+    Library functions such as the domain prepares never call it.
+    """
+    if not copy_on_write_enabled():
+        pd.set_option("mode.copy_on_write", True)
+
+def owned_copy(df: pd.DataFrame) -> pd.DataFrame:
+    """A frame a transform may modify without affecting the caller's `df`.
+
+    Under copy-on-write this is a shallow copy (buffers are copied lazily, per
+    column, on first write); otherwise a full deep copy.
+    """
+    return df.copy(deep=not copy_on_write_enabled())
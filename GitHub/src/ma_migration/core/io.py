@@ -1,15 +1,412 @@
 from __future__ import annotations
+import multiprocessing
+import os
+import pickle
+import threading
+import warnings
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
-
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
 
 import glob
+import numpy as np
 import pandas as pd
 
-def read_excel(path: str | Path, *, sheet_name: str | int | None = 0, header: int | None = 0, skiprows: int | None = None) -> pd.DataFrame:
-    return pd.read_excel(path, sheet_name=sheet_name, header=header, skiprows=skiprows)
+from .cache import bytes_digest, default_cache_dir, file_digest
+
+if TYPE_CHECKING:
+    from .contracts import DomainContract
+
+INGEST_CACHE_ENV = "MA_MIGRATION_INGEST_CACHE"
+# Bump when the on-disk layout of cached frames changes.
+_INGEST_FORMAT = 1
+
+# resolved path -> (mtime_ns, size, sha256); saves re-hashing unchanged workbooks
+_DIGESTS: Dict[str, Tuple[int, int, str]] = {}
+
+def _content_digest(path: Path) -> str:
+    st = path.stat()
+    resolved = str(path.resolve())
+    known = _DIGESTS.get(resolved)
+    if known is not None and known[:2] == (st.st_mtime_ns, st.st_size):
+        return known[2]
+    digest = file_digest(path)
+    _DIGESTS[resolved] = (st.st_mtime_ns, st.st_size, digest)
+    return digest
+
+def _parquet_safe(df: pd.DataFrame) -> bool:
+    """Whether a Parquet round trip reproduces `df` (else the entry is pickled)."""
+    if not all(isinstance(c, str) for c in df.columns) or not df.columns.is_unique:
+        return False
+    if not isinstance(df.index, pd.RangeIndex):
+        return False
+    for c in df.columns:
+        s = df[c]
+        if s.dtype == object and pd.api.types.infer_dtype(s, skipna=True) not in ("string", "empty"):
+            return False
+    return True
+
+class IngestCache:
+    """Columnar on-disk copies of parsed Excel sheets.
+
+    Entries are keyed by the workbook's content hash plus the read arguments
+    (sheet, header, skiprows), so an edited file is simply a miss. Frames are
+    stored as Parquet, or pickled when Parquet cannot reproduce them exactly
+    (mixed-type object columns, non-string headers). Once the cache grows past
+    `max_bytes` the least recently used entries are evicted.
+    """
+
+    def __init__(self, root: str | Path | None = None, *, max_bytes: int = 2 << 30):
+        self.root = Path(root) if root is not None else default_cache_dir("ingest")
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # picklable for process-pool workers; the lock is per process
+        return {"root": self.root, "max_bytes": self.max_bytes}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__(state["root"], max_bytes=state["max_bytes"])
+
+    def key(self, path: str | Path, **read_args: Any) -> str:
+        args = "|".join(f"{k}={read_args[k]!r}" for k in sorted(read_args))
+        digest = _content_digest(Path(path))
+        # frames parsed by another pandas may differ
+        return f"{digest}-{bytes_digest(f'{_INGEST_FORMAT}|{pd.__version__}|{args}'.encode())[:16]}"
+
+    def _entries(self, pattern: str = "*") -> list[Path]:
+        if not self.root.exists():
+            return []
+        return [p for p in self.root.glob(pattern) if p.suffix in (".parquet", ".pkl")]
+
+    def get(self, key: str) -> Optional[pd.DataFrame]:
+        for p in self._entries(f"{key}.*"):
+            try:
+                if p.suffix == ".parquet":
+                    df = pd.read_parquet(p)
+                    # read_excel yields NaN, not None, for empty text cells
+                    for c in df.columns[df.dtypes == object]:
+                        df[c] = df[c].fillna(np.nan)
+                else:
+                    with open(p, "rb") as fh:
+                        df = pickle.load(fh)
+                os.utime(p)  # mark as recently used
+                return df
+            except Exception:
+                p.unlink(missing_ok=True)
+        return None
+
+    def put(self, key: str, df: pd.DataFrame) -> None:
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            tmp = self.root / f"{key}.{os.getpid()}.{threading.get_ident()}.tmp"
+            suffix = ".pkl"
+            if _parquet_safe(df):
+                try:
+                    df.to_parquet(tmp, index=False)
+                    suffix = ".parquet"
+                except Exception:
+                    pass
+            if suffix == ".pkl":
+                with open(tmp, "wb") as fh:
+                    pickle.dump(df, fh, protocol=pickle.HIGHEST_PROTOCOL)
+            tmp.replace(self.root / f"{key}{suffix}")
+        except OSError:
+            return  # the ingest cache is best effort
+        self.evict()
+
+    def size_bytes(self) -> int:
+        return sum(p.stat().st_size for p in self._entries())
+
+    def evict(self, max_bytes: int | None = None) -> int:
+        """Delete least recently used entries until the cache fits; returns how many."""
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        with self._lock:
+            entries = [(p.stat().st_mtime_ns, p.stat().st_size, p) for p in self._entries()]
+            total = sum(size for _, size, _ in entries)
+            removed = 0
+            for _, size, p in sorted(entries, key=lambda e: e[0]):
+                if total <= limit:
+                    break
+                p.unlink(missing_ok=True)
+                total -= size
+                removed += 1
+            return removed
+
+    def invalidate(self, path: str | Path) -> int:
+        """Drop every cached sheet of the workbook currently at `path`."""
+        removed = 0
+        for p in self._entries(f"{_content_digest(Path(path))}-*"):
+            p.unlink(missing_ok=True)
+            removed += 1
+        return removed
+
+    def clear(self) -> int:
+        removed = 0
+        for p in self._entries():
+            p.unlink(missing_ok=True)
+            removed += 1
+        return removed
+
+_DEFAULT_INGEST_CACHE: Optional[IngestCache] = None
+_INGEST_CACHE_OFF = False
+_DEFAULT_LOCK = threading.Lock()
+
+def enable_ingest_cache(root: str | Path | None = None, *, max_bytes: int = 2 << 30) -> IngestCache:
+    """Set the default cache `read_excel` uses (on by default, under `default_cache_dir("ingest")`)."""
+    global _DEFAULT_INGEST_CACHE, _INGEST_CACHE_OFF
+    with _DEFAULT_LOCK:
+        _DEFAULT_INGEST_CACHE = IngestCache(root, max_bytes=max_bytes)
+        _INGEST_CACHE_OFF = False
+        return _DEFAULT_INGEST_CACHE
+
+def disable_ingest_cache() -> None:
+    """Turn the default cache off for this process (also: `MA_MIGRATION_INGEST_CACHE=0`)."""
+    global _DEFAULT_INGEST_CACHE, _INGEST_CACHE_OFF
+    with _DEFAULT_LOCK:
+        _DEFAULT_INGEST_CACHE = None
+        _INGEST_CACHE_OFF = True
+
+def _default_ingest_cache() -> Optional[IngestCache]:
+    global _DEFAULT_INGEST_CACHE
+    with _DEFAULT_LOCK:
+        if _DEFAULT_INGEST_CACHE is None and not _INGEST_CACHE_OFF:
+            if os.environ.get(INGEST_CACHE_ENV, "").lower() in ("0", "false", "no", "off"):
+                return None
+            _DEFAULT_INGEST_CACHE = IngestCache()
+        return _DEFAULT_INGEST_CACHE
+
+def _resolve_cache(cache: IngestCache | bool | None) -> Optional[IngestCache]:
+    if isinstance(cache, IngestCache):
+        return cache
+    if cache is None:
+        return _default_ingest_cache()
+    return (_DEFAULT_INGEST_CACHE or IngestCache()) if cache else None
+
+def read_excel(path: str | Path, *, sheet_name: str | int | None = 0, header: int | None = 0, skiprows: int | None = None,
+               usecols: Sequence[str] | None = None, dtype: Mapping[str, Any] | None = None,
+               cache: IngestCache | bool | None = None) -> pd.DataFrame:
+    """`pd.read_excel`, optionally served from an `IngestCache`.
+
+    `usecols` lists the header names to keep (names the sheet lacks are
+    ignored); other columns are dropped while the sheet is read. `cache=None`
+    uses the default cache, which is on unless `disable_ingest_cache()` or
+    `MA_MIGRATION_INGEST_CACHE=0` turned it off; entries are keyed on the
+    workbook's content, so an edited file is re-parsed. `True` forces a cache
+    and `False` always parses the workbook. Reading every sheet
+    (`sheet_name=None`) is never cached.
+    """
+    kwargs: Dict[str, Any] = dict(sheet_name=sheet_name, header=header, skiprows=skiprows)
+    key_args = dict(kwargs)
+    if usecols is not None:
+        wanted = frozenset(usecols)
+        kwargs["usecols"] = lambda c: c in wanted
+        key_args["usecols"] = sorted(wanted)
+    if dtype is not None:
+        kwargs["dtype"] = dict(dtype)
+        key_args["dtype"] = sorted((k, getattr(v, "__name__", str(v))) for k, v in dtype.items())
+    ingest = _resolve_cache(cache) if sheet_name is not None else None
+    if ingest is None:
+        return pd.read_excel(path, **kwargs)
+    key = ingest.key(path, **key_args)
+    df = ingest.get(key)
+    if df is None:
+        df = pd.read_excel(path, **kwargs)
+        ingest.put(key, df)
+    return df
 
 def read_csv(path: str | Path, *, sep: str = "\t", encoding: str = "UTF-8", lineterminator: str = "\n") -> pd.DataFrame:
     return pd.read_csv(path, sep=sep, encoding=encoding, lineterminator=lineterminator)
 
+# a row filter: chunk -> boolean mask, or {column: allowed values} (rows must match every column)
+RowFilter = Union[Callable[[pd.DataFrame], Any], Mapping[str, Any]]
+
+def _filter_columns(where: RowFilter | None) -> List[str]:
+    return list(where) if isinstance(where, Mapping) else []
+
+def _compile_filter(where: RowFilter | None) -> Optional[Callable[[pd.DataFrame], Any]]:
+    if where is None or callable(where):
+        return where
+    # hash the allowed values once, not once per chunk
+    allowed = {col: pd.Index(values).unique() for col, values in where.items()}
+
+    def mask(chunk: pd.DataFrame) -> np.ndarray:
+        keep = np.ones(len(chunk), dtype=bool)
+        for col, values in allowed.items():
+            keep &= chunk[col].isin(values).to_numpy()
+        return keep
+    return mask
+
+def iter_csv(path: str | Path, *, sep: str = "\t", encoding: str = "UTF-8", lineterminator: str = "\n",
+             chunksize: int = 250_000, dtype: Any = None, usecols: Sequence[str] | None = None,
+             where: RowFilter | None = None) -> Iterator[pd.DataFrame]:
+    """Stream a delimited file as DataFrame chunks of at most `chunksize` rows.
+
+    Only `usecols` are parsed (plus any column `where` needs, dropped again
+    after filtering) and each chunk is filtered before it is yielded, so callers
+    never hold more than one unfiltered chunk. Pass `dtype` explicitly: without
+    it pandas infers types per chunk and they can differ between chunks.
+    Chunks keep their global row labels.
+    """
+    extra = [c for c in _filter_columns(where) if usecols is not None and c not in usecols]
+    cols = None if usecols is None else list(usecols) + extra
+    keep = _compile_filter(where)
+    reader = pd.read_csv(path, sep=sep, encoding=encoding, lineterminator=lineterminator,
+                         chunksize=chunksize, dtype=dtype, usecols=cols)
+    with reader:
+        for chunk in reader:
+            if keep is not None:
+                chunk = chunk[np.asarray(keep(chunk), dtype=bool)]
+            if extra:
+                chunk = chunk.drop(columns=extra)
+            if cols is not None:
+                chunk = chunk[list(usecols)]  # usecols does not order columns
+            yield chunk
+
+def read_csv_filtered(path: str | Path, *, sep: str = "\t", encoding: str = "UTF-8", lineterminator: str = "\n",
+                      chunksize: int = 250_000, dtype: Any = None, usecols: Sequence[str] | None = None,
+                      where: RowFilter | None = None) -> pd.DataFrame:
+    """`read_csv` through `iter_csv`: peak memory is one chunk plus the kept rows."""
+    chunks = list(iter_csv(path, sep=sep, encoding=encoding, lineterminator=lineterminator,
+                           chunksize=chunksize, dtype=dtype, usecols=usecols, where=where))
+    if not chunks:
+        return pd.read_csv(path, sep=sep, encoding=encoding, lineterminator=lineterminator, dtype=dtype, usecols=usecols, nrows=0)
+    return pd.concat(chunks, ignore_index=True)
+
+_TRUE = {"true", "yes", "y", "1", "x"}
+_FALSE = {"false", "no", "n", "0", ""}
+
+def _coerce_lossless(s: pd.Series, kind: str) -> pd.Series:
+    """Convert to the declared type only when no present value would be lost."""
+    present = s.notna()
+    if kind == "integer":
+        out = pd.to_numeric(s, errors="coerce")
+        if out[present].notna().all() and (out[present] % 1 == 0).all():
+            return out.astype("Int64")
+    elif kind == "date":
+        if pd.api.types.is_datetime64_any_dtype(s):
+            return s
+        out = pd.to_datetime(s, errors="coerce")
+        if out[present].notna().all():
+            return out
+    elif kind == "boolean":
+        text = s[present].astype(str).str.strip().str.lower()
+        if text.isin(_TRUE | _FALSE).all():
+            out = pd.Series(pd.NA, index=s.index, dtype="boolean")
+            out[present] = text.isin(_TRUE).to_numpy()
+            return out
+    return s
+
+def read_with_contract(contract: "DomainContract", path: str | Path | None = None, *, strict: bool = True,
+                       cache: IngestCache | bool | None = None) -> pd.DataFrame:
+    """Read an input file with only the columns its contract declares.
+
+    Undeclared columns are dropped by the reader, `string` columns are read as
+    text (IDs keep their digits, blanks stay NaN), and `integer`, `date` and
+    `boolean` columns are converted when every value allows it (otherwise they
+    are left for validation to report). `path` defaults to the contract's
+    `filename`; sheet and header come from the contract. Missing required
+    columns raise in strict mode and warn otherwise.
+    """
+    path = Path(path if path is not None else contract.filename or "")
+    if not path.name:
+        raise ValueError("read_with_contract needs a path or a contract with a filename")
+    specs = list(contract.columns.values())
+    names = [str(s) for s in specs]
+    text = {str(s): str for s in specs if s.type == "string"}
+    if path.suffix.lower() in (".csv", ".txt", ".tsv"):
+        wanted = set(names)
+        df = pd.read_csv(path, sep="\t" if path.suffix.lower() != ".csv" else ",", usecols=lambda c: c in wanted,
+                         dtype=text, header=contract.header or 0)
+    else:
+        df = read_excel(path, sheet_name=contract.sheet if contract.sheet is not None else 0,
+                        header=contract.header or 0, usecols=names, dtype=text, cache=cache)
+
+    missing = [str(s) for s in specs if s.required and str(s) not in df.columns]
+    if missing:
+        msg = f"{path.name}: missing required columns: {missing}"
+        if strict:
+            raise ValueError(msg)
+        warnings.warn(msg, UserWarning)
+    for spec in specs:
+        if str(spec) in df.columns and spec.type in ("integer", "date", "boolean"):
+            df[str(spec)] = _coerce_lossless(df[str(spec)], spec.type)
+    return df[[n for n in names if n in df.columns]]
+
 def list_many_excels(pattern: str) -> list[Path]:
     return [Path(p) for p in glob.glob(pattern)]
+
+@dataclass
+class ExcelBatch:
+    """Result of `read_many_excels`: rows of every readable file, in file order."""
+    data: pd.DataFrame
+    files: List[Path] = field(default_factory=list)
+    # file -> "ErrorType: message" for files that could not be read
+    errors: Dict[str, str] = field(default_factory=dict)
+
+def _read_one(path: Path, sheet_name: str | int, header: int | None, take_columns: int | None,
+              names: Sequence[str] | None, source_col: str | None,
+              cache: IngestCache | None) -> Tuple[Optional[pd.DataFrame], Optional[str]]:
+    try:
+        df = read_excel(path, sheet_name=sheet_name, header=header, cache=cache if cache is not None else False)
+        if take_columns is not None:
+            df = df.iloc[:, :take_columns]
+        if names is not None:
+            df.columns = list(names)[:take_columns]  # a short sheet fails here, as a per-file error
+        if source_col is not None:
+            df[source_col] = path.name
+        return df, None
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+
+def _read_one_args(args: tuple) -> Tuple[Optional[pd.DataFrame], Optional[str]]:
+    return _read_one(*args)
+
+def _worker_context() -> multiprocessing.context.BaseContext:
+    """A start method that never forks this (possibly multi-threaded) process.
+
+    read_many_excels runs inside stage-graph worker threads; forking there can
+    copy a lock another thread holds (logging, pandas/openpyxl internals) into
+    the child, which then deadlocks. forkserver forks from a clean
+    single-threaded server (with this module preloaded); spawn is the fallback.
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        ctx = multiprocessing.get_context("forkserver")
+        ctx.set_forkserver_preload([__name__])  # only applies before the server first starts
+        return ctx
+    return multiprocessing.get_context("spawn")
+
+def read_many_excels(files: Sequence[str | os.PathLike], *, sheet_name: str | int = 0, header: int | None = 0,
+                     take_columns: int | None = None, names: Sequence[str] | None = None,
+                     source_col: str | None = "Source_File", max_workers: int | None = None,
+                     use_processes: bool = True, cache: IngestCache | bool | None = None) -> ExcelBatch:
+    """Read many workbooks in parallel and stack them.
+
+    Each worker reads one file, keeps its first `take_columns` columns, renames
+    them to `names` and tags the rows with the file name in `source_col`. A
+    file that fails to read is recorded in `ExcelBatch.errors` and skipped, and
+    the output order follows `files` whatever the number of workers.
+    `max_workers=1` reads in-process; openpyxl parsing holds the GIL, so
+    processes (the default) are what make a large batch faster. Worker
+    processes are started with forkserver or spawn, never fork, so this is
+    safe to call from threads; as with any spawned pool, a calling script
+    needs the usual `if __name__ == "__main__":` guard.
+    """
+    paths = [Path(f) for f in files]
+    ingest = _resolve_cache(cache)
+    jobs = [(p, sheet_name, header, take_columns, names, source_col, ingest) for p in paths]
+    workers = min(max_workers or os.cpu_count() or 1, max(len(paths), 1))
+    if workers <= 1:
+        results = [_read_one_args(j) for j in jobs]
+    else:
+        pool = (ProcessPoolExecutor(max_workers=workers, mp_context=_worker_context()) if use_processes
+                else ThreadPoolExecutor(max_workers=workers))
+        with pool as ex:
+            results = list(ex.map(_read_one_args, jobs))
+
+    frames = [df for df, _ in results if df is not None]
+    errors = {str(p): err for p, (_, err) in zip(paths, results) if err is not None}
+    # a single concat sizes every output column once, instead of growing a frame per file
+    data = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    return ExcelBatch(data=data, files=paths, errors=errors)
@@ -0,0 +1,150 @@
+from __future__ import annotations
+import functools
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, TypeVar
+
+import pandas as pd
+
+@dataclass
+class Measurement:
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    # tracemalloc peak above the level at entry; None when memory was not traced
+    peak_memory_bytes: int | None = None
+
+@contextmanager
+def measure(*, trace_memory: bool = False) -> Iterator[Measurement]:
+    """Time a block (wall and process CPU) and optionally its peak Python memory.
+
+    Memory tracing starts `tracemalloc` if needed and stops it again on exit.
+    Peaks are process-wide and each traced block resets them, so traced blocks
+    must not run concurrently in several threads (`PipelineProfiler` runs
+    stages one at a time while tracing).
+    """
+    m = Measurement()
+    started_tracing = False
+    base = 0
+    if trace_memory:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            started_tracing = True
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+    wall0, cpu0 = time.perf_counter(), time.process_time()
+    try:
+        yield m
+    finally:
+        m.wall_seconds = time.perf_counter() - wall0
+        m.cpu_seconds = time.process_time() - cpu0
+        if trace_memory:
+            m.peak_memory_bytes = max(tracemalloc.get_traced_memory()[1] - base, 0)
+            if started_tracing:
+                tracemalloc.stop()
+
+def peak_rss_bytes() -> int | None:
+    """The process's resident-set high-water mark so far, where the OS reports it."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return int(peak if sys.platform == "darwin" else peak * 1024)
+
+def frame_shape(obj: Any) -> Tuple[int | None, int | None]:
+    """(rows, columns) of a DataFrame or Series, (None, None) for anything else."""
+    if isinstance(obj, pd.DataFrame):
+        return len(obj), len(obj.columns)
+    if isinstance(obj, pd.Series):
+        return len(obj), 1
+    return None, None
+
+@dataclass
+class StepProfile:
+    """One profiled transform inside a pipeline stage."""
+    name: str
+    wall_seconds: float
+    cpu_seconds: float
+    rows_in: int | None = None
+    rows_out: int | None = None
+    columns_in: int | None = None
+    columns_out: int | None = None
+
+    @property
+    def row_delta(self) -> int | None:
+        if self.rows_in is None or self.rows_out is None:
+            return None
+        return self.rows_out - self.rows_in
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {**asdict(self), "row_delta": self.row_delta}
+
+# steps of the stage running in this context; None when nothing is recording
+_STEPS: ContextVar[Optional[List[StepProfile]]] = ContextVar("ma_migration_profile_steps", default=None)
+
+@contextmanager
+def record_steps() -> Iterator[List[StepProfile]]:
+    """Collect the `step`/`profiled_step` profiles run in this context (thread)."""
+    steps: List[StepProfile] = []
+    token = _STEPS.set(steps)
+    try:
+        yield steps
+    finally:
+        _STEPS.reset(token)
+
+class _Step:
+    def __init__(self, frame: Any = None):
+        self.rows_in, self.columns_in = frame_shape(frame)
+        self.rows_out: int | None = None
+        self.columns_out: int | None = None
+
+    def output(self, frame: Any) -> Any:
+        """Record the frame the step produced; returns it unchanged."""
+        self.rows_out, self.columns_out = frame_shape(frame)
+        return frame
+
+class _NoStep:
+    def output(self, frame: Any) -> Any:
+        return frame
+
+_NO_STEP = _NoStep()
+
+@contextmanager
+def step(name: str, frame: Any = None) -> Iterator[_Step | _NoStep]:
+    """Profile an inline block (e.g. a merge) as a named step.
+
+    `frame` is the block's input; call `.output(result)` on the yielded handle
+    to record what it produced. Outside `record_steps` this does nothing.
+    """
+    steps = _STEPS.get()
+    if steps is None:
+        yield _NO_STEP
+        return
+    handle = _Step(frame)
+    with measure() as m:
+        yield handle
+    steps.append(StepProfile(name, m.wall_seconds, m.cpu_seconds, handle.rows_in, handle.rows_out,
+                             handle.columns_in, handle.columns_out))
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+def profiled_step(fn: F) -> F:
+    """Record a transform as a step: its first frame argument in, its result out.
+
+    Costs one context-variable lookup per call when nothing is recording.
+    """
+    name = fn.__qualname__
+
+    @functools.wraps(fn)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        if _STEPS.get() is None:
+            return fn(*args, **kwargs)
+        frame = next((a for a in args if isinstance(a, (pd.DataFrame, pd.Series))), None)
+        with step(name, frame) as s:
+            return s.output(fn(*args, **kwargs))
+
+    return wrapper  # type: ignore[return-value]
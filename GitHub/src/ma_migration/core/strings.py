@@ -1,23 +1,78 @@
 from __future__ import annotations
 import pandas as pd
 import numpy as np
+from pandas.api.types import is_integer_dtype, is_numeric_dtype
+
+from .frames import owned_copy
 
 def strip_object_columns(df: pd.DataFrame) -> pd.DataFrame:
     """Strips leading and trailing whitespace from all object-type columns in a DataFrame."""
-    df = df.copy()
+    df = owned_copy(df)
     obj_cols = df.select_dtypes(include="object").columns
     if len(obj_cols) > 0:
-        df[obj_cols] = df[obj_cols].apply(lambda s: s.astype(str).str.strip())
+        # blanks stay missing (not the strings "nan"/"None"), so later isna/fillna steps still see them
+        df[obj_cols] = df[obj_cols].apply(lambda s: s.astype(str).str.strip().where(s.notna()))
     return df
 
 def zfill_str(series: pd.Series, width: int) -> pd.Series:
     """Zero-fill a string series to a specified width."""
     return series.astype(str).str.zfill(width)
 
+def int_like_to_str(series: pd.Series) -> pd.Series:
+    """Vectorized `'{:.0f}'.format` for ID columns: 1234567890.0 -> "1234567890".
+
+    Numbers are rounded half-to-even like the format spec, strings are only
+    stripped, and missing values stay NaN instead of becoming "nan".
+    """
+    out = np.full(len(series), np.nan, dtype=object)
+    if is_integer_dtype(series.dtype):
+        valid = series.notna().to_numpy()
+        out[valid] = series[valid].astype(str).to_numpy()
+        return pd.Series(out, index=series.index, name=series.name)
+
+    if is_numeric_dtype(series.dtype):
+        num = series.to_numpy(dtype="float64", na_value=np.nan)
+        is_str = np.zeros(len(series), dtype=bool)
+    else:
+        values = series.to_numpy(dtype=object)
+        is_str = np.fromiter((isinstance(v, str) for v in values), dtype=bool, count=len(values))
+        num = pd.to_numeric(series.where(~is_str), errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+        if is_str.any():
+            out[is_str] = series[is_str].str.strip().to_numpy()
+
+    finite = np.isfinite(num)
+    rounded = np.round(num[finite])
+    fits = np.abs(rounded) < 2**63
+    formatted = np.empty(len(rounded), dtype=object)
+    formatted[fits] = rounded[fits].astype(np.int64).astype(str)
+    formatted[fits & (rounded == 0) & np.signbit(rounded)] = "-0"
+    formatted[~fits] = ['{:.0f}'.format(v) for v in rounded[~fits]]
+    out[finite] = formatted
+    other = ~finite & ~np.isnan(num) & ~is_str  # +/-inf
+    out[other] = ['{:.0f}'.format(v) for v in num[other]]
+    return pd.Series(out, index=series.index, name=series.name)
+
+def to_numeric_keep_nan(series: pd.Series) -> pd.Series:
+    """Whole-array numeric coercion; unparseable values become NaN."""
+    return pd.to_numeric(series, errors="coerce")
+
+def zfill_strip(series: pd.Series, width: int) -> pd.Series:
+    """Strip and zero-fill IDs to `width`, formatting integer-like numbers first; NaN stays NaN."""
+    s = int_like_to_str(series) if is_numeric_dtype(series.dtype) else series
+    # work on distinct values: cluster/coupling codes have very few of them
+    codes, uniques = pd.factorize(s)
+    filled = pd.Index(uniques).astype(str).str.strip().str.zfill(width).to_numpy(dtype=object)
+    out = filled.take(codes)
+    out[codes < 0] = np.nan
+    return pd.Series(out, index=series.index, name=series.name)
+
 def numeric_id_to_str(series: pd.Series) -> pd.Series:
-    """Converts a numeric ID series to string, removing any decimal places and stripping whitespace."""
-    return series.map('{:.0f}'.format).astype(str).str.strip()
+    """Converts a numeric ID series to string, removing any decimal places and stripping whitespace.
+
+    Missing values stay NaN (see `int_like_to_str`).
+    """
+    return int_like_to_str(series)
 
 def coerce_numeric_keep_nan(series: pd.Series) -> pd.Series:
     """Converts a series to numeric, coercing errors to NaN."""
-    return series.apply(lambda x: pd.to_numeric(x, errors='coerce'))
+    return to_numeric_keep_nan(series)
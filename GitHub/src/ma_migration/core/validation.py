@@ -33,3 +33,13 @@ def warn_if_any_null(df: pd.DataFrame, col: str, *, label: str, strict: bool = F
             raise ValueError(msg)
         warnings.simplefilter("always", UserWarning)
         warnings.warn(msg, UserWarning)
+
+def warn_invalid_values(df: pd.DataFrame, mask: pd.Series, *, header: str, cols: list[str] | None = None, max_rows: int = 20):
+    """Warns with a preview of the rows selected by `mask` (notebook-style data check)."""
+    n = int(mask.sum())
+    if not n:
+        return
+    cols = [c for c in (cols or list(df.columns)) if c in df.columns]
+    preview = df.loc[mask, cols].drop_duplicates().head(max_rows).to_string(index=False)
+    warnings.simplefilter("always", UserWarning)
+    warnings.warn(f"{header}: {n} rows\n{preview}", UserWarning)
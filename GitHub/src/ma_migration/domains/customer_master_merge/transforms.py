@@ -1,25 +1,30 @@
 from __future__ import annotations
 import pandas as pd
 
-from ma_migration.core.dedupe import append_sequential_suffix_for_duplicates
-from ma_migration.core.dates import format_date
+from ma_migration.core.dedupe import append_sequential_suffix_for_duplicates, suffix_duplicate_keys
+from ma_migration.core.dates import format_dates
+from ma_migration.core.frames import owned_copy
+from ma_migration.core.profiling import profiled_step
+from ma_migration.core.strings import numeric_id_to_str
 
+@profiled_step
 def merge_customers_finishing(customers_expanded: pd.DataFrame, fm_uq: pd.DataFrame, *, vat_col: str) -> pd.DataFrame:
     return customers_expanded.merge(fm_uq, how="left", left_on=vat_col, right_on=vat_col)
 
 def fill_defaults(cus_fm: pd.DataFrame, defaults: dict[str, object]) -> pd.DataFrame:
-    df = cus_fm.copy()
+    df = owned_copy(cus_fm)
     for col, val in defaults.items():
         if col in df.columns:
-            df[col].fillna(val, inplace=True)
+            df[col] = df[col].fillna(val)
     return df
 
 def replace_values(df: pd.DataFrame, col: str, replacements: dict) -> pd.DataFrame:
-    df = df.copy()
+    df = owned_copy(df)
     if col in df.columns:
-        df[col].replace(replacements, inplace=True)
+        df[col] = df[col].replace(replacements)
     return df
 
+@profiled_step
 def build_delivery_and_codes(df: pd.DataFrame, *,
                              dept_name_col: str,
                              finishing_method_col: str,
@@ -27,21 +32,25 @@ def build_delivery_and_codes(df: pd.DataFrame, *,
                              contract_number_col: str = "Contract number",
                              mato_delivery_code_col: str = "MATO_DeliveryCustomerCode") -> pd.DataFrame:
     """Notebook intent: append finishing method + contract type ID to delivery-related identifiers."""
-    out = df.copy()
+    out = owned_copy(df)
     suffix = out[finishing_method_col].astype(str) + "_" + out[contract_type_id_col].astype(str)
     if dept_name_col in out.columns:
         out[dept_name_col] = out[dept_name_col].astype(str) + "_" + suffix
     if mato_delivery_code_col in out.columns:
         out[mato_delivery_code_col] = out[mato_delivery_code_col].astype(str) + "_" + suffix
     if contract_number_col in out.columns:
-        out[contract_number_col] = out[contract_number_col].map('{:.0f}'.format).astype(str).str.strip() + "_" + suffix
+        out[contract_number_col] = numeric_id_to_str(out[contract_number_col]) + "_" + suffix
     return out
 
-def ensure_unique_identifiers(df: pd.DataFrame, cols: list[str]) -> pd.DataFrame:
-    out = df.copy()
-    for c in cols:
-        if c in out.columns:
-            out[c] = append_sequential_suffix_for_duplicates(out[c])
+@profiled_step
+def ensure_unique_identifiers(df: pd.DataFrame, cols: list[str], *, composite: bool = False) -> pd.DataFrame:
+    """Suffix repeated identifiers; with `composite=True` `cols` form one key and are suffixed together."""
+    present = [c for c in cols if c in df.columns]
+    if composite:
+        return suffix_duplicate_keys(df, present) if present else owned_copy(df)
+    out = owned_copy(df)
+    for c in present:
+        out[c] = append_sequential_suffix_for_duplicates(out[c])
     return out
 
 def rename_address_columns(df: pd.DataFrame) -> pd.DataFrame:
@@ -59,15 +68,15 @@ def rename_address_columns(df: pd.DataFrame) -> pd.DataFrame:
 def convert_contract_dates(df: pd.DataFrame,
                            signed_col: str="Contract signed (e.g. 31.8.2022)",
                            term_col: str="Contract term (e.g. until 31.8.2025)") -> pd.DataFrame:
-    out = df.copy()
+    out = owned_copy(df)
     if signed_col in out.columns:
-        out[signed_col] = out[signed_col].apply(format_date)
+        out[signed_col] = format_dates(out[signed_col])
     if term_col in out.columns:
-        out[term_col] = out[term_col].apply(format_date)
+        out[term_col] = format_dates(out[term_col])
     return out
 
 def add_uat_prefix(df: pd.DataFrame, cols: list[str], prefix: str="UAT_") -> pd.DataFrame:
-    out = df.copy()
+    out = owned_copy(df)
     for c in cols:
         if c in out.columns:
             out[c] = prefix + out[c].astype(str)
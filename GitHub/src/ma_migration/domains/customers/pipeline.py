@@ -5,6 +5,7 @@ import pandas as pd
 from . import transforms as T
 from . import validations as V
 from ma_migration.core.contracts import DomainContract
+from ma_migration.core.frames import owned_copy
 from ma_migration.core.result import DomainResult
 
 
@@ -34,16 +35,19 @@ def prepare_customers(
 
     cus = T.assign_default_coupling(cus, invoicing_coupling_code_col, default="0001")
 
-    try:
-        V.validate_invoicing_coupling(cus, invoicing_coupling_code_col, list(invoicing_coupling_code_col))
-    except ValueError as e:
-        res.errors.append(str(e))
+    # codes are checked against the contract's declaration, when it has one
+    coupling_valid_values = invoicing_coupling_code_col.valid_values or invoicing_coupling_code_col.allowed_values
+    if coupling_valid_values is not None:
+        try:
+            V.validate_invoicing_coupling(cus, invoicing_coupling_code_col, [str(v) for v in coupling_valid_values])
+        except ValueError as e:
+            res.errors.append(str(e))
         
     vat_col = contract.columns.NIP_VAT_Number
     cus = T.drop_customers_without_vat(cus, vat_col)
 
-    cus_inv = cus.copy()
-    cus_lw = cus.copy()
+    cus_inv = owned_copy(cus)
+    cus_lw = owned_copy(cus)
 
 
     #-------------- UPDATE WHEN WORKING WITH DEPT ID ----------------
@@ -0,0 +1,124 @@
+from __future__ import annotations
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Sequence, Tuple
+import pandas as pd
+
+from .xlsx import _tmp_path, write_xlsx_streaming
+
+def _write_xlsx(df: pd.DataFrame, path: Path) -> None:
+    # streamed; outputs over Excel's row limit continue on extra sheets
+    write_xlsx_streaming(df, path, split="sheet")
+
+def _write_csv(df: pd.DataFrame, path: Path) -> None:
+    df.to_csv(path, index=False, encoding="utf-8")
+
+def _write_parquet(df: pd.DataFrame, path: Path) -> None:
+    df.to_parquet(path, index=False)
+
+WRITERS: Dict[str, Callable[[pd.DataFrame, Path], None]] = {
+    "xlsx": _write_xlsx,
+    "csv": _write_csv,
+    "parquet": _write_parquet,
+}
+
+@dataclass
+class WrittenFile:
+    name: str
+    format: str
+    path: str
+    rows: int
+    bytes: int
+    seconds: float
+
+@dataclass
+class WriteManifest:
+    out_dir: str
+    files: List[WrittenFile] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"out_dir": self.out_dir, "files": [asdict(f) for f in self.files]}
+
+    def to_json(self, path: str | Path | None = None) -> str:
+        text = json.dumps(self.to_dict(), indent=2)
+        if path is not None:
+            _atomic_write_text(Path(path), text)
+        return text
+
+    def paths(self, fmt: str) -> Dict[str, str]:
+        """Output name -> file path for one format (e.g. the Parquet copies)."""
+        return {f.name: f.path for f in self.files if f.format == fmt}
+
+def _atomic_write_text(path: Path, text: str) -> None:
+    tmp = _tmp_path(path)
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
+
+def write_file(df: pd.DataFrame, path: str | Path, fmt: str) -> WrittenFile:
+    """Write one frame atomically: to a temp file next to `path`, then rename."""
+    if fmt not in WRITERS:
+        raise ValueError(f"Unsupported output format: {fmt!r} (known: {sorted(WRITERS)})")
+    path = Path(path)
+    tmp = _tmp_path(path)
+    t0 = time.perf_counter()
+    try:
+        WRITERS[fmt](df, tmp)
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+    return WrittenFile(name=path.stem, format=fmt, path=str(path), rows=len(df),
+                       bytes=path.stat().st_size, seconds=time.perf_counter() - t0)
+
+def _write_job(job: Tuple[str, pd.DataFrame, Path, str]) -> WrittenFile:
+    name, df, path, fmt = job
+    written = write_file(df, path, fmt)
+    written.name = name
+    return written
+
+def write_outputs(
+    outputs: Mapping[str, pd.DataFrame],
+    out_dir: str | Path,
+    *,
+    formats: str | Sequence[str] | Mapping[str, str | Sequence[str]] = "xlsx",
+    max_workers: int | None = None,
+    use_processes: bool = False,
+    manifest_name: str | None = "manifest.json",
+) -> WriteManifest:
+    """Write each output as `<out_dir>/<name>.<fmt>`, independent files concurrently.
+
+    `formats` is one format, a list written for every output, or a per-output
+    mapping (outputs missing from it get xlsx). Files are replaced atomically,
+    so a reader never sees a half-written file. Threads overlap the CSV and
+    Parquet writers; xlsx writing holds the GIL, so several large workbooks need
+    `use_processes=True` to run in parallel. The manifest (row counts, bytes,
+    seconds per file) is returned and, unless `manifest_name` is None, saved
+    next to the outputs.
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    jobs: List[Tuple[str, pd.DataFrame, Path, str]] = []
+    for name, df in outputs.items():
+        if not isinstance(df, pd.DataFrame):
+            continue
+        fmts = formats.get(name, "xlsx") if isinstance(formats, Mapping) else formats
+        for fmt in ([fmts] if isinstance(fmts, str) else fmts):
+            if fmt not in WRITERS:
+                raise ValueError(f"Unsupported output format: {fmt!r} (known: {sorted(WRITERS)})")
+            jobs.append((name, df, out_dir / f"{name}.{fmt}", fmt))
+
+    workers = min(max_workers or os.cpu_count() or 1, max(len(jobs), 1))
+    if workers <= 1:
+        files = [_write_job(j) for j in jobs]
+    else:
+        pool = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+        with pool(max_workers=workers) as ex:
+            files = list(ex.map(_write_job, jobs))
+
+    manifest = WriteManifest(out_dir=str(out_dir), files=files)
+    if manifest_name is not None:
+        manifest.to_json(out_dir / manifest_name)
+    return manifest
@@ -0,0 +1,129 @@
+from __future__ import annotations
+import os
+import uuid
+from pathlib import Path
+from typing import Any, Iterator, List, Sequence
+import pandas as pd
+
+# Excel allows 1,048,576 rows per sheet; one of them is the header.
+EXCEL_MAX_DATA_ROWS = 1_048_575
+
+def _tmp_path(path: Path) -> Path:
+    # same directory (rename stays atomic) and same suffix (writers pick engines by it)
+    return path.with_name(f".{path.stem}.{uuid.uuid4().hex[:8]}.tmp{path.suffix}")
+
+def _batch_rows(chunk: pd.DataFrame) -> Iterator[tuple]:
+    # NaN/NaT/NA -> empty cell, numpy scalars -> Python values
+    cols: List[List[Any]] = []
+    for c in chunk.columns:
+        s = chunk[c]
+        cols.append(s.astype(object).where(s.notna(), None).tolist())
+    return zip(*cols)
+
+def _column_widths(df: pd.DataFrame, sample_rows: int = 1000) -> List[float]:
+    """Widths from the header and a sample, so every part gets the same layout."""
+    sample = df.head(sample_rows)
+    widths = []
+    for c in df.columns:
+        longest = sample[c].astype(str).str.len().max() if len(sample) else 0
+        widths.append(float(min(max(len(str(c)), int(longest or 0)) + 2, 60)))
+    return widths
+
+class _Part:
+    """One workbook being streamed; sheets are added as rows overflow."""
+
+    def __init__(self, path: Path, header: Sequence[str], widths: List[float]):
+        from openpyxl import Workbook
+        self.path = path
+        self.tmp = _tmp_path(path)
+        self.wb = Workbook(write_only=True)
+        self.header = header
+        self.widths = widths
+        self.sheets = 0
+
+    def new_sheet(self, title: str):
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import Font
+        from openpyxl.utils import get_column_letter
+
+        ws = self.wb.create_sheet(title=title[:31])
+        for i, w in enumerate(self.widths, start=1):
+            ws.column_dimensions[get_column_letter(i)].width = w
+        ws.freeze_panes = "A2"
+        cells = []
+        for name in self.header:
+            cell = WriteOnlyCell(ws, value=str(name))
+            cell.font = Font(bold=True)
+            cells.append(cell)
+        ws.append(cells)
+        self.sheets += 1
+        return ws
+
+    def close(self) -> None:
+        try:
+            self.wb.save(self.tmp)
+            os.replace(self.tmp, self.path)
+        finally:
+            self.tmp.unlink(missing_ok=True)
+
+def write_xlsx_streaming(
+    df: pd.DataFrame,
+    path: str | Path,
+    *,
+    sheet_name: str = "Sheet1",
+    batch_rows: int = 50_000,
+    max_rows: int = EXCEL_MAX_DATA_ROWS,
+    split: str = "sheet",
+) -> List[Path]:
+    """Write `df` (without index) to xlsx through a write-only workbook.
+
+    Rows are converted and appended `batch_rows` at a time, so memory holds one
+    batch plus openpyxl's streaming buffer, not the whole workbook. When a
+    sheet reaches `max_rows` data rows the output continues on a new sheet
+    (`split="sheet"`: `Sheet1`, `Sheet1_2`, ...) or in a new file
+    (`split="file"`: `name.xlsx`, `name_part2.xlsx`, ...). Every sheet gets
+    the same bold header, frozen header row and column widths. Files are
+    written atomically; returns the paths written.
+    """
+    if split not in ("sheet", "file"):
+        raise ValueError(f"split must be 'sheet' or 'file', got {split!r}")
+    if max_rows < 1 or batch_rows < 1:
+        raise ValueError("max_rows and batch_rows must be positive")
+    path = Path(path)
+    header = [str(c) for c in df.columns]
+    widths = _column_widths(df)
+
+    def part_path(n: int) -> Path:
+        return path if n == 1 else path.with_name(f"{path.stem}_part{n}{path.suffix}")
+
+    def sheet_title(n: int) -> str:
+        return sheet_name if n == 1 else f"{sheet_name}_{n}"
+
+    parts = [_Part(part_path(1), header, widths)]
+    ws = parts[-1].new_sheet(sheet_title(1))
+    written: List[Path] = []
+    in_sheet = 0
+    try:
+        start = 0
+        while start < len(df):
+            if in_sheet == max_rows:
+                if split == "file":
+                    parts[-1].close()
+                    written.append(parts[-1].path)
+                    parts.append(_Part(part_path(len(parts) + 1), header, widths))
+                    ws = parts[-1].new_sheet(sheet_title(1))
+                else:
+                    ws = parts[-1].new_sheet(sheet_title(parts[-1].sheets + 1))
+                in_sheet = 0
+            stop = min(start + batch_rows, start + max_rows - in_sheet, len(df))
+            for row in _batch_rows(df.iloc[start:stop]):
+                ws.append(row)
+            in_sheet += stop - start
+            start = stop
+        parts[-1].close()
+        written.append(parts[-1].path)
+    except BaseException:
+        for p in parts:
+            p.tmp.unlink(missing_ok=True)
+        raise
+    return written
@@ -1,6 +1,8 @@
 from __future__ import annotations
 import pandas as pd
 
+from ma_migration.core.profiling import step
+from ma_migration.core.strings import numeric_id_to_str
 from ma_migration.core.validation import assert_allowed_values
 from .config import FinishingMethodConfig
 
@@ -18,6 +20,9 @@ def prepare_finishing_methods(fm: pd.DataFrame, customers_expanded: pd.DataFrame
 
     # add VAT Number from customers master file (expanded customers contains VAT)
     vat = customers_expanded[["CustomerID in HeliosDb", "NIP / VAT Number"]].drop_duplicates()
-    fm_uq = fm_uq.merge(vat, how="left", left_on=cfg.customer_id_col, right_on="CustomerID in HeliosDb")
+    # customer IDs are text on the customers side; Excel hands these back as numbers
+    fm_uq[cfg.customer_id_col] = numeric_id_to_str(fm_uq[cfg.customer_id_col])
+    with step("merge_customer_vat", fm_uq) as s:
+        fm_uq = s.output(fm_uq.merge(vat, how="left", left_on=cfg.customer_id_col, right_on="CustomerID in HeliosDb"))
     fm_uq = fm_uq.drop(columns=["CustomerID in HeliosDb"])
     return fm_uq
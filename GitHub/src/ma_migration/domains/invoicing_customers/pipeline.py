@@ -1,9 +1,10 @@
 from __future__ import annotations
 import pandas as pd
 
+from ma_migration.core.profiling import step
 from ma_migration.core.validation import assert_allowed_values
 from ma_migration.core.strings import numeric_id_to_str
-from ma_migration.core.dates import format_date
+from ma_migration.core.dates import format_dates
 from .config import InvoicingCustomersConfig
 
 def prepare_invoicing_customers(cus_inv: pd.DataFrame, *, cfg: InvoicingCustomersConfig = InvoicingCustomersConfig()) -> dict[str,pd.DataFrame]:
@@ -14,7 +15,8 @@ def prepare_invoicing_customers(cus_inv: pd.DataFrame, *, cfg: InvoicingCustomer
     assert_allowed_values(cus_inv[cfg.coupling_col].astype(str), list(cfg.valid_coupling), label=cfg.coupling_col)
 
     # remove no-coupling cases
-    cus_inv = cus_inv[cus_inv[cfg.coupling_col].astype(str) != "0001"].copy()
+    with step("drop_no_coupling_customers", cus_inv) as s:
+        cus_inv = s.output(cus_inv[cus_inv[cfg.coupling_col].astype(str) != "0001"].copy())
 
     # rename address columns if present
     rename_map = {
@@ -30,7 +32,7 @@ def prepare_invoicing_customers(cus_inv: pd.DataFrame, *, cfg: InvoicingCustomer
     # convert dates
     for c in ["Contract signed (e.g. 31.8.2022)","Contract term (e.g. until 31.8.2025)"]:
         if c in cus_inv.columns:
-            cus_inv[c] = cus_inv[c].apply(format_date)
+            cus_inv[c] = format_dates(cus_inv[c])
 
     # uat
     cus_inv_uat = cus_inv.copy()
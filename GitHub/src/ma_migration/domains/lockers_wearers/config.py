@@ -1,5 +1,6 @@
 from __future__ import annotations
 from dataclasses import dataclass
+from typing import Tuple
 
 @dataclass(frozen=True)
 class LockersWearersConfig:
@@ -9,3 +10,7 @@ class LockersWearersConfig:
     customer_id_cus_col: str = "CustomerID in HeliosDb"
     contract_type_col: str = "Contract type (rental / laundry/ Both)"
     finishing_method_col: str = "Finishing Method"
+    # LockersWearers_Ref barcode column, before LOCWEA_TRANS_REF
+    ref_barcode_col: str = "Kod kreskowy"
+    # PiecesInCirculation columns to read (None: all; the output carries them)
+    pieces_usecols: Tuple[str, ...] | None = None
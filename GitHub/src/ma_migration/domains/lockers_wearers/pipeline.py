@@ -1,28 +1,98 @@
 from __future__ import annotations
 import os
+from typing import Any, Mapping
 import pandas as pd
 import numpy as np
 import warnings
 
+from ma_migration.core.io import read_csv_filtered, read_many_excels
+from ma_migration.core.profiling import step
 from ma_migration.core.validation import assert_no_duplicates, warn_if_any_null
 from ma_migration.core.strings import numeric_id_to_str
 from .config import LockersWearersConfig
 from .schema import LOCWEA_TRANS_REF
 
-def load_active_garments_from_excels(files: list[str | os.PathLike]) -> pd.DataFrame:
+def load_active_garments_from_excels(files: list[str | os.PathLike], *, max_workers: int | None = None, fail_on_unreadable: bool = False) -> pd.DataFrame:
+    """Stack the ActiveGarments workbooks (see `core.io.read_many_excels`).
+
+    Unreadable files are reported in one UserWarning and the readable ones are
+    still returned; `fail_on_unreadable=True` raises ValueError instead.
+    """
     schema = ['NIP / VAT Number', 'Barcode', 'Invoiced', 'Source_File']
-    dfs = []
-    for f in files:
-        df = pd.read_excel(f)
-        df = df.iloc[:, :3]
-        df.columns = schema[:3]
-        df['Source_File'] = os.path.basename(str(f))
-        dfs.append(df)
-    active = pd.concat(dfs, ignore_index=True)
-    active['NIP / VAT Number'] = active['NIP / VAT Number'].map('{:.0f}'.format).str.strip()
+    batch = read_many_excels(files, take_columns=3, names=schema[:3], source_col='Source_File', max_workers=max_workers)
+    if batch.errors:
+        msg = "Unreadable ActiveGarments files:\n" + "\n".join(f"{f}: {e}" for f, e in batch.errors.items())
+        if fail_on_unreadable:
+            raise ValueError(msg)
+        warnings.warn(msg, UserWarning)
+    active = batch.data if len(batch.data.columns) else pd.DataFrame(columns=schema)
+    active['NIP / VAT Number'] = numeric_id_to_str(active['NIP / VAT Number'])
     active['Invoiced'] = active['Invoiced'].astype(str).str.strip().str.lower()
     return active
 
+def load_extract_matching(
+    path: str | os.PathLike,
+    keys: pd.Series,
+    *,
+    key_col: str,
+    dtype: Mapping[str, Any] | None = None,
+    usecols: tuple[str, ...] | None = None,
+    sep: str = "\t",
+    encoding: str = "UTF-8",
+    lineterminator: str = "\r",
+    chunksize: int = 250_000,
+) -> pd.DataFrame:
+    """Stream a PiecesInCirculation-style extract, keeping only rows whose `key_col` is in `keys`.
+
+    Only `usecols` present in the file are parsed (all columns when None), and
+    each chunk is filtered on `key_col` before the next is read, so memory
+    holds one raw chunk plus the kept rows (see `core.io.iter_csv`). Every
+    chunk is parsed with `dtype` (e.g. `schema.PIECES_IN_CIRCULATION_DTYPES`),
+    so chunks agree on column types; `key_col` is read as str when `dtype`
+    does not declare it. Keys match as in `numeric_id_to_str` (1, 1.0 and "1" are one key).
+    """
+    header = pd.read_csv(path, sep=sep, encoding=encoding, lineterminator=lineterminator, nrows=0).columns
+    if key_col not in header:
+        raise ValueError(f"{os.fspath(path)}: key column {key_col!r} not found")
+    wanted = set(header if usecols is None else usecols) | {key_col}
+    columns = [c for c in header if c in wanted]
+    parse_dtype = {c: t for c, t in (dtype or {}).items() if c in wanted}
+    parse_dtype.setdefault(key_col, str)
+    ids = pd.Index(numeric_id_to_str(keys).dropna().unique())
+    if pd.api.types.is_numeric_dtype(pd.api.types.pandas_dtype(parse_dtype[key_col])):
+        numeric_ids = pd.to_numeric(ids, errors="coerce").dropna()
+        keep = lambda chunk: chunk[key_col].isin(numeric_ids).to_numpy()
+    else:
+        keep = lambda chunk: numeric_id_to_str(chunk[key_col]).isin(ids).to_numpy()
+    return read_csv_filtered(path, sep=sep, encoding=encoding, lineterminator=lineterminator, chunksize=chunksize,
+                             dtype=parse_dtype, usecols=columns, where=keep)
+
+def load_extract_for_customers(
+    path: str | os.PathLike,
+    customers_for_lockers_wearers: pd.DataFrame,
+    *,
+    customer_id_col: str,
+    cfg: LockersWearersConfig = LockersWearersConfig(),
+    **kwargs: Any,
+) -> pd.DataFrame:
+    """PiecesInCirculation rows of master-file customers (see `load_extract_matching`)."""
+    return load_extract_matching(path, customers_for_lockers_wearers[cfg.customer_id_cus_col], key_col=customer_id_col, **kwargs)
+
+def load_reference_for_pieces(
+    path: str | os.PathLike,
+    pieces_in_circulation: pd.DataFrame,
+    *,
+    barcode_col: str,
+    cfg: LockersWearersConfig = LockersWearersConfig(),
+    **kwargs: Any,
+) -> pd.DataFrame:
+    """LockersWearers_Ref rows for the barcodes of `pieces_in_circulation`, whichever customer they are filed under.
+
+    `prepare_lockers_and_wearers` joins the reference on barcode, so these are
+    all the rows the join and its duplicate-barcode check can see.
+    """
+    return load_extract_matching(path, pieces_in_circulation[cfg.barcode_col], key_col=barcode_col, **kwargs)
+
 def validate_active_garments(active: pd.DataFrame) -> None:
     valid_invoiced = {'yes','no'}
     messages = []
@@ -64,7 +134,10 @@ def prepare_lockers_and_wearers(
     """
     # Keep only customers in master file
     cus_unique = customers_for_lockers_wearers[[cfg.customer_id_cus_col, 'Contract number', cfg.vat_col, 'Customer name']].drop_duplicates()
-    locwea = locwea.merge(cus_unique, how='inner', left_on=cfg.customer_id_locwea_col, right_on=cfg.customer_id_cus_col).drop(columns=[cfg.customer_id_cus_col])
+    # customer IDs are text on the customers side; the PiecesInCirculation extract reads them as numbers
+    locwea = locwea.assign(**{cfg.customer_id_locwea_col: numeric_id_to_str(locwea[cfg.customer_id_locwea_col])})
+    with step("merge_master_file_customers", locwea) as s:
+        locwea = s.output(locwea.merge(cus_unique, how='inner', left_on=cfg.customer_id_locwea_col, right_on=cfg.customer_id_cus_col).drop(columns=[cfg.customer_id_cus_col]))
 
     # Split wash-only customers
     ct = customers_contract_types[[cfg.vat_col, cfg.contract_type_col]].drop_duplicates()
@@ -74,9 +147,10 @@ def prepare_lockers_and_wearers(
     locwea_rental = locwea[~wash_mask].copy()
 
     # Filter rental garments using active garments list
-    locwea_rental = locwea_rental.merge(active_garments, how='inner',
-                                        left_on=[cfg.vat_col, cfg.barcode_col],
-                                        right_on=[cfg.vat_col, cfg.barcode_col])
+    with step("merge_active_garments", locwea_rental) as s:
+        locwea_rental = s.output(locwea_rental.merge(active_garments, how='inner',
+                                                     left_on=[cfg.vat_col, cfg.barcode_col],
+                                                     right_on=[cfg.vat_col, cfg.barcode_col]))
     locwea_rental['isRental'] = 1
     locwea_all = pd.concat([locwea_rental, locwea_wash], axis=0, ignore_index=True)
     locwea_all['isRental'] = locwea_all['isRental'].fillna(0)
@@ -87,7 +161,8 @@ def prepare_lockers_and_wearers(
     # Add lockers/wearers reference info
     ref = locwea_ref.rename(columns=LOCWEA_TRANS_REF).drop_duplicates()
     assert_no_duplicates(ref, cfg.barcode_col, label="Lockers/Wearers Reference")
-    locwea_all = locwea_all.merge(ref, how='left', on=cfg.barcode_col, suffixes=("","_Ref"))
+    with step("merge_lockers_wearers_ref", locwea_all) as s:
+        locwea_all = s.output(locwea_all.merge(ref, how='left', on=cfg.barcode_col, suffixes=("","_Ref")))
 
     # Warn if missing department id from reference (notebook warns)
     if 'DepartmentID_Ref' in locwea_all.columns:
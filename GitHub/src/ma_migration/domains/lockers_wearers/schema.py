@@ -23,3 +23,7 @@ LOCWEA_TRANS_REF = {
     "ID Oddzia?u": "DepartmentID_Ref",
     "ID Pracownika": "EmployeeID_Ref",
 }
+
+# Explicit dtypes for the streamed extracts, so every chunk parses the keys the same way
+PIECES_IN_CIRCULATION_DTYPES = {"CustomerID": "Int64", "Barcode": "Int64"}
+LOCWEA_REF_DTYPES = {"ID Kontrahenta": "Int64", "Kod kreskowy": "Int64"}
@@ -0,0 +1,327 @@
+"""Checkpointed stage outputs for the stage graph.
+
+A stage's outputs are stored under a fingerprint of its inputs, its
+configuration (function arguments and defaults, e.g. `CustomerMergeConfig`)
+and the code version: a digest of the whole package source, since stages
+call into domain, core and contract modules. Outputs of a stage get
+fingerprints derived from the stage's, so an unchanged stage is reused
+without hashing its data again, and a change anywhere invalidates exactly
+the stages downstream of it.
+
+CLI: `python -m ma_migration.pipelines.checkpoints {list,inspect,purge}`.
+"""
+from __future__ import annotations
+import argparse
+import dataclasses
+import functools
+import hashlib
+import inspect
+import json
+import pickle
+import shutil
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Optional
+
+import numpy as np
+import pandas as pd
+
+from ma_migration.core.cache import default_cache_dir, file_digest, package_version as _package_version, source_digest as _source_digest
+from .graph import Stage
+
+# Bump when the on-disk checkpoint layout changes.
+_CHECKPOINT_FORMAT = 1
+
+# Stage functions call into domains/, core/ and contracts/, so the whole package is their code.
+_PACKAGE_ROOT = Path(__file__).resolve().parents[1]
+
+@functools.lru_cache(maxsize=None)
+def _module_digest(module: str) -> str:
+    mod = sys.modules.get(module)
+    path = getattr(mod, "__file__", None)
+    return file_digest(path)[:16] if path else "builtin"
+
+def code_version(fn: Callable[..., Any]) -> str:
+    """Package version plus a digest of the `ma_migration` source tree.
+
+    Any edit to the package (a transform, `core.strings`, a contract rule, ...)
+    therefore invalidates every checkpoint. Functions defined outside the
+    package also contribute their own module's digest.
+    """
+    while isinstance(fn, functools.partial):
+        fn = fn.func
+    module = getattr(fn, "__module__", "") or ""
+    version = f"{_package_version()}+{_source_digest(_PACKAGE_ROOT)}"
+    if module.split(".")[0] != __name__.split(".")[0]:
+        version += f"+{_module_digest(module)}"
+    return version
+
+def frame_digest(df: pd.DataFrame) -> str:
+    h = hashlib.sha256()
+    h.update(repr([(str(c), str(t)) for c, t in df.dtypes.items()]).encode())
+    h.update(pd.util.hash_pandas_object(df, index=True, categorize=False).to_numpy().tobytes())
+    return h.hexdigest()
+
+def _stable(obj: Any) -> Any:
+    """A deterministic, JSON-serialisable description of `obj` for fingerprinting."""
+    if obj is None or isinstance(obj, (bool, int, float)):
+        return obj
+    if isinstance(obj, str):
+        return str(obj)  # str subclasses (ColumnSpec) compare as their text
+    if isinstance(obj, Path):
+        # files are identified by content, so an edited source invalidates its reads
+        return {"file": file_digest(obj) if obj.is_file() else str(obj)}
+    if isinstance(obj, pd.DataFrame):
+        return {"frame": frame_digest(obj)}
+    if isinstance(obj, pd.Series):
+        return {"frame": frame_digest(obj.to_frame())}
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return {"dataclass": type(obj).__qualname__,
+                "fields": {f.name: _stable(getattr(obj, f.name)) for f in dataclasses.fields(obj)}}
+    if isinstance(obj, Mapping):
+        return {"map": sorted((str(k), _stable(v)) for k, v in obj.items())}
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        items = [_stable(v) for v in obj]
+        return {"seq": sorted(items, key=repr) if isinstance(obj, (set, frozenset)) else items}
+    if isinstance(obj, functools.partial):
+        return {"partial": _stable(obj.func), "args": _stable(obj.args), "kwargs": _stable(obj.keywords)}
+    if callable(obj):
+        defaults = {}
+        try:
+            for name, p in inspect.signature(obj).parameters.items():
+                if p.default is not inspect.Parameter.empty:
+                    defaults[name] = _stable(p.default)
+        except (TypeError, ValueError):
+            pass
+        return {"fn": f"{getattr(obj, '__module__', '')}.{getattr(obj, '__qualname__', repr(obj))}", "defaults": defaults}
+    return {"repr": repr(obj)}
+
+def _digest(payload: Any) -> str:
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+def stage_fingerprint(stage: Stage, input_fingerprints: Mapping[str, str]) -> str:
+    return _digest({
+        "format": _CHECKPOINT_FORMAT,
+        "stage": stage.name,
+        "fn": _stable(stage.fn),
+        "code": code_version(stage.fn),
+        "inputs": sorted((param, input_fingerprints[art]) for param, art in stage.input_map().items()),
+        "outputs": list(stage.outputs),
+    })
+
+def _null_kind(s: pd.Series) -> Optional[str]:
+    """'nan' or 'none' when an object column's nulls are all of one kind, else None."""
+    nulls = s[s.isna()]
+    if len(nulls) == 0:
+        return "nan"
+    kinds = {type(v) for v in nulls}
+    if kinds == {float}:
+        return "nan"
+    if kinds == {type(None)}:
+        return "none"
+    return None
+
+def _save_value(value: Any, base: Path) -> Dict[str, Any]:
+    """Store a DataFrame as Parquet when the round trip is exact, anything else pickled."""
+    if isinstance(value, pd.DataFrame) and all(isinstance(c, str) for c in value.columns) and value.columns.is_unique:
+        nulls: Dict[str, str] = {}
+        exact = True
+        for c in value.columns[value.dtypes == object]:
+            kind = _null_kind(value[c])
+            if kind is None or pd.api.types.infer_dtype(value[c], skipna=True) not in ("string", "empty"):
+                exact = False
+                break
+            nulls[c] = kind
+        if exact:
+            try:
+                value.to_parquet(base.with_suffix(".parquet"), index=True)
+                return {"format": "parquet", "file": base.with_suffix(".parquet").name, "nulls": nulls,
+                        "rows": len(value), "columns": len(value.columns)}
+            except Exception:
+                base.with_suffix(".parquet").unlink(missing_ok=True)
+    with open(base.with_suffix(".pkl"), "wb") as fh:
+        pickle.dump(value, fh, protocol=pickle.HIGHEST_PROTOCOL)
+    meta: Dict[str, Any] = {"format": "pickle", "file": base.with_suffix(".pkl").name}
+    if isinstance(value, pd.DataFrame):
+        meta.update(rows=len(value), columns=len(value.columns))
+    return meta
+
+def _load_value(directory: Path, meta: Mapping[str, Any]) -> Any:
+    path = directory / meta["file"]
+    if meta["format"] == "parquet":
+        df = pd.read_parquet(path)
+        for c, kind in meta.get("nulls", {}).items():
+            if kind == "nan":
+                df[c] = df[c].where(df[c].notna(), np.nan)
+        return df
+    with open(path, "rb") as fh:
+        return pickle.load(fh)
+
+@dataclass
+class CheckpointInfo:
+    stage: str
+    fingerprint: str
+    created: float
+    seconds: float
+    bytes: int
+    outputs: Dict[str, Dict[str, Any]]
+    path: str
+
+class CheckpointStore:
+    """Stage outputs on disk: `<root>/<stage>/<fingerprint>/` (default root:
+    `default_cache_dir("checkpoints")`)."""
+
+    def __init__(self, root: str | Path | None = None):
+        self.root = Path(root) if root is not None else default_cache_dir("checkpoints")
+        self._lock = threading.Lock()
+
+    def _dir(self, stage: str, fingerprint: str) -> Path:
+        return self.root / stage / fingerprint
+
+    def load(self, stage: str, fingerprint: str) -> Optional[Dict[str, Any]]:
+        d = self._dir(stage, fingerprint)
+        try:
+            meta = json.loads((d / "meta.json").read_text(encoding="utf-8"))
+            if meta.get("format") != _CHECKPOINT_FORMAT:
+                return None
+            return {name: _load_value(d, m) for name, m in meta["outputs"].items()}
+        except (OSError, ValueError, KeyError, pickle.UnpicklingError):
+            return None
+
+    def save(self, stage: str, fingerprint: str, outputs: Mapping[str, Any], *, seconds: float = 0.0) -> None:
+        final = self._dir(stage, fingerprint)
+        tmp = final.with_name(f".{fingerprint}.{threading.get_ident()}.tmp")
+        try:
+            shutil.rmtree(tmp, ignore_errors=True)
+            tmp.mkdir(parents=True)
+            metas = {name: _save_value(value, tmp / f"out_{i}") for i, (name, value) in enumerate(outputs.items())}
+            (tmp / "meta.json").write_text(json.dumps({
+                "format": _CHECKPOINT_FORMAT, "stage": stage, "fingerprint": fingerprint,
+                "created": time.time(), "seconds": seconds, "outputs": metas,
+            }, indent=2), encoding="utf-8")
+            with self._lock:
+                shutil.rmtree(final, ignore_errors=True)
+                tmp.rename(final)
+        except OSError:
+            shutil.rmtree(tmp, ignore_errors=True)  # checkpoints are best effort
+
+    def runner(self, *, recompute: bool = False) -> Callable[[Stage, Mapping[str, Any]], Dict[str, Any]]:
+        """A `StageGraph.run(run_stage=...)` hook that reuses and writes checkpoints.
+
+        With `recompute=True` every stage runs again and its checkpoint is overwritten.
+        """
+        fingerprints: Dict[str, str] = {}
+        lock = threading.Lock()
+
+        def input_fp(name: str, value: Any) -> str:
+            with lock:
+                fp = fingerprints.get(name)
+            if fp is None:
+                fp = _digest(_stable(value))  # an initial artifact: hash its data once
+                with lock:
+                    fingerprints[name] = fp
+            return fp
+
+        def run_stage(stage: Stage, artifacts: Mapping[str, Any]) -> Dict[str, Any]:
+            fps = {art: input_fp(art, artifacts[art]) for art in stage.input_map().values()}
+            fp = stage_fingerprint(stage, fps)
+            produced = None if recompute else self.load(stage.name, fp)
+            if produced is None:
+                t0 = time.perf_counter()
+                produced = stage.run(artifacts)
+                self.save(stage.name, fp, produced, seconds=time.perf_counter() - t0)
+            with lock:
+                for out in stage.outputs:
+                    fingerprints[out] = _digest({"stage": fp, "output": out})
+            return produced
+
+        return run_stage
+
+    def list(self, stage: str | None = None) -> List[CheckpointInfo]:
+        infos: List[CheckpointInfo] = []
+        if not self.root.exists():
+            return infos
+        for meta_path in sorted(self.root.glob(f"{stage or '*'}/*/meta.json")):
+            try:
+                meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                continue
+            d = meta_path.parent
+            infos.append(CheckpointInfo(
+                stage=meta.get("stage", d.parent.name), fingerprint=d.name, created=meta.get("created", 0.0),
+                seconds=meta.get("seconds", 0.0), bytes=sum(p.stat().st_size for p in d.iterdir()),
+                outputs=meta.get("outputs", {}), path=str(d),
+            ))
+        return sorted(infos, key=lambda i: (i.stage, -i.created))
+
+    def inspect(self, stage: str, fingerprint: str | None = None) -> Optional[CheckpointInfo]:
+        """The checkpoint of `stage` with `fingerprint` (or its prefix), else the newest."""
+        for info in self.list(stage):
+            if fingerprint is None or info.fingerprint.startswith(fingerprint):
+                return info
+        return None
+
+    def purge(self, stage: str | None = None, *, older_than_days: float | None = None, keep_latest: int = 0) -> int:
+        """Delete checkpoints (optionally of one stage / older than N days), keeping the newest `keep_latest` per stage."""
+        removed = 0
+        cutoff = time.time() - older_than_days * 86400 if older_than_days is not None else None
+        per_stage: Dict[str, int] = {}
+        for info in self.list(stage):
+            per_stage[info.stage] = per_stage.get(info.stage, 0) + 1
+            if per_stage[info.stage] <= keep_latest:
+                continue
+            if cutoff is not None and info.created >= cutoff:
+                continue
+            shutil.rmtree(info.path, ignore_errors=True)
+            removed += 1
+            try:
+                Path(info.path).parent.rmdir()  # drop the stage directory once empty
+            except OSError:
+                pass
+        return removed
+
+def as_checkpoint_store(checkpoints: CheckpointStore | str | Path | bool | None) -> Optional[CheckpointStore]:
+    """None/False -> no checkpoints, True -> the default store, a path -> a store there."""
+    if checkpoints is None or checkpoints is False:
+        return None
+    if isinstance(checkpoints, CheckpointStore):
+        return checkpoints
+    return CheckpointStore(None if checkpoints is True else checkpoints)
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="ma-migration checkpoints", description="List, inspect and purge stage checkpoints.")
+    parser.add_argument("--root", default=None, help="checkpoint directory (default: the ma_migration cache dir)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_list = sub.add_parser("list", help="list checkpoints")
+    p_list.add_argument("stage", nargs="?")
+    p_inspect = sub.add_parser("inspect", help="show one checkpoint's metadata")
+    p_inspect.add_argument("stage")
+    p_inspect.add_argument("fingerprint", nargs="?")
+    p_purge = sub.add_parser("purge", help="delete checkpoints")
+    p_purge.add_argument("stage", nargs="?")
+    p_purge.add_argument("--older-than-days", type=float, default=None)
+    p_purge.add_argument("--keep-latest", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    store = CheckpointStore(args.root)
+    if args.command == "list":
+        for info in store.list(args.stage):
+            rows = sum(o.get("rows", 0) or 0 for o in info.outputs.values())
+            created = time.strftime("%Y-%m-%d %H:%M", time.localtime(info.created))
+            print(f"{info.stage:<28} {info.fingerprint[:12]}  {created}  rows={rows:<10} {info.bytes / 1e6:8.1f} MB  {info.seconds:7.2f}s")
+        return 0
+    if args.command == "inspect":
+        info = store.inspect(args.stage, args.fingerprint)
+        if info is None:
+            print(f"No checkpoint for {args.stage}", file=sys.stderr)
+            return 1
+        print(json.dumps(dataclasses.asdict(info), indent=2))
+        return 0
+    print(f"Removed {store.purge(args.stage, older_than_days=args.older_than_days, keep_latest=args.keep_latest)} checkpoints")
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,98 +1,213 @@
 from __future__ import annotations
+from functools import partial
+from pathlib import Path
+from typing import Any, Dict, List
 import pandas as pd
 from ma_migration.core.types import SourceConfig
-from ma_migration.core.io import read_excel, read_csv, read_many_excels
+from ma_migration.core.contracts import DomainContract
+from ma_migration.core.io import read_excel, list_many_excels, read_with_contract
+from ma_migration.core.frames import enable_copy_on_write
 
 from ma_migration.domains.customers.pipeline import prepare_customers
 from ma_migration.domains.finishing_method.pipeline import prepare_finishing_methods
 from ma_migration.domains.customer_master_merge.pipeline import prepare_customer_master_file
 from ma_migration.domains.invoicing_customers.pipeline import prepare_invoicing_customers
-from ma_migration.domains.lockers_wearers.pipeline import load_active_garments_from_excels, validate_active_garments, prepare_lockers_and_wearers
+from ma_migration.domains.lockers_wearers.config import LockersWearersConfig
+from ma_migration.domains.lockers_wearers.pipeline import (
+    load_active_garments_from_excels, load_extract_for_customers, load_reference_for_pieces, validate_active_garments,
+    prepare_lockers_and_wearers,
+)
+from ma_migration.domains.lockers_wearers.schema import LOCWEA_REF_DTYPES, LOCWEA_TRANS_REF, PIECES_IN_CIRCULATION_DTYPES
 from ma_migration.domains.product_features.pipeline import prepare_product_catalog, prepare_product_size_mappings
 from ma_migration.domains.products_sizes.pipeline import prepare_product_sizes
+from .checkpoints import CheckpointStore, as_checkpoint_store
+from .graph import Stage, StageGraph
+from .profiling import PipelineProfiler
+
+OUTPUTS = (
+    "customer_master", "customer_master_uat",
+    "invoicing_customers", "invoicing_customers_uat",
+    "lockers_wearers",
+    "product_sizes", "li_product_catalog", "li_product_sizes",
+)
+
+def _customers(customers_master: pd.DataFrame, *, contract: DomainContract, strict: bool) -> Dict[str, pd.DataFrame]:
+    res = prepare_customers(customers_master, contract=contract, strict=strict)
+    return {
+        "customers_expanded": res.data["customers_base"],
+        "customers_for_invoicing": res.data["customers_for_invoicing"],
+        "customers_for_lockers_wearers": res.data["customers_for_lockers_wearers"],
+    }
+
+def domain_stages(available: set[str], *, customers_contract: DomainContract, strict: bool = True) -> List[Stage]:
+    """Domain stages of the breakdown, for the input frames named in `available`.
+
+    Stages whose inputs are not available are left out, so a run without e.g.
+    PiecesInCirculation still produces the customer and invoicing outputs.
+    """
+    stages = [
+        Stage("customers", partial(_customers, contract=customers_contract, strict=strict), ["customers_master"],
+              ("customers_expanded", "customers_for_invoicing", "customers_for_lockers_wearers")),
+        Stage("invoicing_customers", prepare_invoicing_customers, {"cus_inv": "customers_for_invoicing"},
+              ("invoicing_customers", "invoicing_customers_uat")),
+    ]
+    if "finishing_methods" in available:
+        stages += [
+            Stage("finishing_methods", prepare_finishing_methods,
+                  {"fm": "finishing_methods", "customers_expanded": "customers_expanded"}, ("fm_uq",)),
+            Stage("customer_master", prepare_customer_master_file,
+                  {"customers_expanded": "customers_expanded", "fm_uq": "fm_uq"}, ("customer_master", "customer_master_uat")),
+        ]
+    if {"pieces_in_circulation", "lockers_wearers_ref", "active_garments"} <= available:
+        stages.append(Stage("lockers_wearers", prepare_lockers_and_wearers, {
+            "locwea": "pieces_in_circulation",
+            "locwea_ref": "lockers_wearers_ref",
+            "customers_for_lockers_wearers": "customers_for_lockers_wearers",
+            "customers_contract_types": "customers_master",
+            "active_garments": "active_garments",
+        }, ("lockers_wearers",)))
+    for name, fn, param, raw in (("product_sizes", prepare_product_sizes, "sizes", "product_sizes_raw"),
+                                 ("li_product_catalog", prepare_product_catalog, "li_product_catalog", "li_product_catalog_raw"),
+                                 ("li_product_sizes", prepare_product_size_mappings, "li_product_sizes", "li_product_sizes_raw")):
+        if raw in available:
+            stages.append(Stage(name, fn, {param: raw}, (name,)))
+    return stages
+
+def _run(stages: List[Stage], initial: Dict[str, Any], *, max_workers: int | None,
+         checkpoints: CheckpointStore | str | Path | bool | None = None,
+         profile: PipelineProfiler | None = None, copy_on_write: bool = False) -> dict[str, pd.DataFrame]:
+    if copy_on_write:
+        enable_copy_on_write()  # before the graph starts its worker threads
+    store = as_checkpoint_store(checkpoints)
+    run_stage = store.runner() if store is not None else None
+    if profile is not None:
+        run_stage = profile.runner(run_stage)
+    outputs = StageGraph(stages).run(initial, keep=OUTPUTS, max_workers=max_workers, run_stage=run_stage)
+    return {name: outputs[name] for name in OUTPUTS if name in outputs}
 
 def run_from_dataframes(
     *,
     customers_master: pd.DataFrame,
-    finishing_methods: pd.DataFrame,
-    pieces_in_circulation: pd.DataFrame,
-    lockers_wearers_ref: pd.DataFrame,
-    active_garments: pd.DataFrame,
+    customers_contract: DomainContract,
+    finishing_methods: pd.DataFrame | None = None,
+    pieces_in_circulation: pd.DataFrame | None = None,
+    lockers_wearers_ref: pd.DataFrame | None = None,
+    active_garments: pd.DataFrame | None = None,
     product_sizes: pd.DataFrame | None = None,
     li_product_catalog: pd.DataFrame | None = None,
     li_product_sizes: pd.DataFrame | None = None,
     strict: bool = True,
+    max_workers: int | None = None,
+    checkpoints: CheckpointStore | str | Path | bool | None = None,
+    profile: PipelineProfiler | None = None,
+    copy_on_write: bool = False,
 ) -> dict[str, pd.DataFrame]:
     """Run the full Customers Breakdown pipeline using in-memory DataFrames.
 
-    This module is intentionally thin: it orchestrates domain pipelines
-    in the same conceptual order as the notebook.
-    """
-    cust_res = prepare_customers(customers_master, strict=strict)
-   
+    This module is intentionally thin: it declares the domain pipelines as a
+    stage graph (see `pipelines.graph`). Finishing methods, invoicing customers
+    and lockers/wearers only need the customers stage, so they run
+    concurrently once it is done. Outputs whose inputs are missing are skipped.
 
-   # fm_uq = prepare_finishing_methods(finishing_methods, customers_expanded)
-   # cm_out = prepare_customer_master_file(customers_expanded, fm_uq)
-   # inv_out = prepare_invoicing_customers(cust_res.data["customers_for_invoicing"])
+    With `checkpoints` (a `CheckpointStore`, a directory, or True for the
+    default cache directory) each stage's outputs are saved, and a stage whose
+    inputs, arguments and code are unchanged is loaded instead of recomputed.
+    With a `PipelineProfiler` as `profile`, per-stage timings and row flow are
+    recorded into it (`profile.report().to_html(...)`). `copy_on_write=True`
+    switches pandas copy-on-write on for the rest of the process before any
+    stage runs (see `core.frames.enable_copy_on_write`).
+    """
+    initial = {
+        "customers_master": customers_master,
+        "finishing_methods": finishing_methods,
+        "pieces_in_circulation": pieces_in_circulation,
+        "lockers_wearers_ref": lockers_wearers_ref,
+        "active_garments": active_garments,
+        "product_sizes_raw": product_sizes,
+        "li_product_catalog_raw": li_product_catalog,
+        "li_product_sizes_raw": li_product_sizes,
+    }
+    initial = {k: v for k, v in initial.items() if v is not None}
+    stages = domain_stages(set(initial), customers_contract=customers_contract, strict=strict)
+    return _run(stages, initial, max_workers=max_workers, checkpoints=checkpoints, profile=profile,
+                copy_on_write=copy_on_write)
 
-  #  lw_df = prepare_lockers_and_wearers(
-  #      pieces_in_circulation,
-  #      lockers_wearers_ref,
-  #      cust_res.data["customers_for_lockers_wearers"],
-  #      customers_master,
-  #      active_garments,
-  #  )
+def _read_active_garments(files: List[Path]) -> pd.DataFrame:
+    active = load_active_garments_from_excels(files)  # unreadable files are warned about, not fatal
+    validate_active_garments(active)
+    return active
 
-    outputs: dict[str, pd.DataFrame] = {}
-   # outputs.update(cm_out)
-   # outputs.update(inv_out)
-   # outputs["lockers_wearers"] = lw_df
+def source_stages(cfg: SourceConfig, *, customers_contract: DomainContract | None = None, strict: bool = True) -> List[Stage]:
+    """One read stage per configured source; most have no inputs and run concurrently.
 
-  #  if product_sizes is not None:
-  #      outputs["product_sizes"] = prepare_product_sizes(product_sizes)
-  #  if li_product_catalog is not None:
-  #      outputs["li_product_catalog"] = prepare_product_catalog(li_product_catalog)
-  #  if li_product_sizes is not None:
-  #      outputs["li_product_sizes"] = prepare_product_size_mappings(li_product_sizes)
+    Paths are passed as `Path` objects and the ActiveGarments glob is resolved
+    here, so checkpoints (see `pipelines.checkpoints`) key reads on file contents.
+    PiecesInCirculation waits for the customers stage and LockersWearers_Ref
+    for PiecesInCirculation: each is streamed and filtered chunk by chunk (to
+    those customers, then to the kept pieces' barcodes), so the full extracts
+    are never held in memory.
+    """
+    if customers_contract is not None:
+        read_customers = partial(read_with_contract, customers_contract, Path(cfg.customers_masterfile_path), strict=strict)
+    else:
+        read_customers = partial(read_excel, Path(cfg.customers_masterfile_path), sheet_name=cfg.customers_sheet, header=cfg.customers_header)
+    stages = [Stage("read_customers_master", read_customers, (), ("customers_master",))]
+    if cfg.finishing_methods_path is not None:
+        stages.append(Stage("read_finishing_methods", partial(read_excel, Path(cfg.finishing_methods_path)), (), ("finishing_methods",)))
+    # the two large extracts stream in chunks: pieces of the customers the lockers/wearers domain uses,
+    # then the reference rows of those pieces' barcodes (the domain joins the reference on barcode)
+    lw = LockersWearersConfig()
+    customers = {"customers_for_lockers_wearers": "customers_for_lockers_wearers"}
+    if cfg.pieces_in_circulation_path is not None:
+        stages.append(Stage("read_pieces_in_circulation", partial(
+            load_extract_for_customers, Path(cfg.pieces_in_circulation_path), customer_id_col=lw.customer_id_locwea_col,
+            dtype=PIECES_IN_CIRCULATION_DTYPES, usecols=lw.pieces_usecols,
+            sep=cfg.pieces_in_circulation_sep, encoding=cfg.pieces_in_circulation_encoding,
+            lineterminator=cfg.pieces_in_circulation_lineterminator, chunksize=cfg.csv_chunksize,
+        ), customers, ("pieces_in_circulation",)))
+    if cfg.lockers_wearers_ref_path is not None:
+        stages.append(Stage("read_lockers_wearers_ref", partial(
+            load_reference_for_pieces, Path(cfg.lockers_wearers_ref_path), barcode_col=lw.ref_barcode_col,
+            dtype=LOCWEA_REF_DTYPES, usecols=tuple(LOCWEA_TRANS_REF),
+            sep=cfg.lockers_wearers_ref_sep, encoding=cfg.lockers_wearers_ref_encoding,
+            lineterminator=cfg.lockers_wearers_ref_lineterminator, chunksize=cfg.csv_chunksize,
+        ), {"pieces_in_circulation": "pieces_in_circulation"}, ("lockers_wearers_ref",)))
+    if cfg.active_garments_glob is not None:
+        stages.append(Stage("read_active_garments", partial(_read_active_garments, list_many_excels(cfg.active_garments_glob)), (), ("active_garments",)))
+    if cfg.product_sizes_path is not None:
+        stages.append(Stage("read_product_sizes", partial(read_excel, Path(cfg.product_sizes_path), sheet_name=cfg.product_sizes_sheet), (), ("product_sizes_raw",)))
+    if cfg.li_product_catalog_path is not None:
+        stages.append(Stage("read_li_product_catalog", partial(
+            read_excel, Path(cfg.li_product_catalog_path), sheet_name=cfg.li_product_catalog_sheet, header=cfg.li_product_catalog_header,
+        ), (), ("li_product_catalog_raw",)))
+    if cfg.li_product_sizes_path is not None:
+        stages.append(Stage("read_li_product_sizes", partial(read_excel, Path(cfg.li_product_sizes_path), sheet_name=cfg.li_product_sizes_sheet), (), ("li_product_sizes_raw",)))
+    return stages
 
-    return outputs
+def run_from_sources(cfg: SourceConfig, *, strict: bool = True, customers_contract: DomainContract | None = None,
+                     max_workers: int | None = None,
+                     checkpoints: CheckpointStore | str | Path | bool | None = None,
+                     profile: PipelineProfiler | None = None,
+                     copy_on_write: bool = False) -> dict[str, pd.DataFrame]:
+    """Run pipeline from configured sources (paths/sheets/headers).
 
-def run_from_sources(cfg: SourceConfig, *, strict: bool = True) -> dict[str, pd.DataFrame]:
-    """Run pipeline from configured sources (paths/sheets/headers)."""
+    Reading is part of the stage graph, so sources load concurrently and each
+    domain starts as soon as its own inputs are read. The customers contract
+    comes from `customers_contract` or `cfg.customers_contract_path`; with it
+    the customer master is read with only the declared columns and types
+    (see `core.io.read_with_contract`). `checkpoints` works as in
+    `run_from_dataframes`; read stages are keyed on the source files' contents.
+    `profile` and `copy_on_write` also work as there; profiles cover the read stages.
+    """
     if cfg.customers_masterfile_path is None:
         raise ValueError("customers_masterfile_path required")
-   
-   # if cfg.finishing_methods_path is None:
-   #     raise ValueError("finishing_methods_path required")
-   # if cfg.pieces_in_circulation_path is None:
-   #     raise ValueError("pieces_in_circulation_path required")
-   # if cfg.lockers_wearers_ref_path is None:
-   #     raise ValueError("lockers_wearers_ref_path required")
-   # if cfg.active_garments_glob is None:
-   #     raise ValueError("active_garments_glob required")
-
-    customers_master = read_excel(cfg.customers_masterfile_path, sheet_name=cfg.customers_sheet, header=cfg.customers_header)
-    
-   # finishing_methods = read_excel(cfg.finishing_methods_path)
-   # pieces = read_csv(cfg.pieces_in_circulation_path, sep=cfg.pieces_in_circulation_sep, encoding=cfg.pieces_in_circulation_encoding, lineterminator=cfg.pieces_in_circulation_lineterminator)
-   # ref = read_csv(cfg.lockers_wearers_ref_path, sep=cfg.lockers_wearers_ref_sep, encoding=cfg.lockers_wearers_ref_encoding, lineterminator=cfg.lockers_wearers_ref_lineterminator)
-
-   # files = read_many_excels(cfg.active_garments_glob)
-   # active = load_active_garments_from_excels(files)
-   # validate_active_garments(active)
-
-   # product_sizes = read_excel(cfg.product_sizes_path, sheet_name=cfg.product_sizes_sheet) if cfg.product_sizes_path else None
-   # li_product_catalog = read_excel(cfg.li_product_catalog_path, sheet_name=cfg.li_product_catalog_sheet, header=cfg.li_product_catalog_header) if cfg.li_product_catalog_path else None
-   #  li_product_sizes = read_excel(cfg.li_product_sizes_path, sheet_name=cfg.li_product_sizes_sheet) if cfg.li_product_sizes_path else None
+    contract = customers_contract
+    if contract is None and cfg.customers_contract_path is not None:
+        contract = DomainContract.from_file(cfg.customers_contract_path)
+    if contract is None:
+        raise ValueError("customers_contract (or cfg.customers_contract_path) required")
 
-    return run_from_dataframes(
-        customers_master=customers_master,
-    #    finishing_methods=finishing_methods,
-    #    pieces_in_circulation=pieces,
-    #    lockers_wearers_ref=ref,
-    #    active_garments=active,
-    #    product_sizes=product_sizes,
-    #    li_product_catalog=li_product_catalog,
-    #    li_product_sizes=li_product_sizes,
-    #    strict=strict,
-    )
+    reads = source_stages(cfg, customers_contract=contract, strict=strict)
+    available = {out for s in reads for out in s.outputs}
+    return _run(reads + domain_stages(available, customers_contract=contract, strict=strict), {}, max_workers=max_workers,
+                checkpoints=checkpoints, profile=profile, copy_on_write=copy_on_write)
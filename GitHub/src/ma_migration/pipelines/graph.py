@@ -0,0 +1,143 @@
+from __future__ import annotations
+import os
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Sequence, Set
+
+@dataclass(frozen=True)
+class Stage:
+    """A named step: `fn(**inputs)` produces `outputs`.
+
+    `inputs` maps parameter names to artifact names (a plain sequence means the
+    names are the same). With one output the return value is that artifact;
+    with several, `fn` returns a dict holding each of them.
+    """
+    name: str
+    fn: Callable[..., Any]
+    inputs: Mapping[str, str] | Sequence[str] = field(default_factory=dict)
+    outputs: Sequence[str] = ()
+
+    def input_map(self) -> Dict[str, str]:
+        if isinstance(self.inputs, Mapping):
+            return dict(self.inputs)
+        return {name: name for name in self.inputs}
+
+    def run(self, artifacts: Mapping[str, Any]) -> Dict[str, Any]:
+        result = self.fn(**{param: artifacts[art] for param, art in self.input_map().items()})
+        if len(self.outputs) == 1:
+            return {self.outputs[0]: result}
+        if not isinstance(result, Mapping):
+            raise ValueError(f"Stage {self.name!r} must return a dict with {list(self.outputs)}")
+        missing = [o for o in self.outputs if o not in result]
+        if missing:
+            raise ValueError(f"Stage {self.name!r} did not produce {missing}")
+        return {o: result[o] for o in self.outputs}
+
+class StageGraph:
+    """Stages wired by artifact name, run as soon as their inputs exist.
+
+    Independent stages run concurrently on a thread pool (pandas releases the
+    GIL in most heavy kernels), so wall time approaches the longest chain
+    rather than the sum of all stages. An intermediate artifact is dropped as
+    soon as its last consumer has finished, unless it was asked for in `keep`.
+    """
+
+    def __init__(self, stages: Iterable[Stage]):
+        self.stages: List[Stage] = list(stages)
+        self._producer: Dict[str, Stage] = {}
+        names: Set[str] = set()
+        for s in self.stages:
+            if s.name in names:
+                raise ValueError(f"Duplicate stage name: {s.name!r}")
+            names.add(s.name)
+            for out in s.outputs:
+                if out in self._producer:
+                    raise ValueError(f"Artifact {out!r} produced by both {self._producer[out].name!r} and {s.name!r}")
+                self._producer[out] = s
+
+    def _topo(self, available: Set[str]) -> List[str]:
+        done: List[str] = []
+        pending = list(self.stages)
+        while pending:
+            ready = [s for s in pending if all(a in available for a in s.input_map().values())]
+            if not ready:
+                raise ValueError(f"Stage graph has a cycle among {[s.name for s in pending]}")
+            for s in ready:
+                available.update(s.outputs)
+                done.append(s.name)
+            pending = [s for s in pending if s not in ready]
+        return done
+
+    def _check(self, initial: Mapping[str, Any]) -> None:
+        for s in self.stages:
+            for art in s.input_map().values():
+                if art not in initial and art not in self._producer:
+                    raise ValueError(f"Stage {s.name!r} needs {art!r}, which nothing provides")
+        self._topo(set(initial))
+
+    def order(self) -> List[str]:
+        """A valid sequential order of stage names (useful for logs and docs)."""
+        return self._topo({a for s in self.stages for a in s.input_map().values() if a not in self._producer})
+
+    def run(
+        self,
+        initial: Mapping[str, Any],
+        *,
+        keep: Iterable[str] | None = None,
+        max_workers: int | None = None,
+        run_stage: Callable[[Stage, Mapping[str, Any]], Dict[str, Any]] | None = None,
+    ) -> Dict[str, Any]:
+        """Run every stage and return the `keep` artifacts (default: all stage outputs).
+
+        `run_stage(stage, artifacts)` replaces `stage.run` (e.g. to add caching
+        or profiling around each stage). The first stage error is re-raised
+        once running stages have finished; stages not yet started are skipped.
+        """
+        self._check(initial)
+        keep_set = set(keep) if keep is not None else set(self._producer)
+        execute = run_stage or (lambda stage, arts: stage.run(arts))
+
+        artifacts: Dict[str, Any] = dict(initial)
+        consumers: Dict[str, int] = {}
+        for s in self.stages:
+            for art in set(s.input_map().values()):
+                consumers[art] = consumers.get(art, 0) + 1
+
+        def release(stage: Stage) -> None:
+            for art in set(stage.input_map().values()):
+                consumers[art] -= 1
+                if consumers[art] == 0 and art not in keep_set:
+                    artifacts.pop(art, None)
+
+        pending = list(self.stages)
+        running: Dict[Future, Stage] = {}
+        workers = max(1, min(max_workers or os.cpu_count() or 1, len(self.stages) or 1))
+        error: BaseException | None = None
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            while pending or running:
+                if error is None:
+                    ready = [s for s in pending if all(a in artifacts for a in s.input_map().values())]
+                    for s in ready:
+                        inputs = {a: artifacts[a] for a in s.input_map().values()}
+                        running[ex.submit(execute, s, inputs)] = s
+                    pending = [s for s in pending if s not in ready]
+                elif not running:
+                    break
+                if not running:
+                    raise ValueError(f"Stages cannot run, inputs never produced: {[s.name for s in pending]}")
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for fut in done:
+                    stage = running.pop(fut)
+                    try:
+                        produced = fut.result()
+                    except BaseException as e:
+                        error = error or e
+                        continue
+                    artifacts.update(produced)
+                    for out in stage.outputs:
+                        if consumers.get(out, 0) == 0 and out not in keep_set:
+                            artifacts.pop(out, None)
+                    release(stage)
+        if error is not None:
+            raise error
+        return {k: v for k, v in artifacts.items() if k in keep_set}
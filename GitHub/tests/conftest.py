@@ -12,3 +12,11 @@ def sample_customers():
         "Invoicing Coupling Code": ["0001", "0090"],
         "Invoicing Cluster": ["1", "2"],
     })
+
+@pytest.fixture(autouse=True, scope="session")
+def _isolated_cache_dir(tmp_path_factory):
+    # on-disk caches (contracts, ingest) default to ~/.cache; keep test runs out of it
+    mp = pytest.MonkeyPatch()
+    mp.setenv("MA_MIGRATION_CACHE_DIR", str(tmp_path_factory.mktemp("cache")))
+    yield
+    mp.undo()
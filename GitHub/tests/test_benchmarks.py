@@ -0,0 +1,42 @@
+import warnings
+
+import pandas as pd
+
+from ma_migration.benchmarks import suite
+from ma_migration.benchmarks.synthetic import generate
+from ma_migration.pipelines.customers_breakdown import run_from_sources
+
+def test_generate_is_deterministic_and_covers_edge_cases():
+    a, b = generate(2_000, seed=1), generate(2_000, seed=1)
+    for name, frame in a.frames().items():
+        pd.testing.assert_frame_equal(frame, b.frames()[name], obj=name)
+    cus = a.customers_master
+    assert len(a.pieces_in_circulation) == 2_000
+    assert (cus["Contract type (rental / laundry/ Both)"] == "Both").any()
+    assert cus["NIP / VAT Number"].isna().any()
+    assert (cus["Invoicing Coupling Code"] == "no coupling").any()
+    assert not generate(2_000, seed=2).customers_master.equals(cus)
+
+def test_written_sources_match_in_memory_frames(tmp_path):
+    data = generate(2_000, active_files=2)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        from_files = run_from_sources(data.write(tmp_path), strict=False)
+        cases = {c.name: c for c in suite.build_cases(data)}
+        from_frames = cases["run_from_dataframes"].fn()
+    assert from_files.keys() == from_frames.keys()
+    for name, frame in from_frames.items():
+        assert from_files[name].shape == frame.shape, name
+
+def test_suite_runs_and_flags_regressions(tmp_path):
+    results = suite.run(1_000, repeat=1, only=["prepare_customers", "format_dates"])
+    assert set(results["results"]) == {"prepare_customers", "format_dates"}
+    assert results["environment"]["pandas"] == pd.__version__
+    suite.save(results, tmp_path / "base.json")
+    baseline = suite.load(tmp_path / "base.json")
+    assert suite.compare(results, baseline) == []
+
+    slower = {**results, "results": {k: {**v, "seconds": v["seconds"] * 2 + 0.01} for k, v in results["results"].items()}}
+    flagged = suite.compare(slower, baseline, threshold=0.25)
+    assert {r["name"] for r in flagged} == {"prepare_customers", "format_dates"}
+    assert all(r["ratio"] > 1.25 and r["same_setup"] for r in flagged)
@@ -0,0 +1,114 @@
+import json
+import subprocess
+import sys
+import warnings
+from pathlib import Path
+
+import pandas as pd
+
+from ma_migration.cli import load_config, main
+
+CONTRACTS = Path(__file__).resolve().parents[1] / "contracts"
+
+def test_help_and_lint_do_not_import_pandas():
+    code = (
+        "import sys; from ma_migration.cli import main; "
+        f"rc = main(['lint', {str(CONTRACTS)!r}]); "
+        "sys.exit(rc if 'pandas' not in sys.modules else 99)"
+    )
+    assert subprocess.run([sys.executable, "-c", code], capture_output=True).returncode == 0
+    assert subprocess.run([sys.executable, "-m", "ma_migration.cli", "--help"], capture_output=True).returncode == 0
+
+def test_source_config_loads_without_pandas():
+    code = (
+        "import sys; from ma_migration.core.types import SourceConfig; "
+        "assert 'pandas' not in sys.modules; "
+        "import pandas as pd; from ma_migration.core import types; "
+        "sys.exit(0 if types.DataFrame is pd.DataFrame else 1)"
+    )
+    assert subprocess.run([sys.executable, "-c", code], capture_output=True).returncode == 0
+
+def test_lint_reports_broken_contracts(tmp_path, capsys):
+    (tmp_path / "bad.yaml").write_text(
+        "dataset: x\n"
+        "rules:\n"
+        "  - {id: r1, type: regex, column: a, pattern: '('}\n"
+        "  - {id: r1, type: no_such_rule}\n"
+        "  - {id: r3, type: expression, expression: 'a >'}\n"
+        "columns:\n"
+        "  a: {max_length: many}\n",
+        encoding="utf-8",
+    )
+    assert main(["lint", str(tmp_path)]) == 1
+    out = capsys.readouterr().out
+    for expected in ("invalid pattern", "duplicate rule id", "unknown rule type 'no_such_rule'", "invalid expression",
+                     "max_length must be an integer", "5 error(s)"):
+        assert expected in out
+    assert main(["lint", str(CONTRACTS)]) == 0
+
+def _write_project(root: Path) -> Path:
+    headers = {
+        "Source_Customer_ID": "CustomerID in HeliosDb", "NIP_VAT_Number": "NIP / VAT Number",
+        "Customer_Name": "Customer name", "Department_Name": "Department/Branch Name",
+        "Contract_Number": "Contract number", "MATO_Code": "MATO_DeliveryCustomerCode",
+        "Contract_Type": "Contract type (rental / laundry/ Both)", "Invoicing_Coupling_Code": "Invoicing Coupling Code",
+        "Invoicing_Cluster": "Invoicing Cluster",
+    }
+    contract = {"domain": "customers", "columns": {k: [{"name": v, "type": "string"}] for k, v in headers.items()}}
+    contract["columns"]["Contract_Type"][0]["valid_values"] = ["Rental", "Laundry"]
+    (root / "customers.json").write_text(json.dumps(contract), encoding="utf-8")
+    pd.DataFrame({
+        "CustomerID in HeliosDb": ["1", "2", "3"],
+        "NIP / VAT Number": ["1234567890", "2234567890", None],
+        "Customer name": ["A", "B", "C"],
+        "Department/Branch Name": ["Depot", "Yard", "X"],
+        "Contract number": ["100", "200", "300"],
+        "MATO_DeliveryCustomerCode": ["D1", "D2", "D3"],
+        "Contract type (rental / laundry/ Both)": ["Rental", "Both", "Laundry"],
+        "Invoicing Coupling Code": ["no coupling", "0090", None],
+        "Invoicing Cluster": ["1", "2", "3"],
+    }).to_csv(root / "customers.csv", index=False)
+    pd.DataFrame({"ID Kontrahenta": ["1", "2"], "ID Asortymentu Egzemplarza": [5, 5],  # text cells, like the customer IDs
+                  "FinishingMethod_FinishingMethod": ["310", "STD"]}).to_excel(root / "fm.xlsx", index=False)
+    (root / "master.yaml").write_text(
+        "dataset: customer_master\nrequired_columns: [Contract number]\n"
+        "columns:\n  Contract number: {required: true, unique: true}\n",
+        encoding="utf-8",
+    )
+    cfg = root / "migration.yaml"
+    cfg.write_text(
+        "sources:\n"
+        "  customers_masterfile_path: customers.csv\n"
+        "  customers_contract_path: customers.json\n"
+        "  finishing_methods_path: fm.xlsx\n"
+        "output:\n  dir: out\n  formats: [parquet]\n"
+        "run:\n  strict: false\n"
+        "validate:\n  customer_master: master.yaml\n",
+        encoding="utf-8",
+    )
+    return cfg
+
+def test_config_driven_run_validate_and_export(tmp_path, capsys):
+    cfg_path = _write_project(tmp_path)
+    cfg = load_config(cfg_path)
+    assert cfg.sources["customers_masterfile_path"] == tmp_path / "customers.csv"
+    assert cfg.out_dir == tmp_path / "out"
+    assert main(["check", "-c", str(cfg_path)]) == 0
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        assert main(["run", "-c", str(cfg_path), "--profile", str(tmp_path / "profile.json")]) == 0
+    out = pd.read_parquet(tmp_path / "out" / "customer_master.parquet")
+    assert out["Contract number"].tolist() == ["100_310_R", "200_STD_R", "200_STD_L"]
+    assert json.loads((tmp_path / "profile.json").read_text(encoding="utf-8"))["stages"]
+
+    assert main(["validate", "-c", str(cfg_path)]) == 0
+    assert '"errors": 0' in capsys.readouterr().out
+    assert main(["export", "-c", str(cfg_path), "--formats", "csv"]) == 0
+    assert (tmp_path / "out" / "invoicing_customers.csv").is_file()
+
+def test_config_errors_are_reported(tmp_path, capsys):
+    bad = tmp_path / "bad.yaml"
+    bad.write_text("sources:\n  customers_masterfile_path: missing.xlsx\n  no_such_setting: 1\n", encoding="utf-8")
+    assert main(["check", "-c", str(bad)]) == 1
+    assert "unknown source setting 'no_such_setting'" in capsys.readouterr().err
@@ -20,3 +20,305 @@ def test_contract_allowed_values_and_length():
     s = report.summary()
     assert s["errors"] == 2
     assert s["warnings"] == 1
+
+def test_compiled_plan_matches_dict_contract_and_casts_once(monkeypatch):
+    from ma_migration.contracts.plan import compile_contract
+    from ma_migration.contracts.rules import ColumnCache
+
+    df = pd.DataFrame({"Code": ["0001", "12", None, "0001", "123456"]})
+    contract = {
+        "dataset": "codes",
+        "rules": [
+            {"id": "LEN", "column": "Code", "type": "length_equals", "equals": 4},
+            {"id": "ALLOWED", "column": "Code", "type": "allowed_values", "values": ["0001", "12"]},
+            {"id": "REGEX", "column": "Code", "type": "regex", "pattern": "^[0-9]{4}$", "severity": "warning"},
+        ],
+        "columns": {"Code": {"max_length": 5, "unique": True}},
+    }
+    casts = []
+    original = ColumnCache.as_str
+    def counting_as_str(self, col):
+        if col not in self._str:
+            casts.append(col)
+        return original(self, col)
+    monkeypatch.setattr(ColumnCache, "as_str", counting_as_str)
+
+    expected = run_contract(df, contract, strict=False)
+    plan = compile_contract(contract)
+    got = run_contract(df, plan, strict=False)
+
+    assert casts == ["Code", "Code"]  # once per run
+    assert [(r.rule_id, r.severity, r.message) for r in got.results] == [(r.rule_id, r.severity, r.message) for r in expected.results]
+    assert got.summary() == expected.summary()
+
+def test_column_cache_casts_each_column_once_across_rule_workers():
+    import threading
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+    from ma_migration.contracts.rules import ColumnCache
+
+    df = pd.DataFrame({"Code": ["0001", "12", None, "0001"], "Other": ["a", "b", "c", "d"]})
+    reads = []
+
+    class _SlowFrame:
+        def __getitem__(self, col):
+            reads.append(col)
+            time.sleep(0.05)  # wide window for a second thread to start the same cast
+            return df[col]
+
+    cols = ColumnCache(df)
+    cols.frame = _SlowFrame()
+    start = threading.Barrier(6)
+    calls = [cols.as_str, cols.str_len, cols.str_factorized] * 2
+
+    def call(fn):
+        start.wait()
+        return fn("Code")
+
+    with ThreadPoolExecutor(max_workers=6) as ex:
+        got = list(ex.map(call, calls))
+    assert reads == ["Code"]
+    assert got[0] is got[3] and got[1] is got[4] and got[2] is got[5]
+    assert got[1].tolist() == [4, 2, 4, 4]
+
+def test_run_contract_chunks_matches_in_memory_counts(tmp_path, monkeypatch):
+    from ma_migration.contracts import streaming
+    from ma_migration.contracts.streaming import run_contract_chunks
+
+    df = pd.DataFrame({
+        "Barcode": ["A1", "B2", "C3", "A1", "D4", "E5", "C3", "F6", "A1"],
+        "Invoiced": ["yes", "no", "maybe", "yes", None, "no", "yes", "n", "yes"],
+    })
+    contract = {
+        "dataset": "pieces",
+        "columns": {
+            "Barcode": {"unique": True},
+            "Invoiced": {"required": True, "allowed_values": ["yes", "no"]},
+        },
+        "required_columns": ["Barcode", "Missing"],
+    }
+    expected = run_contract(df, contract, strict=False)
+    chunks = lambda: (df.iloc[i:i + 2] for i in range(0, len(df), 2))
+    spills = []
+    real_spill = streaming._UniqueTracker._spill
+    monkeypatch.setattr(streaming._UniqueTracker, "_spill", lambda self: spills.append(self._rows) or real_spill(self))
+    for spill_rows in (None, 0, 3):  # in memory, on disk from the start, spilled mid-stream
+        got = run_contract_chunks(chunks(), contract, strict=False, spill_dir=tmp_path, spill_rows=spill_rows)
+        assert [(r.rule_id, r.message) for r in got.results] == [(r.rule_id, r.message) for r in expected.results]
+    assert spills == [2, 4] and list(tmp_path.iterdir()) == []  # spill files removed with the run
+
+def test_run_contract_jobs_parallel_keeps_order_and_defers_strict():
+    import pytest
+    from ma_migration.contracts.runner import run_contract_jobs
+
+    ok = pd.DataFrame({"Code": ["0001", "0002"]})
+    bad = pd.DataFrame({"Code": ["0001", "0001", None]})
+    contract = {"dataset": "codes", "columns": {"Code": {"required": True, "unique": True}}}
+    jobs = [(bad, contract), (ok, contract), (bad, {**contract, "dataset": "other"})]
+
+    sequential = run_contract_jobs(jobs, strict=False)
+    for use_processes in (False, True):
+        parallel = run_contract_jobs(jobs, strict=False, max_workers=3, use_processes=use_processes, rule_workers=2)
+        assert [(r.dataset, r.summary()) for r in parallel] == [(r.dataset, r.summary()) for r in sequential]
+
+    with pytest.raises(ValueError) as exc:
+        run_contract_jobs(jobs, strict=True, max_workers=3)
+    assert str(exc.value).count("Code__UNIQUE") == 2
+
+def test_contract_cache_reuses_parsed_contracts_and_plans(tmp_path, monkeypatch):
+    import pytest
+    from ma_migration.contracts import loader
+
+    path = tmp_path / "c.yaml"
+    path.write_text("dataset: codes\ncolumns:\n  Code:\n    required: true\n", encoding="utf-8")
+    cache_dir = tmp_path / "cache"
+    loader.clear_contract_cache()
+
+    calls = []
+    original = loader._parse
+    monkeypatch.setattr(loader, "_parse", lambda p, t: calls.append(p) or original(p, t))
+
+    first = loader.load_contract(path, cache_dir=cache_dir)
+    first["dataset"] = "mutated"
+    assert loader.load_contract(path, cache_dir=cache_dir)["dataset"] == "codes"
+    plan = loader.load_contract_plan(path, cache_dir=cache_dir)
+    assert loader.load_contract_plan(path, cache_dir=cache_dir) is plan
+    assert len(calls) == 1
+
+    loader.clear_contract_cache()  # new process: served from disk, plan included
+    assert loader.load_contract_plan(path, cache_dir=cache_dir).rules == plan.rules
+    assert len(calls) == 1
+
+    (entry,) = cache_dir.glob("*.pkl")
+    entry.write_bytes(b"not a pickle")  # unreadable entry: a miss, then rewritten
+    loader.clear_contract_cache()
+    assert loader.load_contract_plan(path, cache_dir=cache_dir).rules == plan.rules
+    assert len(calls) == 2
+
+    path.write_text("dataset: changed\n", encoding="utf-8")
+    assert loader.load_contract(path, cache_dir=cache_dir)["dataset"] == "changed"
+    assert len(calls) == 3
+
+    real_version = loader._code_version
+    monkeypatch.setattr(loader, "_code_version", lambda: real_version() + "-edited")  # other code: never unpickled
+    monkeypatch.setattr(loader.pickle, "load", lambda fh: pytest.fail("entry written by other code unpickled"))
+    loader.clear_contract_cache()
+    assert loader.load_contract(path, cache_dir=cache_dir)["dataset"] == "changed"
+    assert len(calls) == 4
+    loader.clear_contract_cache(disk=True, cache_dir=cache_dir)
+    assert not list(cache_dir.glob("*.pkl"))
+
+def test_rule_result_keeps_positions_and_materializes_touched_columns():
+    df = pd.DataFrame({"Code": ["1", "0002", "3", "4"], "Other": ["a", "b", "c", "d"]})
+    contract = {"rules": [{"id": "LEN", "column": "Code", "type": "length_equals", "equals": 4}]}
+
+    sampled = run_contract(df, contract, strict=False, sample_failures=2).results[0]
+    assert sampled.failed_count == 3
+    assert sampled.failed_positions.tolist() == [0, 2]
+    assert list(sampled.failed_rows.columns) == ["Code"]
+    assert sampled.materialize(all_columns=True).shape == (2, 2)
+
+    full = run_contract(df, contract, strict=False, sample_failures=None).results[0]
+    assert full.failed_positions.tolist() == [0, 2, 3]
+    detached = full.detach()
+    assert detached.source is not df
+    assert detached.failed_rows["Code"].tolist() == ["1", "3", "4"]
+
+def test_regex_engine_matches_str_match_semantics():
+    from ma_migration.contracts.patterns import compile_pattern, _parse_simple
+
+    values = pd.Series(["1234", "123", "12345", "12a4", "1234\n", "١٢٣٤", "", "ABCD", "abcd", "AB12", "ab_1", "nan"])
+    patterns = ["^[0-9]{4}$", r"^\d{4}$", "^[0-9]{3,4}$", "^[0-9]+$", "^[0-9]*$", "^[A-Z]{4}$",
+                "^[a-z]+$", "^[A-Za-z0-9]{4}$", "^[A-Z0-9]{4}$", "^[0-9]{2,}$", r"^[A-Z]{2}\d{2}$", "^ab"]
+    assert _parse_simple("^[0-9]{4}$") is not None
+    assert _parse_simple(r"^[A-Z]{2}\d{2}$") is None
+    for p in patterns:
+        fn = compile_pattern(p)
+        assert [fn(v) for v in values] == values.str.match(p).tolist(), p
+
+def test_incremental_validation_only_reevaluates_changed_rows(tmp_path, monkeypatch):
+    from ma_migration.contracts.rules import RULE_DISPATCH
+
+    df = pd.DataFrame({"Code": ["0001", "12", "0003", "0003", None], "Name": ["a", "b", "c", "d", "e"]})
+    contract = {
+        "dataset": "codes",
+        "rules": [{"id": "REGEX", "column": "Code", "type": "regex", "pattern": "^[0-9]{4}$"}],
+        "columns": {"Code": {"required": True, "unique": True}},
+    }
+    seen = []
+    original = RULE_DISPATCH["regex"]
+    monkeypatch.setitem(RULE_DISPATCH, "regex", lambda c, r: seen.append(len(c.frame)) or original(c, r))
+    state = tmp_path / "codes.npz"
+
+    first = run_contract(df, contract, strict=False, state_path=state)
+    changed = df.copy()
+    changed.loc[1, "Code"] = "0002"
+    changed.loc[5] = ["BAD", "f"]
+    second = run_contract(changed, contract, strict=False, state_path=state)
+    expected = run_contract(changed, contract, strict=False)
+
+    assert seen[:2] == [5, 2]
+    assert [(r.rule_id, r.message) for r in first.results] == [(r.rule_id, r.message) for r in run_contract(df, contract, strict=False).results]
+    assert [(r.rule_id, r.message, r.failed_positions.tolist()) for r in second.results] == \
+        [(r.rule_id, r.message, r.failed_positions.tolist()) for r in expected.results]
+
+def test_incremental_validation_tells_values_of_different_types_apart(tmp_path):
+    contract = {"dataset": "codes", "rules": [{"id": "ONE", "type": "expression", "expression": "Code == 1"}]}
+    runs = [
+        ([1, "a", 1.0], ["1", "a", 1.0]),  # mixed object column
+        ([1, 2, 1], ["1", "2", "1"]),  # every value changes type, the str forms do not
+        ([1, 2, 1], [1.0, 2.0, 1.0]),  # dtype change
+    ]
+    for i, (before, after) in enumerate(runs):
+        state = tmp_path / f"codes_{i}.npz"
+        run_contract(pd.DataFrame({"Code": pd.Series(before, dtype=object)}), contract, strict=False, state_path=state)
+        changed = pd.DataFrame({"Code": pd.Series(after, dtype=object if i < 2 else None)})
+        got = run_contract(changed, contract, strict=False, state_path=state)
+        expected = run_contract(changed, contract, strict=False)
+        assert [r.failed_positions.tolist() for r in got.results] == [r.failed_positions.tolist() for r in expected.results]
+
+def test_profiled_run_records_every_rule_and_calls_hooks():
+    import json
+    from ma_migration.contracts import register_profile_hook, unregister_profile_hook
+
+    df = pd.DataFrame({"Code": ["0001", "12", "0001"]})
+    contract = {"columns": {"Code": {"required": True, "unique": True}}, "required_columns": ["Code"]}
+    seen = []
+    hook = register_profile_hook(lambda report, prof: seen.append(prof.rule_id))
+    try:
+        report = run_contract(df, contract, strict=False, profile=True)
+    finally:
+        unregister_profile_hook(hook)
+
+    assert seen == ["Code__REQUIRED", "Code__UNIQUE", "Code__PRESENT"]
+    assert [p.rows_evaluated for p in report.profile] == [3, 3, 0]
+    unique = report.results[0]
+    assert unique.profile.failed_count == 2 and unique.profile.peak_memory_bytes is not None
+    exported = json.loads(report.profile_to_json())
+    assert exported["rules_profiled"] == 3 and len(exported["slowest"]) == 3
+    assert run_contract(df, contract, strict=False).profile == []
+
+def test_foreign_key_rule_uses_shared_key_index():
+    from ma_migration.contracts import KeyIndex, clear_references, register_reference
+    from ma_migration.contracts.references import key_index
+
+    customers = pd.DataFrame({"CustomerID in HeliosDb": [1, 2, 3]})
+    lockers = pd.DataFrame({"CustomerID": [1, 4, None, 3, 5], "Barcode": ["a", "b", "c", "d", "e"]})
+    contract = {"rules": [{
+        "id": "CUSTOMER_FK", "type": "foreign_key", "column": "CustomerID",
+        "reference": "customer_master", "reference_column": "CustomerID in HeliosDb",
+    }]}
+
+    report = run_contract(lockers, contract, strict=False, references={"customer_master": customers})
+    assert report.results[0].failed_positions.tolist() == [1, 4]
+    assert key_index(customers, "CustomerID in HeliosDb") is key_index(customers, "CustomerID in HeliosDb")
+
+    try:
+        index = register_reference("customer_master", customers, column="CustomerID in HeliosDb")
+        assert isinstance(index, KeyIndex) and len(index) == 3
+        assert run_contract(lockers, contract, strict=False).results[0].failed_count == 2
+    finally:
+        clear_references()
+
+def test_expression_rules_and_custom_rule_types():
+    import pytest
+    from ma_migration.contracts import compile_contract, register_rule_type, unregister_rule_type
+
+    df = pd.DataFrame({
+        "Contract_Signed_Date": ["2022-08-31", "2023-01-01", None, "2021-05-05"],
+        "Contract_Term": ["2025-08-31", "2022-12-31", "2025-01-01", "2026-01-01"],
+        "Contract_Type": ["Laundry", "Rental", "Laundry", "Laundry"],
+        "Has Rented Locker?": [False, True, True, False],
+    })
+    contract = {"rules": [
+        {"id": "DATES", "type": "expression", "expression": "to_date(Contract_Signed_Date) <= to_date(Contract_Term)"},
+        {"id": "LAUNDRY_NO_LOCKER", "type": "expression", "expression": "if Contract_Type == 'Laundry' then `Has Rented Locker?` == False"},
+        {"id": "TYPE_IN", "type": "expression", "expression": "Contract_Type in ['Rental', 'Laundry'] and not isnull(Contract_Term)"},
+        {"id": "TERM_LENGTH", "type": "fixed_width", "column": "Contract_Term", "width": 10},
+    ]}
+
+    with pytest.raises(ValueError):
+        compile_contract({"rules": [{"id": "BAD", "type": "expression", "expression": "a <="}]})
+    assert compile_contract(contract).rules[1].columns == ("Contract_Type", "Has Rented Locker?")
+
+    register_rule_type("fixed_width", lambda c, r: c.str_len(r.column) != r.params["width"], row_local=True)
+    try:
+        report = run_contract(df, contract, strict=False)
+    finally:
+        unregister_rule_type("fixed_width")
+    failed = {r.rule_id: r.failed_positions.tolist() for r in report.results}
+    assert failed == {"DATES": [1, 2], "LAUNDRY_NO_LOCKER": [2]}
+    with pytest.raises(ValueError):
+        register_rule_type("unique", lambda c, r: None)
+
+    # custom names are protected too, and old (df, rule) kernels still work
+    register_rule_type("fixed_width", lambda df, r: df[r.column].str.len() != r.params["width"])
+    try:
+        with pytest.raises(ValueError, match="already registered"):
+            register_rule_type("fixed_width", lambda c, r: None)
+        assert {r.rule_id: r.failed_positions.tolist() for r in run_contract(df, contract, strict=False).results} == failed
+        register_rule_type("fixed_width", lambda c, r: c.str_len(r.column) != 8, replace=True)
+        replaced = {r.rule_id: r.failed_positions.tolist() for r in run_contract(df, contract, strict=False).results}
+        assert replaced["TERM_LENGTH"] == [0, 1, 2, 3]
+    finally:
+        unregister_rule_type("fixed_width")
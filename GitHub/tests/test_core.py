@@ -0,0 +1,195 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ma_migration.core.dates import format_date, format_dates
+
+def test_format_dates_matches_per_cell_format_date():
+    s = pd.Series([
+        "2022-08-31", "31.8.2022", "1.8.2022", "12/31/2021", "13/1/2021", "2022-08-31 00:00:00",
+        pd.Timestamp("2021-01-05"), "until 31.8.2025", "20220831", None, np.nan, "", "garbage", "1.8.2022",
+    ], index=list("abcdefghijklmn"), dtype=object)
+    got = format_dates(s)
+    assert got.tolist() == s.apply(format_date).tolist()
+    assert got.index.equals(s.index)
+
+def test_id_kernels_are_vectorized_equivalents_that_keep_nan():
+    from ma_migration.core.strings import int_like_to_str, numeric_id_to_str, to_numeric_keep_nan, zfill_strip
+
+    vat = pd.Series([1234567890.0, np.nan, 2.5, 3.5, 12.0])
+    assert numeric_id_to_str(vat).tolist()[2:] == ["2", "4", "12"]
+    assert int_like_to_str(vat).tolist()[0] == "1234567890" and pd.isna(int_like_to_str(vat)[1])
+    mixed = pd.Series([" 0012 ", 1234.0, None, 5], dtype=object)
+    assert int_like_to_str(mixed).tolist()[:2] == ["0012", "1234"]
+    assert to_numeric_keep_nan(pd.Series(["1", "x", 2.5])).tolist()[::2] == [1.0, 2.5]
+    filled = zfill_strip(pd.Series([1.0, np.nan, 12.0]), 4)
+    assert filled[0] == "0001" and pd.isna(filled[1]) and filled[2] == "0012"
+
+def test_strip_object_columns_keeps_missing_values_missing():
+    from ma_migration.core.strings import strip_object_columns
+
+    df = pd.DataFrame({"vat": [" 123 ", None, np.nan], "code": ["no coupling ", "0090", None], "n": [1, 2, 3]})
+    out = strip_object_columns(df)
+    assert out["vat"].tolist()[0] == "123" and out["vat"].isna().tolist() == [False, True, True]
+    assert out["code"].tolist()[:2] == ["no coupling", "0090"] and pd.isna(out["code"][2])
+    assert out["n"].tolist() == [1, 2, 3] and df["vat"][0] == " 123 "
+
+def test_duplicate_suffix_keeps_first_and_never_collides():
+    from ma_migration.core.dedupe import append_sequential_suffix_for_duplicates, suffix_duplicate_keys
+
+    s = pd.Series(["a", "b", "a", "a_2", "a", "x_1", "x_1", 1, "1"], index=list("abcdefghi"))
+    got = append_sequential_suffix_for_duplicates(s)
+    assert got.tolist() == ["a", "b", "a_3", "a_2", "a_4", "x_1", "x_1_2", "1", "1_2"]
+    assert got.index.equals(s.index) and got.is_unique
+
+    nulls = pd.Series([None, np.nan, None, "None", np.nan, "nan_2"], dtype=object)
+    assert append_sequential_suffix_for_duplicates(nulls).tolist() == ["None", "nan", "None_2", "None_3", "nan_3", "nan_2"]
+    assert append_sequential_suffix_for_duplicates(pd.Series([1.0, np.nan, np.nan])).tolist() == ["1.0", "nan", "nan_2"]
+
+    df = pd.DataFrame({"Contract number": ["7", "7", "7", "7_2"], "MATO_DeliveryCustomerCode": ["D", "D", "E", "D"]})
+    out = suffix_duplicate_keys(df, ["Contract number", "MATO_DeliveryCustomerCode"])
+    assert out["Contract number"].tolist() == ["7", "7_3", "7", "7_2"]
+    assert out["MATO_DeliveryCustomerCode"].tolist() == ["D", "D_3", "E", "D"]
+
+def test_copy_on_write_chain_keeps_inputs_and_lowers_peak_memory():
+    from ma_migration.core.frames import copy_on_write_enabled, enable_copy_on_write
+    from ma_migration.core.profiling import measure
+    from ma_migration.domains.customer_master_merge import transforms as T
+
+    n = 20_000
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({f"payload_{i}": rng.random(n) for i in range(30)})
+    df["Delivery name"] = pd.Series(["NULL", None, "Depot"] * (n // 3 + 1))[:n].to_numpy()
+    df["Customer name"] = "ACME"
+    before = df.copy()
+
+    def chain(frame):
+        frame = T.fill_defaults(frame, {"Delivery name": "Default"})
+        frame = T.replace_values(frame, "Delivery name", {"NULL": "Default"})
+        frame = T.rename_address_columns(frame)
+        frame = T.convert_contract_dates(frame)
+        return T.add_uat_prefix(frame, cols=["Customer name"])
+
+    with pd.option_context("mode.copy_on_write", False):  # restores the option for the other tests
+        with measure(trace_memory=True) as plain:
+            expected = chain(df)
+        enable_copy_on_write()
+        with measure(trace_memory=True) as cow:
+            got = chain(df)
+        # writes after the chain has returned must not reach the shared input buffers
+        got.loc[0, "payload_0"] = -1.0
+        got.loc[1, "Customer name"] = "changed"
+        enable_copy_on_write()
+        assert copy_on_write_enabled()
+
+    pd.testing.assert_frame_equal(df, before)
+    pd.testing.assert_frame_equal(got.drop(index=[0, 1]), expected.drop(index=[0, 1]))
+    assert cow.peak_memory_bytes < plain.peak_memory_bytes / 2
+
+def test_ingest_cache_serves_repeat_excel_reads(tmp_path, monkeypatch):
+    from ma_migration.core.io import IngestCache, read_excel
+
+    src = tmp_path / "master.xlsx"
+    pd.DataFrame({"VAT": [1, 2, 3], "Name": ["a", None, "c"]}).to_excel(src, index=False)
+    cache = IngestCache(tmp_path / "cache")
+    first = read_excel(src, cache=cache)
+
+    def _no_parse(*args, **kwargs):
+        raise AssertionError("workbook parsed again")
+
+    monkeypatch.setattr(pd, "read_excel", _no_parse)
+    again = read_excel(src, cache=cache)
+    pd.testing.assert_frame_equal(first, again)
+    assert isinstance(again.loc[1, "Name"], float)  # NaN as from read_excel, not None
+    assert cache.invalidate(src) == 1 and cache.get(cache.key(src, sheet_name=0, header=0, skiprows=None)) is None
+
+def test_read_excel_uses_the_ingest_cache_by_default(tmp_path, monkeypatch):
+    from ma_migration.core import io
+
+    src = tmp_path / "master.xlsx"
+    pd.DataFrame({"VAT": [1, 2]}).to_excel(src, index=False)
+    monkeypatch.setenv("MA_MIGRATION_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(io, "_DEFAULT_INGEST_CACHE", None)
+    monkeypatch.setattr(io, "_INGEST_CACHE_OFF", False)
+    parses = []
+    real_read_excel = pd.read_excel
+    monkeypatch.setattr(pd, "read_excel", lambda *a, **kw: parses.append(a) or real_read_excel(*a, **kw))
+
+    first = io.read_excel(src)
+    pd.testing.assert_frame_equal(io.read_excel(src), first)
+    assert len(parses) == 1 and list((tmp_path / "cache" / "ingest").iterdir())
+
+    monkeypatch.setattr(io, "_DEFAULT_INGEST_CACHE", None)
+    monkeypatch.setenv("MA_MIGRATION_INGEST_CACHE", "0")  # opt out
+    io.read_excel(src)
+    assert len(parses) == 2
+
+def test_read_many_excels_is_order_stable_and_reports_bad_files(tmp_path, monkeypatch):
+    from ma_migration.core import io
+    from ma_migration.core.io import read_many_excels
+
+    files = []
+    for i in range(3):
+        f = tmp_path / f"ag_{i}.xlsx"
+        pd.DataFrame({"VAT": [i, i], "Barcode": [10 * i, 10 * i + 1], "Invoiced": ["yes", "no"], "extra": 0}).to_excel(f, index=False)
+        files.append(f)
+    bad = tmp_path / "broken.xlsx"
+    bad.write_text("not a workbook")
+    files.insert(1, bad)
+
+    kwargs = dict(take_columns=3, names=["NIP / VAT Number", "Barcode", "Invoiced"], cache=False)
+    serial = read_many_excels(files, max_workers=1, **kwargs)
+    contexts = []
+    real_pool = io.ProcessPoolExecutor
+    monkeypatch.setattr(io, "ProcessPoolExecutor", lambda **kw: contexts.append(kw["mp_context"]) or real_pool(**kw))
+    parallel = read_many_excels(files, max_workers=3, **kwargs)
+    assert [c.get_start_method() for c in contexts] in (["forkserver"], ["spawn"])  # never fork from threads
+    pd.testing.assert_frame_equal(serial.data, parallel.data)
+    assert serial.data["Source_File"].tolist() == ["ag_0.xlsx"] * 2 + ["ag_1.xlsx"] * 2 + ["ag_2.xlsx"] * 2
+    assert list(serial.data.columns) == ["NIP / VAT Number", "Barcode", "Invoiced", "Source_File"]
+    assert list(parallel.errors) == [str(bad)]
+
+def test_iter_csv_projects_and_filters_per_chunk(tmp_path):
+    from ma_migration.core.io import iter_csv, read_csv_filtered
+
+    src = tmp_path / "pieces.txt"
+    full = pd.DataFrame({"VAT": [f"{i % 7:010d}" for i in range(50)], "Barcode": range(50), "Noise": "x"})
+    src.write_bytes(full.to_csv(sep="\t", index=False, lineterminator="\r").encode("cp1250"))
+
+    kwargs = dict(encoding="cp1250", lineterminator="\r", dtype={"VAT": str, "Barcode": "int64"})
+    chunks = list(iter_csv(src, chunksize=8, usecols=["Barcode"], where={"VAT": ["0000000003", "0000000005"]}, **kwargs))
+    assert all(list(c.columns) == ["Barcode"] for c in chunks)
+    expected = full.loc[full["VAT"].isin(["0000000003", "0000000005"]), "Barcode"].tolist()
+    assert pd.concat(chunks)["Barcode"].tolist() == expected
+
+    got = read_csv_filtered(src, chunksize=8, where=lambda c: c["Barcode"] % 2 == 0, **kwargs)
+    assert got["Barcode"].tolist() == list(range(0, 50, 2)) and got["VAT"].dtype == object
+
+def test_read_with_contract_keeps_declared_columns_and_types(tmp_path):
+    from ma_migration.core.contracts import DomainContract
+    from ma_migration.core.io import read_with_contract
+
+    contract = DomainContract.from_file(Path(__file__).parents[1] / "contracts" / "input" / "customers.yaml")
+    assert contract.sheet == "MasterFile" and contract.header == 2
+    assert contract.columns.NIP_VAT_Number == "NIP_VAT_Number"
+    assert contract.columns.Contract_Type.valid_values == ["Rental", "Laundry"]
+
+    src = tmp_path / "Customer_Master_File.xlsx"
+    data = pd.DataFrame({
+        "Source_Customer_ID": [1, 2], "NIP_VAT_Number": [1234567890, None], "Undeclared": ["x", "y"],
+        "Contract_Signed_Date": [pd.Timestamp("2022-08-31"), pd.Timestamp("2021-01-05")],
+        "Amount_of_Employees": [10, None], "Has_Rented_Locker?": ["Yes", "no"],
+    })
+    with pd.ExcelWriter(src) as xw:
+        data.to_excel(xw, sheet_name="MasterFile", startrow=2, index=False)
+
+    with pytest.warns(UserWarning, match="missing required columns"):
+        df = read_with_contract(contract, src, strict=False, cache=False)
+    assert "Undeclared" not in df.columns
+    assert df["NIP_VAT_Number"].tolist()[0] == "1234567890" and pd.isna(df["NIP_VAT_Number"][1])
+    assert str(df["Amount_of_Employees"].dtype) == "Int64" and str(df["Has_Rented_Locker?"].dtype) == "boolean"
+    assert pd.api.types.is_datetime64_any_dtype(df["Contract_Signed_Date"])
+    with pytest.raises(ValueError, match="missing required columns"):
+        read_with_contract(contract, src, cache=False)
@@ -1,10 +1,35 @@
+import pytest
+
+from ma_migration.core.contracts import DomainContract
 from ma_migration.domains.customers.pipeline import prepare_customers
 
-def test_prepare_customers_non_strict(sample_customers):
-    res = prepare_customers(sample_customers, strict=False)
-    assert "customers_expanded" in res.data
-    assert res.data["customers_expanded"].shape[0] == 3  # Both -> 2 rows
+@pytest.fixture
+def customers_contract():
+    return DomainContract.from_dict({"domain": "customers", "columns": {
+        "Source_Customer_ID": {"name": "CustomerID in HeliosDb"},
+        "NIP_VAT_Number": {"name": "NIP / VAT Number"},
+        "Invoicing_Cluster": {"name": "Invoicing Cluster"},
+        "Invoicing_Coupling_Code": {"name": "Invoicing Coupling Code", "valid_values": ["0001", "0090"]},
+        "Contract_Type": {"name": "Contract type (rental / laundry/ Both)", "valid_values": ["Rental", "Laundry"]},
+    }})
+
+def test_prepare_customers_non_strict(sample_customers, customers_contract):
+    res = prepare_customers(sample_customers, contract=customers_contract, strict=False)
+    assert "customers_base" in res.data
+    assert res.data["customers_base"].shape[0] == 3  # Both -> 2 rows
+
+def test_prepare_customers_strict(sample_customers, customers_contract):
+    res = prepare_customers(sample_customers, contract=customers_contract, strict=True)
+    assert res.data["customers_base"].shape[0] == 3
+
+    sample_customers["Invoicing Coupling Code"] = ["0001", "0077"]
+    with pytest.raises(ValueError, match="Invalid values in Invoicing Coupling Code"):
+        prepare_customers(sample_customers, contract=customers_contract, strict=True)
+
+def test_run_from_sources_requires_a_customers_contract(tmp_path):
+    from ma_migration.core.types import SourceConfig
+    from ma_migration.pipelines.customers_breakdown import run_from_sources
 
-def test_prepare_customers_strict(sample_customers):
-    res = prepare_customers(sample_customers, strict=True)
-    assert res.data["customers_expanded"].shape[0] == 3
+    cfg = SourceConfig(customers_masterfile_path=tmp_path / "Customer_Master_File.xlsx")
+    with pytest.raises(ValueError, match="customers_contract"):
+        run_from_sources(cfg)
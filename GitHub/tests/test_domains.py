@@ -0,0 +1,77 @@
+import pandas as pd
+
+from ma_migration.domains.finishing_method.pipeline import prepare_finishing_methods
+
+def test_finishing_methods_match_numeric_customer_ids_to_text_ids():
+    # Excel returns "ID Kontrahenta" as numbers; the customers master keeps IDs as text
+    fm = pd.DataFrame({"ID Kontrahenta": [1.0, 2.0, 2.0], "ID Asortymentu Egzemplarza": [5, 5, 6],
+                       "FinishingMethod_FinishingMethod": ["310", "STD", "STD"]})
+    customers = pd.DataFrame({"CustomerID in HeliosDb": ["1", "2"], "NIP / VAT Number": ["1234567890", "2234567890"]})
+    out = prepare_finishing_methods(fm, customers)
+    assert out["ID Kontrahenta"].tolist() == ["1", "2"]
+    assert out["NIP / VAT Number"].tolist() == ["1234567890", "2234567890"]
+
+def test_lockers_wearers_match_numeric_pieces_customer_ids_to_text_ids():
+    from ma_migration.domains.lockers_wearers.pipeline import prepare_lockers_and_wearers
+
+    # the PiecesInCirculation extract reads CustomerID as numbers; the customers master keeps text IDs
+    locwea = pd.DataFrame({"CustomerID": [1, 2, 3], "Barcode": ["B1", "B2", "B3"]})
+    customers = pd.DataFrame({"CustomerID in HeliosDb": ["1", "2"], "Contract number": ["100", "200"],
+                              "NIP / VAT Number": ["1234567890", "2234567890"], "Customer name": ["A", "B"],
+                              "Contract type (rental / laundry/ Both)": ["Rental", "Laundry"]})
+    active = pd.DataFrame({"NIP / VAT Number": ["1234567890"], "Barcode": ["B1"], "Invoiced": ["yes"]})
+    ref = pd.DataFrame({"Kod kreskowy": ["B1", "B2"], "ID Oddzia?u": [10.0, 20.0]})
+    out = prepare_lockers_and_wearers(locwea, ref, customers, customers, active)
+    assert sorted(out["Barcode"]) == ["B1", "B2"]  # customer 3 is not in the master file
+    assert dict(zip(out["Barcode"], out["isRental"])) == {"B1": 1, "B2": 0}
+    assert set(out["CustomerID"]) == {"1", "2"}
+
+def test_extracts_stream_only_master_file_customers_with_explicit_dtypes(tmp_path):
+    from ma_migration.core.types import SourceConfig
+    from ma_migration.domains.lockers_wearers.pipeline import load_extract_for_customers, load_reference_for_pieces
+    from ma_migration.domains.lockers_wearers.schema import LOCWEA_REF_DTYPES, PIECES_IN_CIRCULATION_DTYPES
+    from ma_migration.pipelines.customers_breakdown import source_stages
+
+    big = 2**53 + 1  # not representable as float64
+    src = tmp_path / "pieces.txt"
+    # the first chunk has no missing IDs, a later one does: inferred per chunk, they would parse as int and float
+    pieces = pd.DataFrame({"CustomerID": ["1", "2", "3", "1", "", str(big), "2", "1"] * 4,
+                           "Barcode": [str(big + i) for i in range(32)], "Item": "Jacket", "Noise": "x"})
+    src.write_bytes(pieces.to_csv(sep="\t", index=False, lineterminator="\r").encode("utf-8"))
+    customers = pd.DataFrame({"CustomerID in HeliosDb": ["1", " 2 ", str(big)]})
+
+    out = load_extract_for_customers(src, customers, customer_id_col="CustomerID", dtype=PIECES_IN_CIRCULATION_DTYPES,
+                                     usecols=("Barcode", "Item"), chunksize=4)
+    assert list(out.columns) == ["CustomerID", "Barcode", "Item"]  # file order; the filter column is always kept
+    assert out["CustomerID"].dtype == "Int64" and out["Barcode"].dtype == "Int64"
+    kept = pieces[pieces["CustomerID"].isin(["1", "2", str(big)])]
+    assert out["Barcode"].tolist() == [int(b) for b in kept["Barcode"]]
+    assert out["CustomerID"].tolist() == [int(c) for c in kept["CustomerID"]]
+
+    # the reference is filtered on the kept pieces' barcodes, not on customer: a barcode filed
+    # under another customer (or twice) in the reference is still read
+    ref_src = tmp_path / "ref.txt"
+    ref = pd.DataFrame({"ID Kontrahenta": [9, 1, 9, 3], "Kod kreskowy": [big, big + 1, big + 1, big + 2]})
+    ref_src.write_bytes(ref.to_csv(sep="\t", index=False, lineterminator="\r").encode("utf-8"))
+    got = load_reference_for_pieces(ref_src, out, barcode_col="Kod kreskowy", dtype=LOCWEA_REF_DTYPES, chunksize=2)
+    assert got["Kod kreskowy"].tolist() == [big, big + 1, big + 1] and got["ID Kontrahenta"].tolist() == [9, 1, 9]
+
+    stages = {s.name: s for s in source_stages(SourceConfig(customers_masterfile_path=tmp_path / "c.xlsx",
+                                                            pieces_in_circulation_path=src, lockers_wearers_ref_path=ref_src))}
+    assert set(stages["read_pieces_in_circulation"].input_map().values()) == {"customers_for_lockers_wearers"}
+    assert set(stages["read_lockers_wearers_ref"].input_map().values()) == {"pieces_in_circulation"}
+
+def test_unreadable_active_garments_files_are_reported_without_aborting(tmp_path):
+    import pytest
+    from ma_migration.domains.lockers_wearers.pipeline import load_active_garments_from_excels
+
+    good = tmp_path / "ag_0.xlsx"
+    pd.DataFrame({"VAT": [1234567890], "Barcode": [7], "Invoiced": [" Yes "]}).to_excel(good, index=False)
+    bad = tmp_path / "broken.xlsx"
+    bad.write_text("not a workbook")
+
+    with pytest.warns(UserWarning, match="broken.xlsx"):
+        active = load_active_garments_from_excels([bad, good], max_workers=1)
+    assert active[["NIP / VAT Number", "Invoiced", "Source_File"]].values.tolist() == [["1234567890", "yes", "ag_0.xlsx"]]
+    with pytest.raises(ValueError, match="Unreadable ActiveGarments files"):
+        load_active_garments_from_excels([bad, good], max_workers=1, fail_on_unreadable=True)
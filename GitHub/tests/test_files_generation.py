@@ -0,0 +1,45 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+from ma_migration.domains.files_generation.pipeline import export_excel
+from ma_migration.domains.files_generation.writers import write_outputs
+
+def test_write_outputs_formats_and_manifest(tmp_path):
+    outputs = {
+        "customer_master": pd.DataFrame({"Contract number": ["1", "2"], "Amount": [1.5, 2.0]}),
+        "invoicing_customers": pd.DataFrame({"Invoicing_CustomerID": ["A", "B", "C"]}),
+        "not_a_frame": None,
+    }
+    manifest = write_outputs(outputs, tmp_path, formats={"customer_master": ["xlsx", "parquet"], "invoicing_customers": "csv"}, max_workers=3)
+
+    assert [(f.name, f.format, f.rows) for f in manifest.files] == [
+        ("customer_master", "xlsx", 2), ("customer_master", "parquet", 2), ("invoicing_customers", "csv", 3),
+    ]
+    assert all(f.bytes > 0 and f.seconds >= 0 for f in manifest.files)
+    pd.testing.assert_frame_equal(pd.read_parquet(manifest.paths("parquet")["customer_master"]), outputs["customer_master"])
+    assert json.loads((tmp_path / "manifest.json").read_text())["files"][2]["rows"] == 3
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "customer_master.parquet", "customer_master.xlsx", "invoicing_customers.csv", "manifest.json",
+    ]  # no temp files left behind
+
+def test_export_excel_keeps_xlsx_only(tmp_path):
+    export_excel({"products": pd.DataFrame({"SKU": ["a"]})}, tmp_path)
+    assert [p.name for p in tmp_path.iterdir()] == ["products.xlsx"]
+    assert pd.read_excel(tmp_path / "products.xlsx")["SKU"].tolist() == ["a"]
+
+def test_streaming_xlsx_rolls_over_with_same_header(tmp_path):
+    from ma_migration.domains.files_generation.xlsx import write_xlsx_streaming
+
+    df = pd.DataFrame({"Barcode": range(25), "Invoiced": ["yes", np.nan] * 12 + ["no"]})
+    paths = write_xlsx_streaming(df, tmp_path / "lockers_wearers.xlsx", max_rows=10, batch_rows=4, split="file")
+    assert [p.name for p in paths] == ["lockers_wearers.xlsx", "lockers_wearers_part2.xlsx", "lockers_wearers_part3.xlsx"]
+    parts = [pd.read_excel(p) for p in paths]
+    assert [len(p) for p in parts] == [10, 10, 5]
+    pd.testing.assert_frame_equal(pd.concat(parts, ignore_index=True), df)
+
+    (path,) = write_xlsx_streaming(df, tmp_path / "sheets.xlsx", max_rows=10, batch_rows=4)
+    sheets = pd.read_excel(path, sheet_name=None)
+    assert list(sheets) == ["Sheet1", "Sheet1_2", "Sheet1_3"]
+    assert all(list(s.columns) == ["Barcode", "Invoiced"] for s in sheets.values())
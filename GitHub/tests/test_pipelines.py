@@ -0,0 +1,220 @@
+import gc
+import json
+import threading
+import time
+import warnings
+import weakref
+from functools import partial
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ma_migration.core.contracts import DomainContract
+from ma_migration.pipelines.checkpoints import CheckpointStore
+from ma_migration.pipelines.customers_breakdown import run_from_dataframes
+from ma_migration.pipelines.graph import Stage, StageGraph
+from ma_migration.pipelines.profiling import PipelineProfiler
+
+class _Frame:
+    """Weak-referenceable stand-in for an intermediate frame."""
+
+def test_stage_graph_runs_independent_stages_concurrently_and_frees_intermediates():
+    seen = {}
+
+    def root():
+        return _Frame()
+
+    def branch(base):
+        seen.setdefault("ref", weakref.ref(base))
+        time.sleep(0.3)
+        return threading.get_ident()
+
+    def join(a, b):
+        gc.collect()
+        seen["freed_before_join"] = seen["ref"]() is None
+        return (a, b)
+
+    graph = StageGraph([
+        Stage("root", root, (), ("base",)),
+        Stage("a", branch, {"base": "base"}, ("a",)),
+        Stage("b", branch, {"base": "base"}, ("b",)),
+        Stage("join", join, ["a", "b"], ("result",)),
+    ])
+    assert graph.order() == ["root", "a", "b", "join"]
+    t0 = time.perf_counter()
+    out = graph.run({}, keep=["result"], max_workers=4)
+    assert time.perf_counter() - t0 < 0.55  # the two 0.3s branches overlap
+    assert list(out) == ["result"] and out["result"][0] != out["result"][1]
+    assert seen["freed_before_join"]
+
+def test_stage_graph_rejects_cycles_and_reraises_stage_errors():
+    with pytest.raises(ValueError, match="cycle"):
+        StageGraph([Stage("x", lambda y: y, ["y"], ("x",)), Stage("y", lambda x: x, ["x"], ("y",))]).run({})
+
+    def boom():
+        raise ValueError("bad input")
+    ran = []
+    graph = StageGraph([Stage("boom", boom, (), ("a",)), Stage("after", lambda a: ran.append(a), ["a"], ("b",))])
+    with pytest.raises(ValueError, match="bad input"):
+        graph.run({})
+    assert ran == []
+
+def _breakdown_inputs():
+    contract = DomainContract.from_dict({"domain": "customers", "columns": {
+        "Source_Customer_ID": {"name": "CustomerID in HeliosDb"},
+        "NIP_VAT_Number": {"name": "NIP / VAT Number"},
+        "Invoicing_Cluster": {"name": "Invoicing Cluster"},
+        "Invoicing_Coupling_Code": {"name": "Invoicing Coupling Code"},
+        "Contract_Type": {"name": "Contract type (rental / laundry/ Both)", "valid_values": ["Rental", "Laundry"]},
+    }})
+    customers = pd.DataFrame({
+        "CustomerID in HeliosDb": [1, 2, 3],
+        "NIP / VAT Number": [1234567890.0, 2234567890.0, np.nan],
+        "Customer name": ["A", "B", "C"],
+        "Department/Branch Name": ["Depot", "Yard", "X"],
+        "Contract number": [100, 200, 300],
+        "MATO_DeliveryCustomerCode": ["D1", "D2", "D3"],
+        "Contract type (rental / laundry/ Both)": ["Rental", "Both", "Laundry"],
+        "Invoicing Coupling Code": ["no coupling", "0090", None],
+        "Invoicing Cluster": ["1", "2", "3"],
+    })
+    fm = pd.DataFrame({"ID Kontrahenta": ["1", "2"], "ID Asortymentu Egzemplarza": [5, 5], "FinishingMethod_FinishingMethod": ["310", "STD"]})
+    return contract, customers, fm
+
+def test_run_from_dataframes_runs_the_domain_graph():
+    contract, customers, fm = _breakdown_inputs()
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        out = run_from_dataframes(customers_master=customers, customers_contract=contract, finishing_methods=fm, strict=False)
+
+    assert list(out) == ["customer_master", "customer_master_uat", "invoicing_customers", "invoicing_customers_uat"]
+    assert out["customer_master"]["Contract number"].tolist() == ["100_310_R", "200_STD_R", "200_STD_L"]  # VAT-less customer dropped, Both exploded
+    assert out["invoicing_customers"]["Invoicing_CustomerID"].tolist() == ["2234567890_0090_0002"]
+
+def test_run_from_dataframes_passes_product_sources_to_their_stages():
+    contract, customers, fm = _breakdown_inputs()
+    sizes = pd.DataFrame({"Size": ["S", "M"]})
+    catalog = pd.DataFrame({"Product": ["Jacket"]})
+    mappings = pd.DataFrame({"Product": ["Jacket"], "Size": ["M"]})
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        out = run_from_dataframes(customers_master=customers, customers_contract=contract, product_sizes=sizes,
+                                  li_product_catalog=catalog, li_product_sizes=mappings, strict=False)
+    pd.testing.assert_frame_equal(out["product_sizes"], sizes)
+    pd.testing.assert_frame_equal(out["li_product_catalog"], catalog)
+    pd.testing.assert_frame_equal(out["li_product_sizes"], mappings)
+
+def test_checkpoints_reuse_unchanged_stages_and_rerun_downstream_of_changes(tmp_path):
+    calls = []
+
+    def double(df, factor=2):
+        calls.append("double")
+        return df.assign(v=df["v"] * factor)
+
+    def label(df):
+        calls.append("label")
+        return df.assign(name=np.where(df["v"] > 2, "big", None))
+
+    def graph(factor=2):
+        return StageGraph([
+            Stage("double", partial(double, factor=factor), ["df"], ("doubled",)),
+            Stage("label", label, {"df": "doubled"}, ("labelled",)),
+        ])
+
+    store = CheckpointStore(tmp_path)
+    df = pd.DataFrame({"v": [1, 2]})
+    first = graph().run({"df": df}, run_stage=store.runner())["labelled"]
+    again = graph().run({"df": df.copy()}, run_stage=store.runner())["labelled"]
+    assert calls == ["double", "label"]
+    pd.testing.assert_frame_equal(again, first)
+    assert again["name"].tolist() == [None, "big"]  # None survives the Parquet round trip
+
+    graph(factor=3).run({"df": df}, run_stage=store.runner())  # config change
+    graph().run({"df": pd.DataFrame({"v": [1, 3]})}, run_stage=store.runner())  # data change
+    assert calls == ["double", "label"] * 3
+
+    assert {i.stage for i in store.list()} == {"double", "label"}
+    assert store.inspect("label").outputs["labelled"]["format"] == "parquet"
+    assert store.purge("double") == 3
+    assert [i.stage for i in store.list()] == ["label"] * 3
+
+def test_run_from_dataframes_with_checkpoints_matches_a_plain_run(tmp_path):
+    contract, customers, fm = _breakdown_inputs()
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        plain = run_from_dataframes(customers_master=customers, customers_contract=contract, finishing_methods=fm, strict=False)
+        cold = run_from_dataframes(customers_master=customers, customers_contract=contract, finishing_methods=fm,
+                                   strict=False, checkpoints=tmp_path)
+        warm = run_from_dataframes(customers_master=customers, customers_contract=contract, finishing_methods=fm,
+                                   strict=False, checkpoints=tmp_path)
+    assert len(CheckpointStore(tmp_path).list()) == 4
+    for name in plain:
+        pd.testing.assert_frame_equal(cold[name], plain[name])
+        pd.testing.assert_frame_equal(warm[name], plain[name])
+
+def test_editing_a_transform_module_invalidates_checkpoints(tmp_path, monkeypatch):
+    import shutil
+    from ma_migration.pipelines import checkpoints
+
+    source = tmp_path / "src"
+    shutil.copytree(checkpoints._PACKAGE_ROOT, source, ignore=shutil.ignore_patterns("__pycache__"))
+    monkeypatch.setattr(checkpoints, "_PACKAGE_ROOT", source)
+    contract, customers, fm = _breakdown_inputs()
+
+    def run():
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            run_from_dataframes(customers_master=customers, customers_contract=contract, finishing_methods=fm,
+                                strict=False, checkpoints=tmp_path / "ckpt")
+        return len(CheckpointStore(tmp_path / "ckpt").list())
+
+    assert run() == 4 and run() == 4  # unchanged code: reused
+    with open(source / "domains" / "customers" / "transforms.py", "a", encoding="utf-8") as fh:
+        fh.write("\n# edited\n")
+    checkpoints._source_digest.cache_clear()
+    assert run() == 8  # the customers stage lives in customers_breakdown, but its transforms changed
+
+def test_profiled_run_reports_stage_times_and_row_flow(tmp_path):
+    contract, customers, fm = _breakdown_inputs()
+    profiler = PipelineProfiler()
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        out = run_from_dataframes(customers_master=customers, customers_contract=contract, finishing_methods=fm,
+                                  strict=False, profile=profiler)
+    assert len(out["customer_master"]) == 3
+
+    report = profiler.report()
+    assert [s.stage for s in report.stages][0] == "customers"
+    assert {s.stage for s in report.stages} == {"customers", "invoicing_customers", "finishing_methods", "customer_master"}
+    customers_stage = report.stages[0]
+    assert customers_stage.inputs == {"customers_master": {"rows": 3, "columns": 9}}
+    assert customers_stage.outputs["customers_expanded"]["rows"] == 3
+    assert all(s.wall_seconds >= 0 and s.cpu_seconds >= 0 for s in report.stages)
+
+    flow = {(f["stage"], f["step"]): f["row_delta"] for f in report.row_flow()}
+    assert flow[("customers", "drop_customers_without_vat")] == -1  # VAT drop
+    assert flow[("customers", "explode_contract_type_both")] == 1  # "Both" explosion
+    assert flow[("invoicing_customers", "drop_no_coupling_customers")] == -1
+
+    report.to_json(tmp_path / "profile.json")
+    report.to_html(tmp_path / "profile.html")
+    assert "explode_contract_type_both" in (tmp_path / "profile.html").read_text(encoding="utf-8")
+    assert json.loads((tmp_path / "profile.json").read_text(encoding="utf-8"))["row_flow"]
+
+def test_memory_traced_stages_run_one_at_a_time_with_their_own_peaks():
+    def allocate(n):
+        block = np.ones(n)  # held across the sleep, when another stage would otherwise be running
+        time.sleep(0.05)
+        return float(block.sum())
+
+    graph = StageGraph([Stage("big", partial(allocate, 4_000_000), (), ("b",)),
+                        Stage("small", partial(allocate, 250_000), (), ("s",))])
+    profiler = PipelineProfiler(trace_memory=True)
+    graph.run({}, max_workers=2, run_stage=profiler.runner())
+
+    stages = {s.stage: s for s in profiler.report().stages}
+    first, second = sorted(stages.values(), key=lambda s: s.started_seconds)
+    assert first.started_seconds + first.wall_seconds <= second.started_seconds
+    assert stages["big"].peak_memory_bytes >= 32_000_000
+    assert 2_000_000 <= stages["small"].peak_memory_bytes < 8_000_000